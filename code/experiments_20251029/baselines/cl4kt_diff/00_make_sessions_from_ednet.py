@@ -1,4 +1,5 @@
 import argparse, os
+import numpy as np
 import pandas as pd
 from collections import defaultdict
 
@@ -20,16 +21,36 @@ def build_sessions(df: pd.DataFrame):
         grouped[row.user_id].append((row.item_id, int(row.correct)))
     return grouped
 
+def build_sessions_store(store_dir):
+    """
+    交互存储（ednet_to_store.py 的输出）已经按 (user, timestamp) 排好，
+    每个用户就是 user_offsets 里的一段，不用再读 csv / 排序。缺失的 correct 记 0。
+    """
+    from src.utils.interaction_store import open_store
+    st = open_store(store_dir)
+    items = st.item_ids(st.item_idx)
+    corrs = np.maximum(np.asarray(st.correct), 0).tolist()
+    grouped = {}
+    for u, uid in enumerate(st.users):
+        rows = st.user_rows(u)
+        if rows.stop > rows.start:
+            grouped[uid] = list(zip(items[rows], corrs[rows]))
+    return grouped
+
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
-    ap.add_argument("--logs", required=True, help="flattened ednet csv, e.g. analysis/ednet_flat_u200.csv")
+    ap.add_argument("--logs", required=True,
+                    help="flattened ednet csv, e.g. analysis/ednet_flat_u200.csv, or an interaction store dir")
     ap.add_argument("--out", required=True, help="output sessions csv")
     ap.add_argument("--min_len", type=int, default=5, help="min sequence length to keep")
     args = ap.parse_args()
 
     os.makedirs(os.path.dirname(args.out), exist_ok=True)
-    df = pd.read_csv(args.logs)
-    sessions = build_sessions(df)
+    if os.path.isdir(args.logs):
+        sessions = build_sessions_store(args.logs)
+    else:
+        df = pd.read_csv(args.logs)
+        sessions = build_sessions(df)
 
     # 展开成一行一个用户，序列用空格拼
     rows = []
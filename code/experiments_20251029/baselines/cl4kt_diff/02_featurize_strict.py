@@ -2,8 +2,26 @@ import argparse, os
 import pandas as pd
 import numpy as np
 
+def steps_from_store(store_dir, min_len=5):
+    """
+    直接从交互存储（ednet_to_store.py 的输出）得到 00 → 01_expand 的 steps 表：
+    行已按 (user, timestamp) 排好，step 就是用户内的序号；同 00 一样丢掉长度 < min_len 的用户。
+    """
+    from src.utils.interaction_store import open_store
+    st = open_store(store_dir)
+    lens = np.diff(np.asarray(st.user_offsets))
+    keep = np.repeat(lens >= min_len, lens)
+    starts = np.repeat(np.asarray(st.user_offsets[:-1]), lens)
+    return pd.DataFrame({
+        "user_id": st.user_ids(st.user_idx)[keep],
+        "step": (np.arange(len(st)) - starts + 1)[keep],
+        "item_id": st.item_ids(st.item_idx)[keep],
+        "correct": np.maximum(np.asarray(st.correct), 0)[keep],
+    })
+
 def build_feats(steps_csv, items_csv, max_len=100):
-    steps = pd.read_csv(steps_csv)
+    # steps_csv 也可以直接是 steps_from_store 给的 DataFrame
+    steps = steps_csv if isinstance(steps_csv, pd.DataFrame) else pd.read_csv(steps_csv)
     items = pd.read_csv(items_csv)
     diff_map = dict(zip(items["item_id"].astype(str), items["diff_int"].astype(int)))
 
@@ -73,9 +91,12 @@ if __name__ == "__main__":
     ap.add_argument("--steps", default="baselines/cl4kt_diff/ednet_u200_steps.csv")
     ap.add_argument("--items", default="baselines/cl4kt_diff/ednet_u200_items.csv")
     ap.add_argument("--out",   default="baselines/cl4kt_diff/ednet_u200_feats_strict.csv")
+    ap.add_argument("--store", default=None, help="可选：交互存储目录，代替 --steps（跳过 00 / 01_expand）")
+    ap.add_argument("--min_len", type=int, default=5, help="--store 时同 00 的 min_len")
     args = ap.parse_args()
 
-    df = build_feats(args.steps, args.items)
+    steps = steps_from_store(args.store, args.min_len) if args.store else args.steps
+    df = build_feats(steps, args.items)
     os.makedirs(os.path.dirname(args.out), exist_ok=True)
     df.to_csv(args.out, index=False)
     print(f"✅ wrote {args.out} rows={len(df)}")
@@ -1,4 +1,7 @@
-import argparse, os, glob
+import argparse, os, io, glob, json, shutil, time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
 
 def load_contents(contents_root: str):
@@ -40,55 +43,60 @@ def load_contents(contents_root: str):
     # 都没找到
     return {}
 
-if __name__ == "__main__":
-    ap = argparse.ArgumentParser()
-    ap.add_argument("--root", required=True, help="解压出来的 KT1 目录，比如 data/ednet_full/KT1")
-    ap.add_argument("--contents_root", default="", help="题库所在目录，比如 data/ednet_contents/")
-    ap.add_argument("--out", required=True)
-    args = ap.parse_args()
+OUT_COLS = ["user_id", "item_id", "student_answer", "gold_answer", "correct", "timestamp"]
 
-    # 1) 先尝试加载题库
-    qid2ans = load_contents(args.contents_root)
-    has_contents = len(qid2ans) > 0
-    if has_contents:
-        print(f"✅ loaded contents ({len(qid2ans)} questions) from {args.contents_root}")
+
+def pick_cols(cols, fpath):
+    """识别题目 / 学生答案 / 时间戳列（时间戳可以没有）。"""
+    # 识别题目列
+    if "question_id" in cols:
+        item_col = "question_id"
+    elif "problem_id" in cols:
+        item_col = "problem_id"
     else:
-        print("⚠️ 没有找到 contents/questions.csv → 会写出 correct=NA")
+        raise ValueError(f"{fpath} 里找不到 question_id / problem_id, columns={cols}")
 
-    # 2) 扫用户文件
-    pattern = os.path.join(args.root, "u*.csv")
-    files = sorted(glob.glob(pattern))
-    print(f"[*] found {len(files)} user files under {args.root}")
+    # 识别学生答案列
+    if "user_answer" in cols:
+        ans_col = "user_answer"
+    elif "user_response" in cols:
+        ans_col = "user_response"
+    else:
+        raise ValueError(f"{fpath} 里找不到 user_answer / user_response, columns={cols}")
 
-    rows = []
-    for i, fpath in enumerate(files, 1):
-        df = pd.read_csv(fpath)
-        cols = df.columns.tolist()
+    # 时间戳列
+    if "timestamp" in cols:
+        ts_col = "timestamp"
+    elif "start_time" in cols:
+        ts_col = "start_time"
+    else:
+        ts_col = None
+    return item_col, ans_col, ts_col
 
-        # 识别题目列
-        if "question_id" in cols:
-            item_col = "question_id"
-        elif "problem_id" in cols:
-            item_col = "problem_id"
-        else:
-            raise ValueError(f"{fpath} 里找不到 question_id / problem_id, columns={cols}")
 
-        # 识别学生答案列
-        if "user_answer" in cols:
-            ans_col = "user_answer"
-        elif "user_response" in cols:
-            ans_col = "user_response"
-        else:
-            raise ValueError(f"{fpath} 里找不到 user_answer / user_response, columns={cols}")
+def _as_str(s):
+    # 同原来逐行 str(x)：缺失值写成 "nan"（新版 pandas 的 astype(str) 会保留缺失）
+    return s.astype(str).fillna("nan")
+
+
+def _as_timestamp(s):
+    """
+    时间戳统一成可空 Int64：某个组 / 批里有缺失时 read_csv 会推成 float，
+    不统一的话各 part 里一会儿 1565000000000 一会儿 1565000000000.0。非整数的时间列（如日期字符串）原样保留。
+    """
+    num = pd.to_numeric(s, errors="coerce")
+    if num.notna().sum() == s.notna().sum() and (num.dropna() % 1 == 0).all():
+        return num.astype("Int64")
+    return s
 
-        # 时间戳列
-        if "timestamp" in cols:
-            ts_col = "timestamp"
-        elif "start_time" in cols:
-            ts_col = "start_time"
-        else:
-            ts_col = None
 
+def flatten_rows(files, qid2ans):
+    """原来的逐行写法：一个大 rows 列表，内存随总交互数增长（--engine rows，留作对照）。"""
+    has_contents = len(qid2ans) > 0
+    rows = []
+    for i, fpath in enumerate(files, 1):
+        df = pd.read_csv(fpath)
+        item_col, ans_col, ts_col = pick_cols(df.columns.tolist(), fpath)
         uid = os.path.splitext(os.path.basename(fpath))[0]  # u12345 → user_id
 
         for r in df.itertuples(index=False):
@@ -114,10 +122,142 @@ if __name__ == "__main__":
 
         if i % 200 == 0:
             print(f"  ... processed {i}/{len(files)} users")
+    return pd.DataFrame(rows, columns=OUT_COLS)
+
+
+def _read_group(header, bodies, n_rows, fpaths):
+    """表头相同的一串文件：去掉各自表头拼起来，一次 read_csv（每个小文件一次 read_csv 太慢）。"""
+    df = pd.read_csv(io.BytesIO(header + b"\n" + b"".join(bodies)), skip_blank_lines=False)
+    if len(df) != sum(n_rows):
+        raise ValueError(f"parsed {len(df)} rows, expected {sum(n_rows)} ({fpaths[0]} .. {fpaths[-1]})")
+    item_col, ans_col, ts_col = pick_cols(df.columns.tolist(), fpaths[0])
+    uids = [os.path.splitext(os.path.basename(f))[0] for f in fpaths]  # u12345 → user_id
+    return pd.DataFrame({
+        "user_id": np.repeat(uids, n_rows),
+        "item_id": _as_str(df[item_col]),
+        "student_answer": _as_str(df[ans_col]),
+        "timestamp": _as_timestamp(df[ts_col]) if ts_col else pd.array([pd.NA] * len(df), dtype="Int64"),
+    })
 
-    out_df = pd.DataFrame(rows)
-    os.makedirs(os.path.dirname(args.out), exist_ok=True)
-    out_df.to_csv(args.out, index=False)
-    print(f"✅ wrote {args.out} rows={len(out_df)}")
+
+def flatten_batch(files, qid2ans):
+    """一批用户文件 → 一个 DataFrame；题库用 map 向量化对上，correct 在题库里查不到时为 NA。"""
+    frames = []
+    header, group = None, ([], [], [])
+    for fpath in files:
+        with open(fpath, "rb") as f:
+            head, _, body = f.read().partition(b"\n")
+        head, body = head.rstrip(b"\r"), body.rstrip(b"\r\n")
+        if head != header and group[0]:
+            frames.append(_read_group(header, *group))
+            group = ([], [], [])
+        header = head
+        group[0].append(body + b"\n" if body else b"")
+        group[1].append(body.count(b"\n") + 1 if body else 0)
+        group[2].append(fpath)
+    if group[0]:
+        frames.append(_read_group(header, *group))
+    out = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=OUT_COLS)
+    gold = out["item_id"].map(qid2ans)
+    correct = (out["student_answer"] == gold).astype("Int64")
+    out["gold_answer"] = gold
+    out["correct"] = correct.mask(gold.isna())
+    return out[OUT_COLS]
+
+
+_QID2ANS = {}
+
+
+def _init_worker(qid2ans):
+    global _QID2ANS
+    _QID2ANS = qid2ans
+
+
+def _write_part(job):
+    """worker：处理一批文件，写自己的 part csv；内存只和这一批有关。"""
+    k, files, parts_dir = job
+    df = flatten_batch(files, _QID2ANS)
+    path = os.path.join(parts_dir, f"part-{k:05d}.csv")
+    df.to_csv(path, index=False)
+    return {"part": os.path.basename(path), "files": len(files), "rows": len(df),
+            "first_user": os.path.basename(files[0]), "last_user": os.path.basename(files[-1])}
+
+
+def flatten_parallel(files, qid2ans, parts_dir, workers, batch_files):
+    """按 --batch_files 一批分给进程池，每批一个 part，返回按顺序的 manifest 条目。"""
+    os.makedirs(parts_dir, exist_ok=True)
+    jobs = [(k, files[s:s + batch_files], parts_dir) for k, s in enumerate(range(0, len(files), batch_files))]
+    parts, done, total = [], 0, 0
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, workers), initializer=_init_worker, initargs=(qid2ans,)) as ex:
+        for ent in ex.map(_write_part, jobs):
+            parts.append(ent)
+            done += ent["files"]
+            total += ent["rows"]
+            print(f"  ... processed {done}/{len(files)} users, {total} rows "
+                  f"({total / (time.perf_counter() - t0):,.0f} rows/s)")
+    return parts
+
+
+def concat_parts(parts_dir, parts, out):
+    """按 part 顺序把 csv 拼成一个文件（只保留第一个表头），按块拷贝，不进 pandas。"""
+    with open(out, "wb") as f_out:
+        for k, ent in enumerate(parts):
+            with open(os.path.join(parts_dir, ent["part"]), "rb") as f_in:
+                if k > 0:
+                    f_in.readline()
+                shutil.copyfileobj(f_in, f_out, 16 << 20)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--root", required=True, help="解压出来的 KT1 目录，比如 data/ednet_full/KT1")
+    ap.add_argument("--contents_root", default="", help="题库所在目录，比如 data/ednet_contents/")
+    ap.add_argument("--out", required=True)
+    ap.add_argument("--engine", choices=["parallel", "rows"], default="parallel",
+                    help="parallel: 进程池 + 分批写 part；rows: 原来的逐行写法")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    ap.add_argument("--batch_files", type=int, default=1000, help="每个 part 的用户文件数（决定每个进程的内存）")
+    ap.add_argument("--parts_dir", default=None, help="part 目录，默认 <out>.parts")
+    ap.add_argument("--parts_only", action="store_true", help="只写 part + manifest.json，不拼成一个 --out")
+    args = ap.parse_args()
+
+    # 1) 先尝试加载题库
+    qid2ans = load_contents(args.contents_root)
+    has_contents = len(qid2ans) > 0
+    if has_contents:
+        print(f"✅ loaded contents ({len(qid2ans)} questions) from {args.contents_root}")
+    else:
+        print("⚠️ 没有找到 contents/questions.csv → 会写出 correct=NA")
+
+    # 2) 扫用户文件
+    pattern = os.path.join(args.root, "u*.csv")
+    files = sorted(glob.glob(pattern))
+    print(f"[*] found {len(files)} user files under {args.root}")
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+
+    if args.engine == "rows":
+        out_df = flatten_rows(files, qid2ans)
+        out_df.to_csv(args.out, index=False)
+        print(f"✅ wrote {args.out} rows={len(out_df)}")
+    else:
+        parts_dir = args.parts_dir or args.out + ".parts"
+        created = not os.path.exists(parts_dir)
+        parts = flatten_parallel(files, qid2ans, parts_dir, args.workers, args.batch_files)
+        n_rows = sum(p["rows"] for p in parts)
+        manifest = {"root": args.root, "contents_root": args.contents_root, "columns": OUT_COLS,
+                    "files": len(files), "rows": n_rows, "parts": parts}
+        with open(os.path.join(parts_dir, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        if args.parts_only:
+            print(f"✅ wrote {len(parts)} parts + manifest.json under {parts_dir} rows={n_rows}")
+        else:
+            concat_parts(parts_dir, parts, args.out)
+            # 只删这次写的 part 和 manifest；目录是这次建的且已空才删目录，别动 --parts_dir 里原有的东西
+            for name in [p["part"] for p in parts] + ["manifest.json"]:
+                os.remove(os.path.join(parts_dir, name))
+            if created and not os.listdir(parts_dir):
+                os.rmdir(parts_dir)
+            print(f"✅ wrote {args.out} rows={n_rows}")
     if not has_contents:
         print("⚠️ 没有 contents → 先这样用，等你把题库下好再跑一遍。")
@@ -0,0 +1,214 @@
+import os, io, json, time, argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+"""
+直接从 EdNet-KT1.zip 里流式读用户 csv（zipfile，不解压），代替 ednet_scale_run.sh 里
+zipinfo + 每个成员一次 unzip + ednet_flatten_any.py 重新打开每个小文件的做法。
+
+- 成员按名字排序后 --n_users / --offset / --users 选人：--order bytes 是字节序（同 flatten_any 对 glob 结果的 sorted）；
+  --order sort 交给系统 sort（当前 locale），即旧 ednet_scale_run.sh 里 `zipinfo -1 | grep '^KT1/u' | sort` 的顺序，
+  用来复现已有 u200/u200b/u500/u1000 结果背后的同一批用户
+- 选中的成员切成连续区间分给 --workers 个进程，每个进程自己开 zip、只读自己那段；
+  一段里的成员去掉表头拼起来，只调一次 read_csv
+- 输出一个列式 .npz（--columnar）：
+    users      用户名（u123，取自文件名）     user_rows  每个用户的行区间 [user_rows[k], user_rows[k+1])
+    items      题号表（首次出现顺序）          item       int32 题号下标
+    correct    int8                            timestamp  int64（缺失为 -1）
+  行序 = 成员顺序 + 文件内顺序，和进程数无关
+- --slices u200=0:200,u500=0:500 ... 按用户下标区间从列式文件切出 flatten_any 格式的 csv
+  （user_id,item_id,correct,timestamp），u200/u500/u1000 只是同一次扫描的视图；
+  切片内的用户按文件名字节序输出（同 flatten_any 读解压目录的顺序），与 --order 无关；
+  不给 --zip 时直接读已有的 --columnar 切片
+"""
+
+# 同 ednet_flatten_any.py：按顺序取第一个存在的列
+ITEM_COLS = ("problem_id", "item_id", "question_id")
+CORRECT_COLS = ("correct", "solved")
+TIME_COLS = ("timestamp", "time")
+
+
+def list_members(zip_path, prefix="KT1/u", order="bytes"):
+    import zipfile
+    with zipfile.ZipFile(zip_path) as zf:
+        names = [n for n in zf.namelist() if n.startswith(prefix) and n.endswith(".csv")]
+    if order == "sort":
+        # 与旧脚本一样交给 sort(1)：继承当前环境的 LC_ALL / LANG，u1.csv / u10.csv 的先后随 locale
+        import subprocess
+        out = subprocess.run(["sort"], input="".join(n + "\n" for n in names),
+                             capture_output=True, text=True, check=True).stdout
+        return out.splitlines()
+    return sorted(names)
+
+
+def select_members(members, n_users=None, offset=0, users_file=None):
+    if users_file:
+        with open(users_file, encoding="utf-8") as f:
+            want = {os.path.splitext(os.path.basename(line.strip()))[0] for line in f if line.strip()}
+        members = [m for m in members if os.path.splitext(os.path.basename(m))[0] in want]
+        missing = len(want) - len(members)
+        if missing:
+            print(f"⚠️ {missing} users in {users_file} not found in the zip")
+    members = members[offset:]
+    return members[:n_users] if n_users else members
+
+
+def _pick(df, names, default):
+    out = None
+    for c in names:
+        if c in df.columns:
+            out = df[c] if out is None else out.fillna(df[c])
+    if out is None:
+        return pd.Series(default, index=df.index)
+    return out.fillna(default)
+
+
+def _to_correct(s):
+    num = pd.to_numeric(s, errors="coerce")
+    truthy = s.astype(str).str.lower().isin(["true", "t", "yes"])
+    return np.where(num.notna(), num.fillna(0), truthy).astype(np.int8)
+
+
+def _read_range(job):
+    """一个进程读一段连续成员：返回每个成员的行数、块内题号码/题号表、correct、timestamp。"""
+    import zipfile
+    zip_path, members = job
+    header, bodies, n_rows = None, [], []
+    with zipfile.ZipFile(zip_path) as zf:
+        for name in members:
+            data = zf.read(name)
+            head, _, body = data.partition(b"\n")
+            head = head.rstrip(b"\r")
+            if header is None:
+                header = head
+            elif head != header:
+                raise ValueError(f"{name}: header {head!r} differs from {header!r}")
+            body = body.rstrip(b"\r\n")
+            n_rows.append(body.count(b"\n") + 1 if body else 0)
+            if body:
+                bodies.append(body + b"\n")
+    n_rows = np.asarray(n_rows, dtype=np.int64)
+    if not bodies:
+        return n_rows, np.zeros(0, np.int64), [], np.zeros(0, np.int8), np.zeros(0, np.int64)
+
+    names = header.decode("utf-8").split(",")
+    df = pd.read_csv(io.BytesIO(b"".join(bodies)), names=names, header=None, dtype=str,
+                     keep_default_na=False, na_values=[""], skip_blank_lines=False)
+    if len(df) != n_rows.sum():
+        raise ValueError(f"parsed {len(df)} rows, expected {n_rows.sum()} ({members[0]} .. {members[-1]})")
+    codes, uniques = pd.factorize(_pick(df, ITEM_COLS, ""), sort=False)
+    correct = _to_correct(_pick(df, CORRECT_COLS, "0"))
+    ts = pd.to_numeric(_pick(df, TIME_COLS, ""), errors="coerce").fillna(-1).astype(np.int64).to_numpy()
+    return n_rows, codes.astype(np.int64), list(uniques), correct, ts
+
+
+def scan_zip(zip_path, members, workers=4, members_per_job=2000):
+    """按成员区间并行读，按区间顺序拼回去；题号全局编码按首次出现顺序。"""
+    jobs = [(zip_path, members[s:s + members_per_job]) for s in range(0, len(members), members_per_job)]
+    items, item_codes = [], {}
+    n_rows, item, correct, ts = [], [], [], []
+    t0, total = time.perf_counter(), 0
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as ex:
+        # map 保证结果按提交顺序返回
+        for k, (nr, codes, uniques, c, t) in enumerate(ex.map(_read_range, jobs)):
+            table = np.empty(len(uniques), dtype=np.int32)
+            for j, v in enumerate(uniques):
+                g = item_codes.get(v)
+                if g is None:
+                    g = item_codes[v] = len(items)
+                    items.append(v)
+                table[j] = g
+            n_rows.append(nr)
+            item.append(table[codes])
+            correct.append(c)
+            ts.append(t)
+            total += len(c)
+            done = min((k + 1) * members_per_job, len(members))
+            print(f"[scan] {done}/{len(members)} users, {total} rows ... "
+                  f"({total / (time.perf_counter() - t0):,.0f} rows/s)")
+
+    n_rows = np.concatenate(n_rows) if n_rows else np.zeros(0, np.int64)
+    user_rows = np.zeros(len(members) + 1, dtype=np.int64)
+    np.cumsum(n_rows, out=user_rows[1:])
+    return {
+        "users": np.array([os.path.splitext(os.path.basename(m))[0] for m in members]),
+        "user_rows": user_rows,
+        "items": np.array(items, dtype=str),
+        "item": np.concatenate(item) if item else np.zeros(0, np.int32),
+        "correct": np.concatenate(correct) if correct else np.zeros(0, np.int8),
+        "timestamp": np.concatenate(ts) if ts else np.zeros(0, np.int64),
+    }
+
+
+def slice_users(cols, start, stop):
+    """用户下标 [start, stop) 的 flatten_any 格式 DataFrame；用户按文件名字节序（flatten_any 的 sorted(glob)）。"""
+    users, user_rows = cols["users"], cols["user_rows"]
+    stop = min(stop, len(users))
+    sel = start + np.argsort(np.asarray(users[start:stop], dtype=str), kind="stable")
+    lens = user_rows[sel + 1] - user_rows[sel]
+    # 每个用户的行区间按新顺序拼起来（--order bytes 时就是 [lo, hi) 原样）
+    rows = np.repeat(user_rows[sel] - np.cumsum(lens) + lens, lens) + np.arange(lens.sum())
+    ts = pd.Series(cols["timestamp"][rows], dtype="Int64")
+    return pd.DataFrame({
+        "user_id": np.repeat(users[sel], lens),
+        "item_id": cols["items"][cols["item"][rows]],
+        "correct": cols["correct"][rows],
+        "timestamp": ts.where(ts >= 0),
+    })
+
+
+def parse_slices(spec):
+    out = []
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, rng = part.partition("=")
+        a, _, b = rng.partition(":")
+        out.append((name.strip(), int(a or 0), int(b)))
+    return out
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--zip", default=None, help="EdNet-KT1.zip；不给则直接读已有的 --columnar 切片")
+    ap.add_argument("--columnar", default="analysis/ednet_kt1_columns.npz", help="列式输出（或输入）")
+    ap.add_argument("--prefix", default="KT1/u", help="zip 内用户文件的前缀")
+    ap.add_argument("--order", choices=["bytes", "sort"], default="bytes",
+                    help="选人用的成员顺序：bytes = 字节序；sort = 系统 sort(1)，复现旧 ednet_scale_run.sh 的用户集合")
+    ap.add_argument("--n_users", type=int, default=None, help="只取排序后的前 N 个用户（--offset 之后）")
+    ap.add_argument("--offset", type=int, default=0)
+    ap.add_argument("--users", default=None, help="可选：用户列表文件（u123 或 KT1/u123.csv，一行一个）")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    ap.add_argument("--members_per_job", type=int, default=2000)
+    ap.add_argument("--slices", default="", help="如 u200=0:200,u200b=200:400,u500=0:500（用户下标区间）")
+    ap.add_argument("--slice_dir", default="analysis", help="切片写成 <slice_dir>/ednet_flat_<name>.csv")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    if args.zip:
+        members = select_members(list_members(args.zip, args.prefix, args.order), args.n_users, args.offset, args.users)
+        cols = scan_zip(args.zip, members, args.workers, args.members_per_job)
+        os.makedirs(os.path.dirname(args.columnar) or ".", exist_ok=True)
+        np.savez(args.columnar, **cols)
+        with open(os.path.splitext(args.columnar)[0] + ".json", "w", encoding="utf-8") as f:
+            json.dump({"zip": args.zip, "prefix": args.prefix, "order": args.order, "n_users": len(members),
+                       "n_rows": int(cols["user_rows"][-1]), "n_items": len(cols["items"]),
+                       "first_user": members[0] if members else None,
+                       "last_user": members[-1] if members else None}, f, ensure_ascii=False, indent=2)
+        elapsed = time.perf_counter() - t0
+        print(f"✅ wrote {args.columnar} users={len(members)} rows={cols['user_rows'][-1]} "
+              f"items={len(cols['items'])} in {elapsed:.1f}s")
+    else:
+        with np.load(args.columnar) as z:
+            cols = {k: z[k] for k in z.files}
+
+    for name, a, b in parse_slices(args.slices):
+        if b > len(cols["users"]):
+            print(f"⚠️ slice {name}={a}:{b} but only {len(cols['users'])} users scanned")
+        df = slice_users(cols, a, b)
+        out = os.path.join(args.slice_dir, f"ednet_flat_{name}.csv")
+        os.makedirs(args.slice_dir, exist_ok=True)
+        df.to_csv(out, index=False)
+        print(f"✅ wrote {out} rows: {len(df)} users: {df['user_id'].nunique()}")
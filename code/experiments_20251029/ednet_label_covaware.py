@@ -1,7 +1,7 @@
 import csv, argparse, os, numpy as np
 from collections import defaultdict, Counter
 
-def label_covaware(log_csv, out_csv, low_thr=5, high_thr=20):
+def item_stats_csv(log_csv):
     per_item = defaultdict(list)
     with open(log_csv, newline="", encoding="utf-8") as f:
         r = csv.DictReader(f)
@@ -9,12 +9,28 @@ def label_covaware(log_csv, out_csv, low_thr=5, high_thr=20):
             iid = row["item_id"]
             corr = int(row["correct"])
             per_item[iid].append(corr)
+    for iid, corr_list in per_item.items():
+        yield iid, len(corr_list), 1 - np.mean(corr_list)
+
+
+def item_stats_store(store_dir):
+    """交互存储（ednet_to_store.py 的输出）：按 item_idx bincount，不解析 csv；缺失的 correct 记 0。"""
+    from src.utils.interaction_store import open_store
+    st = open_store(store_dir)
+    cnt = np.bincount(st.item_idx, minlength=st.n_items)
+    corr = np.bincount(st.item_idx, weights=np.asarray(st.correct) == 1, minlength=st.n_items)
+    for iid, c, s in zip(st.items, cnt.tolist(), corr.tolist()):
+        if c:
+            yield iid, c, 1 - s / c
+
+
+def label_covaware(log_csv, out_csv, low_thr=5, high_thr=20):
+    # --logs 可以是平铺 csv，也可以是交互存储目录
+    stats = item_stats_store(log_csv) if os.path.isdir(log_csv) else item_stats_csv(log_csv)
 
     items = []
     hi_errs = []
-    for iid, corr_list in per_item.items():
-        cnt = len(corr_list)
-        err = 1 - np.mean(corr_list)
+    for iid, cnt, err in stats:
         items.append({"item_id": iid, "err_rate": err, "count": cnt})
         if cnt >= high_thr:
             hi_errs.append(err)
@@ -11,7 +11,14 @@ if __name__ == "__main__":
     counts = defaultdict(int)
     total_rows = 0
 
-    for chunk in pd.read_csv(args.logs, chunksize=args.chunksize):
+    if os.path.isdir(args.logs):
+        # 交互存储（ednet_to_store.py 的输出）：按块解码回同样的列，不解析 csv
+        from src.utils.interaction_store import open_store
+        chunks = open_store(args.logs).iter_frames(args.chunksize, ["item_id", "student_answer"])
+    else:
+        chunks = pd.read_csv(args.logs, chunksize=args.chunksize)
+
+    for chunk in chunks:
         # 期望列：user_id,item_id,student_answer,gold_answer,correct,timestamp
         for row in chunk.itertuples(index=False):
             item = str(row.item_id)
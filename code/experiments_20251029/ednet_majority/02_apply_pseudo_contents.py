@@ -18,7 +18,14 @@ if __name__ == "__main__":
     first = True
     total = 0
 
-    for chunk in pd.read_csv(args.logs, chunksize=args.chunksize):
+    if os.path.isdir(args.logs):
+        # 交互存储（ednet_to_store.py 的输出）：按块解码回 user_id,item_id,student_answer,correct,timestamp
+        from src.utils.interaction_store import open_store
+        chunks = open_store(args.logs).iter_frames(args.chunksize)
+    else:
+        chunks = pd.read_csv(args.logs, chunksize=args.chunksize)
+
+    for chunk in chunks:
         chunk["item_id"] = chunk["item_id"].astype(str)
         chunk["student_answer"] = chunk["student_answer"].astype(str)
 
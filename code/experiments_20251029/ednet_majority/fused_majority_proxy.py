@@ -0,0 +1,228 @@
+import os, time, argparse
+import numpy as np
+import pandas as pd
+
+"""
+一次流式作业替代 00_build_majority_key → 01_pick_majority_answer → 02_apply_pseudo_contents
+→ ednet_make_proxy_labels_big.py 这条链（原来要把 95M 行的大 csv 读 3 遍、再整个重写一遍加 correct 列）。
+
+pass 1（只读一遍 csv，只取 item_id / student_answer 两列）：
+- item_id 逐块 factorize 成全局整数下标（首次出现顺序）
+- a–d 的计数累加进稠密 int32 矩阵 counts[n_items, 4]；其它答案（nan、脏值）很少，单独记
+- 同时记每个 (item, answer) 首次出现的行号：01 的稳定排序在 cnt 打平时取先出现的答案，这里照做
+- 需要 correct 列时，把每行的 (item 下标, answer 码)（int32 对）顺手写进临时文件
+多数答案 = 每个 item 计数最大的答案；correct_sum = 多数答案那一格的计数 → 直接出标签。
+
+pass 2（仅 --correct_out 时；读的是 pass 1 的紧凑临时文件，不再解析 csv）：
+- 逐行 correct = (answer 码 == 该 item 多数答案码)，写成与 --logs 行序对齐的 int8 .npy
+- 顺便按 item 求和，和 pass 1 推出来的 correct_sum 对账
+
+--logs 也可以是交互存储目录（ednet_to_store.py 的输出）：
+item / 答案本来就是整数码，pass 1 直接切 memmap，不再解析 csv；行序、首次出现都按存储的 (user, timestamp) 顺序。
+
+输出与原链一致：
+- --out           : item_id,cnt,acc,err,H_proxy（同 ednet_make_proxy_labels_big.py）
+- --out_contents  : 可选，item_id,correct_answer,cnt（同 01 的 ednet_pseudo_contents.csv）
+- --correct_out   : 可选，correct 列（int8，1/0），代替 02 重写出来的 ednet_flat_with_correct.csv
+"""
+
+# H_proxy 标签规则只在 ednet_make_proxy_labels_big.py 里定义一份
+from experiments_20251029.ednet_make_proxy_labels_big import label_items
+
+ANSWERS = ("a", "b", "c", "d")
+NEVER = np.iinfo(np.int64).max
+NA = "nan"
+
+
+class _Index:
+    """字符串 -> 全局整数码（首次出现顺序），逐块 factorize 后只对块内去重值查字典。"""
+
+    def __init__(self, seed=()):
+        self.codes = {}
+        self.values = []
+        self.encode_uniques(list(seed))
+
+    def encode_uniques(self, uniques):
+        out = np.empty(len(uniques), dtype=np.int64)
+        for k, v in enumerate(uniques):
+            g = self.codes.get(v)
+            if g is None:
+                g = self.codes[v] = len(self.values)
+                self.values.append(v)
+            out[k] = g
+        return out
+
+    def encode(self, series):
+        # 缺失值 factorize 成 -1：单独编成 "nan"（同原链 str() 后的写法），别让 -1 索引到最后一个值上
+        codes, uniques = pd.factorize(series.astype(str), sort=False)
+        table = self.encode_uniques(uniques)
+        if (codes < 0).any():
+            table = np.append(table, self.encode_uniques([NA]))
+        return table[codes]
+
+
+def _grow(a, n, fill):
+    if n <= len(a):
+        return a
+    size = max(n, 2 * len(a))
+    pad = np.full((size - len(a),) + a.shape[1:], fill, dtype=a.dtype)
+    return np.concatenate([a, pad])
+
+
+def csv_codes(logs, chunksize, items, answers):
+    """平铺 csv：逐块把 item_id / student_answer 编成全局码。"""
+    for chunk in pd.read_csv(logs, chunksize=chunksize, usecols=["item_id", "student_answer"]):
+        yield items.encode(chunk["item_id"]), answers.encode(chunk["student_answer"])
+
+
+def store_codes(st, chunksize, answers):
+    """交互存储（ednet_to_store.py）：item_idx / answer 本来就是码，直接切 memmap；缺失答案（-1）归到 "nan"。"""
+    na = answers.encode_uniques([NA])[0]
+    for s in range(0, len(st), chunksize):
+        a = np.asarray(st.answer[s:s + chunksize], dtype=np.int64)
+        yield np.asarray(st.item_idx[s:s + chunksize], dtype=np.int64), np.where(a < 0, na, a)
+
+
+def pass1(chunks, items, answers, spill_path=None):
+    counts = np.zeros((1024, 4), dtype=np.int32)
+    first = np.full((1024, 4), NEVER, dtype=np.int64)
+    other = {}                              # (item 下标, answer 码>=4) -> [cnt, 首次行号]
+    spill = open(spill_path, "wb") if spill_path else None
+
+    total = 0
+    t0 = time.perf_counter()
+    try:
+        for g, a in chunks:
+            counts = _grow(counts, len(items.values), 0)
+            first = _grow(first, len(items.values), NEVER)
+
+            dense = a < 4
+            flat = g[dense] * 4 + a[dense]
+            counts.reshape(-1)[:] += np.bincount(flat, minlength=counts.size).astype(np.int32)
+            # 每格的首次出现：只在这格还没见过时记（块按顺序来，块内 np.unique 取的就是第一次）
+            cells, idx = np.unique(flat, return_index=True)
+            pos = total + np.flatnonzero(dense)[idx]
+            fresh = first.reshape(-1)[cells] == NEVER
+            first.reshape(-1)[cells[fresh]] = pos[fresh]
+
+            if not dense.all():
+                rows = np.flatnonzero(~dense)
+                for gi, ai, r in zip(g[rows].tolist(), a[rows].tolist(), (total + rows).tolist()):
+                    ent = other.setdefault((gi, ai), [0, r])
+                    ent[0] += 1
+
+            if spill is not None:
+                np.stack([g.astype(np.int32), a.astype(np.int32)], axis=1).tofile(spill)
+            total += len(g)
+            print(f"[pass1] {total} rows ... ({total / (time.perf_counter() - t0):,.0f} rows/s)")
+    finally:
+        if spill is not None:
+            spill.close()
+    n = len(items.values)
+    return items, answers, counts[:n], first[:n], other, total
+
+
+def pick_majority(counts, first, other):
+    """
+    每个 item 的多数答案码与其计数。规则同 01（按 cnt 降序的稳定排序取第一个）：
+    计数最大者；打平时取先出现的 (item, answer)。
+    """
+    best_cnt = counts.max(axis=1).astype(np.int64)
+    tie_first = np.where(counts == best_cnt[:, None], first, NEVER)
+    key = tie_first.argmin(axis=1).astype(np.int64)
+    key_first = tie_first[np.arange(len(key)), key]
+    # 只出现过 a–d 以外答案的 item：best_cnt 为 0，由下面的 other 接管
+    key_first[best_cnt == 0] = NEVER
+    for (gi, ai), (cnt, r) in other.items():
+        if cnt > best_cnt[gi] or (cnt == best_cnt[gi] and r < key_first[gi]):
+            best_cnt[gi], key[gi], key_first[gi] = cnt, ai, r
+    return key, best_cnt
+
+
+def pass2(spill_path, total, key, correct_out, chunksize):
+    """逐块读 pass 1 的 (item, answer) 码，写 correct 列并返回按 item 求和的 correct 计数。"""
+    codes = np.memmap(spill_path, dtype=np.int32, mode="r", shape=(total, 2))
+    out = np.lib.format.open_memmap(correct_out, mode="w+", dtype=np.int8, shape=(total,))
+    corr = np.zeros(len(key), dtype=np.int64)
+    t0 = time.perf_counter()
+    for s in range(0, total, chunksize):
+        g, a = codes[s:s + chunksize, 0], codes[s:s + chunksize, 1]
+        c = (a == key[g]).astype(np.int8)
+        out[s:s + len(c)] = c
+        corr += np.bincount(g, weights=c, minlength=len(key)).astype(np.int64)
+        done = s + len(c)
+        print(f"[pass2] {done} rows ... ({done / (time.perf_counter() - t0):,.0f} rows/s)")
+    out.flush()
+    del codes, out
+    return corr
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--logs", default="analysis/ednet_flat_ednet_true.csv", help="平铺 csv，或交互存储目录")
+    ap.add_argument("--out", default="analysis/ednet_proxy_labels_full.csv")
+    ap.add_argument("--out_contents", default=None, help="可选：多数答案表（同 01 的输出格式）")
+    ap.add_argument("--correct_out", default=None,
+                    help="可选：与 --logs 行序（存储则为存储行序）对齐的 correct 列（int8 .npy），代替重写整个 csv")
+    ap.add_argument("--chunksize", type=int, default=500_000)
+    ap.add_argument("--min_cnt", type=int, default=5)
+    ap.add_argument("--lo_thr", type=float, default=0.4)
+    ap.add_argument("--hi_thr", type=float, default=0.7)
+    args = ap.parse_args()
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    t0 = time.perf_counter()
+    spill_path = None
+    if args.correct_out:
+        os.makedirs(os.path.dirname(args.correct_out) or ".", exist_ok=True)
+        spill_path = args.correct_out + ".codes.tmp"
+    if os.path.isdir(args.logs):
+        from src.utils.interaction_store import open_store
+        st = open_store(args.logs)
+        if st.answers[:4] != list(ANSWERS):
+            raise ValueError(f"{args.logs}: answer codes {st.answers[:4]} are not {list(ANSWERS)}")
+        items, answers = _Index(st.items), _Index(st.answers)
+        chunks = store_codes(st, args.chunksize, answers)
+    else:
+        items = _Index()
+        answers = _Index(ANSWERS)           # a–d 固定为 0..3，其余答案按出现顺序往后编
+        chunks = csv_codes(args.logs, args.chunksize, items, answers)
+    items, answers, counts, first, other, total = pass1(chunks, items, answers, spill_path)
+    key, key_cnt = pick_majority(counts, first, other)
+
+    # 每个 item 的行数 = a–d 计数 + 其它答案计数
+    cnt = counts.sum(axis=1, dtype=np.int64)
+    for (gi, _), (c, _) in other.items():
+        cnt[gi] += c
+    # 多数答案那一格的计数就是按多数答案判对的行数；多数答案是缺失值时同 02：没有一行算对
+    na_key = key == answers.codes.get(NA, -1)
+    corr_sum = np.where(na_key, 0, key_cnt)
+    key = np.where(na_key, -1, key)
+
+    if args.correct_out:
+        try:
+            corr2 = pass2(spill_path, total, key, args.correct_out, args.chunksize)
+        finally:
+            os.remove(spill_path)
+        if not np.array_equal(corr2, corr_sum):
+            raise RuntimeError("pass2 correct counts disagree with the pass1 majority counts")
+        print(f"✅ wrote {args.correct_out} rows={total}")
+
+    acc, err, labels = label_items(cnt, corr_sum, args.min_cnt, args.lo_thr, args.hi_thr)
+    df = pd.DataFrame({"item_id": items.values, "cnt": cnt, "acc": acc, "err": err, "H_proxy": labels})
+    df.to_csv(args.out, index=False)
+    print(f"✅ wrote {args.out} items: {len(df)}")
+
+    if args.out_contents:
+        cont = pd.DataFrame({"item_id": items.values,
+                             "correct_answer": [answers.values[k] if k >= 0 else None for k in key],
+                             "cnt": key_cnt})
+        # 01 的输出按 item_id 排序
+        cont = cont.sort_values("item_id", kind="stable").reset_index(drop=True)
+        os.makedirs(os.path.dirname(args.out_contents) or ".", exist_ok=True)
+        cont.to_csv(args.out_contents, index=False)
+        print(f"✅ wrote {args.out_contents} rows={len(cont)}")
+
+    elapsed = time.perf_counter() - t0
+    print(f"[fused] {total} rows in {elapsed:.1f}s -> {total / max(elapsed, 1e-9):,.0f} rows/s")
+    print("dist:", df["H_proxy"].value_counts().to_dict())
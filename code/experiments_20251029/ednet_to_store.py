@@ -0,0 +1,24 @@
+import argparse
+
+from src.utils.interaction_store import convert_csv, open_store
+
+"""
+把 flatten 出来的平铺 csv（ednet_flatten_* 的输出，user_id,item_id[,student_answer,correct,timestamp]）
+转成内存映射的交互存储目录（src/utils/interaction_store.py）：
+  user_idx/item_idx int32、answer/correct int8、timestamp int64 各一个 .npy，
+  users.json / items.json / answers.json 是字典，行按 (user, timestamp) 排好。
+之后 ednet_label_covaware.py、ednet_majority/*（00 / 02 / fused_majority_proxy.py）、
+baselines/cl4kt_diff/00_make_sessions_from_ednet.py 的 --logs（02_featurize_strict.py 是 --store）都可以直接给这个目录，
+不用再解析文本 csv。
+"""
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--logs", required=True, nargs="+", help="一个或多个平铺 csv（按给的顺序拼接）")
+    ap.add_argument("--out", required=True, help="输出目录，如 analysis/ednet_store_ednet_true")
+    ap.add_argument("--chunksize", type=int, default=1_000_000)
+    args = ap.parse_args()
+
+    convert_csv(args.logs, args.out, args.chunksize)
+    st = open_store(args.out)
+    print(f"✅ wrote {args.out} rows={len(st)} users={st.n_users} items={st.n_items}")
@@ -2,33 +2,33 @@ import csv, argparse, os
 from collections import defaultdict, Counter
 from statistics import mean
 
-def load_scores(path):
-    # 读取每题的5轮记录，返回 {qid: {"acc":..., "mean_p":..., "stability":..., "answers":[...]} }
-    per_q = defaultdict(lambda: {"corrects":[], "ps":[], "answers":[]})
-    with open(path, newline="", encoding="utf-8") as f:
-        r = csv.DictReader(f)
-        for row in r:
-            qid = row.get("qid") or row.get("question_id")
-            if not qid: continue
-            # correct
-            c = row.get("correct")
-            try:
-                c = int(c)
-            except:
-                c = 1 if str(c).lower() in ("1","true","yes") else 0
-            # prob
-            p = row.get("p_chosen") or row.get("prob") or row.get("confidence")
-            try:
-                p = float(p)
-            except:
-                p = None
-            # answer token
-            a = row.get("chosen") or row.get("pred") or row.get("answer")
-            per_q[qid]["corrects"].append(c)
-            if p is not None:
-                per_q[qid]["ps"].append(p)
-            if a is not None:
-                per_q[qid]["answers"].append(a)
+def _new_acc():
+    return defaultdict(lambda: {"corrects":[], "ps":[], "answers":[]})
+
+def _accumulate(per_q, row):
+    qid = row.get("qid") or row.get("question_id")
+    if not qid: return
+    # correct
+    c = row.get("correct")
+    try:
+        c = int(c)
+    except:
+        c = 1 if str(c).lower() in ("1","true","yes") else 0
+    # prob
+    p = row.get("p_chosen") or row.get("prob") or row.get("confidence")
+    try:
+        p = float(p)
+    except:
+        p = None
+    # answer token
+    a = row.get("chosen") or row.get("pred") or row.get("answer")
+    per_q[qid]["corrects"].append(c)
+    if p is not None:
+        per_q[qid]["ps"].append(p)
+    if a is not None:
+        per_q[qid]["answers"].append(a)
+
+def _summarize(per_q):
     out = {}
     for qid, d in per_q.items():
         acc = mean(d["corrects"]) if d["corrects"] else 0.0
@@ -37,6 +37,22 @@ def load_scores(path):
         out[qid] = {"acc": round(acc,4), "mean_p": round(mp,4), "stability": stab}
     return out
 
+def load_scores(path):
+    # 读取每题的5轮记录，返回 {qid: {"acc":..., "mean_p":..., "stability":..., "answers":[...]} }
+    per_q = _new_acc()
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            _accumulate(per_q, row)
+    return _summarize(per_q)
+
+def load_scores_long(path):
+    # runner.py score --model a,b,c 的长表：一次读取，按 model 列拆分 -> {model: load_scores 同结构}
+    per_m = defaultdict(_new_acc)
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            _accumulate(per_m[row["model"]], row)
+    return {m: _summarize(pq) for m, pq in per_m.items()}
+
 def join_keys(*dicts):
     s=set()
     for d in dicts: s.update(d.keys())
@@ -50,13 +66,25 @@ if __name__=="__main__":
     ap.add_argument("--out_csv", default="analysis/race_stage3_per_question.csv")
     ap.add_argument("--out_sepA", default="analysis/race_stage3_separators_A.json")
     ap.add_argument("--out_sepB", default="analysis/race_stage3_separators_B.json")
+    ap.add_argument("--long", default=None,
+                    help="单个长表 scores.csv（runner.py score --model a,b,c），给定时忽略 --mini/--qwen/--deep")
+    ap.add_argument("--models", default=None,
+                    help="长表中 mini,qwen,deep 对应的 model 名（逗号分隔，顺序固定；配合 --long 使用）")
     args = ap.parse_args()
 
     os.makedirs(os.path.dirname(args.out_csv), exist_ok=True)
 
-    m = load_scores(args.mini)
-    q = load_scores(args.qwen)
-    d = load_scores(args.deep)
+    if args.long:
+        by_model = load_scores_long(args.long)
+        names = [x.strip() for x in (args.models or "").split(",") if x.strip()]
+        missing = [n for n in names if n not in by_model]
+        if len(names) != 3 or missing:
+            raise SystemExit(f"--models 需要 3 个长表中存在的 model 名；缺失: {missing}，已有: {sorted(by_model)}")
+        m, q, d = (by_model[n] for n in names)
+    else:
+        m = load_scores(args.mini)
+        q = load_scores(args.qwen)
+        d = load_scores(args.deep)
 
     keys = join_keys(m,q,d)
 
@@ -16,7 +16,7 @@ def _load_items(path):
         if c in df.columns: df[c] = df[c].fillna("")
     return df
 
-def _encode_mc(tok, batch, max_len=512):
+def _encode_mc(tok, batch, max_len=512, cache=None):
     contexts  = batch["context"].tolist() if "context" in batch.columns else [""]*len(batch)
     questions = batch["question"].tolist()
     choices   = [batch[f"choice_{k}"].tolist() for k in CHOICE_KEYS]
@@ -26,8 +26,14 @@ def _encode_mc(tok, batch, max_len=512):
         prompt = (cxt + " " + q).strip() if cxt else q
         for k_idx in range(4):
             texts.append((prompt, choices[k_idx][i]))
-    enc = tok([t[0] for t in texts], [t[1] for t in texts],
-              padding=True, truncation=True, max_length=max_len, return_tensors="pt")
+    if cache is not None:
+        # 预分词缓存（memmap），共享同一 tokenizer 的模型直接复用
+        pre = cache.encode_pairs([t[0] for t in texts], [t[1] for t in texts])
+        feats = [{k: pre[k][i] for k in pre} for i in range(len(texts))]
+        enc = tok.pad(feats, padding=True, return_tensors="pt")
+    else:
+        enc = tok([t[0] for t in texts], [t[1] for t in texts],
+                  padding=True, truncation=True, max_length=max_len, return_tensors="pt")
     bsz = len(questions)
     for k in enc:
         enc[k] = enc[k].view(bsz, 4, -1)
@@ -38,7 +44,7 @@ def _logits_to_probs(logits):
     e = torch.exp(z)
     return e / e.sum(dim=1, keepdim=True)
 
-def run(model_name, items_csv, out_csv, batch_size=8, device=None):
+def run(model_name, items_csv, out_csv, batch_size=8, device=None, token_cache=None):
     t0=time.time()
     Path(out_csv).parent.mkdir(parents=True, exist_ok=True)
     df=_load_items(items_csv)
@@ -48,11 +54,15 @@ def run(model_name, items_csv, out_csv, batch_size=8, device=None):
     tok = AutoTokenizer.from_pretrained(model_name, use_fast=True)
     mdl = AutoModelForMultipleChoice.from_pretrained(model_name).to(device)
     mdl.eval()
+    cache = None
+    if token_cache:
+        from src.scoring.token_cache import TokenCache  # 需要 PYTHONPATH=.
+        cache = TokenCache(token_cache, tok, 512)
 
     rows=[]
     for i in range(0, len(df), batch_size):
         chunk = df.iloc[i:i+batch_size].copy()
-        enc = _encode_mc(tok, chunk)
+        enc = _encode_mc(tok, chunk, cache=cache)
         enc = {k:v.to(device) for k,v in enc.items()}
         with torch.no_grad():
             out = mdl(**enc)
@@ -88,6 +98,7 @@ if __name__ == "__main__":
     ap.add_argument("--alias", required=True)
     ap.add_argument("--items", default="data/eedi_raw_items.csv")
     ap.add_argument("--batch_size", type=int, default=8)
+    ap.add_argument("--token_cache", default=None, help="预分词缓存目录（如 outputs/.cache/tokens）")
     args = ap.parse_args()
     out_csv = f"experiments_20251029/results/eedi/{args.alias}/round1/per_question.csv"
-    run(args.model, args.items, out_csv, batch_size=args.batch_size)
+    run(args.model, args.items, out_csv, batch_size=args.batch_size, token_cache=args.token_cache)
@@ -0,0 +1,118 @@
+import os, sys, json, shlex, argparse, subprocess
+
+import pandas as pd
+
+from src.scoring.mock_server import MockConfig, start_mock_server
+
+# runner.py score 的吞吐 / 尾延迟基准：在本进程内起 mock 服务器（不花 API 费用、无需联网），
+# 按不同 --concurrency 逐次跑 score，汇总 items/s 与 p50/p95/p99 延迟（来自 run_summary.json）。
+# mock 的回答只取决于请求内容，所以各并发档的 scores.csv 应完全一致（scores_match 列）。
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCORE_COLS = ["question_id", "run_id", "chosen", "p_A", "p_B", "p_C", "p_D"]
+
+
+def run_score(args, conc: int, url: str, out_dir: str):
+    cmd = [sys.executable, os.path.join(ROOT, "runner.py"), "score", "--dataset", args.dataset,
+           "--split", args.split, "--model", args.model, "--rounds", str(args.rounds),
+           "--concurrency", str(conc), "--out", out_dir] + shlex.split(args.score_args)
+    env = {**os.environ, "OPENAI_BASE_URL": url, "OPENAI_API_KEY": "mock"}
+    p = subprocess.run(cmd, cwd=args.cwd, env=env, capture_output=True, text=True)
+    if p.returncode != 0:
+        raise RuntimeError(f"score --concurrency {conc} failed:\n{p.stderr.strip()[-2000:]}")
+    with open(os.path.join(out_dir, "run_summary.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="runner.py score 吞吐/尾延迟基准（本地 mock chat-completions 服务器）")
+    ap.add_argument("--dataset", default="race", choices=["race", "eedi"])
+    ap.add_argument("--split", default="test")
+    ap.add_argument("--model", default="openai:gpt-4o-mini")
+    ap.add_argument("--rounds", type=int, default=3)
+    ap.add_argument("--concurrency", default="1,8,32,128", help="逗号分隔的并发档")
+    ap.add_argument("--score-args", default="", help="额外传给 score 的参数，如 \"--rps 200\"")
+    ap.add_argument("--cwd", default=".", help="运行 score 的目录（数据路径相对于它）")
+    ap.add_argument("--out", default="outputs/bench_score")
+    # mock 服务器行为，见 src/scoring/mock_server.py 的 MockConfig
+    ap.add_argument("--latency", default="lognormal:40,0.5")
+    ap.add_argument("--tail-prob", type=float, default=0.01)
+    ap.add_argument("--tail-ms", type=float, default=500.0)
+    ap.add_argument("--error-rate", type=float, default=0.01)
+    ap.add_argument("--rate-limit-rate", type=float, default=0.01)
+    ap.add_argument("--capacity", type=int, default=0)
+    ap.add_argument("--nonletter-first", type=float, default=0.05)
+    ap.add_argument("--seed", type=int, default=0)
+    # 回归门槛：与历史结果比较（同一并发档 items/s 下降超过 tolerance 即失败）
+    ap.add_argument("--baseline", default=None, help="之前的 bench_score.json")
+    ap.add_argument("--tolerance", type=float, default=0.2)
+    ap.add_argument("--max-p99-s", type=float, default=None, help="任一档 p99 延迟超过该值即失败")
+    args = ap.parse_args()
+
+    cfg = MockConfig(latency=args.latency, tail_prob=args.tail_prob, tail_ms=args.tail_ms,
+                     error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+                     capacity=args.capacity, nonletter_first=args.nonletter_first, seed=args.seed)
+    server = start_mock_server(cfg)
+    print(f"[mock] {server.url} latency={cfg.latency} errors={cfg.error_rate} 429={cfg.rate_limit_rate}")
+
+    rows, ref = [], None
+    try:
+        for conc in [int(c) for c in args.concurrency.split(",") if c.strip()]:
+            out_dir = os.path.join(args.out, "runs", f"c{conc}")
+            before = server.stats()
+            summ = run_score(args, conc, server.url, out_dir)
+            after = server.stats()
+            st = summ["models"][args.model]
+            scores = pd.read_csv(os.path.join(out_dir, "scores.csv"))[SCORE_COLS]
+            ref = scores if ref is None else ref
+            row = {
+                "concurrency": conc,
+                "rows": st["rows"],
+                "wall_s": round(st["wall_s"], 3),
+                "items_per_s": round(st["rows_per_s"], 2),
+                "latency_p50_s": st["latency_p50_s"],
+                "latency_p95_s": st["latency_p95_s"],
+                "latency_p99_s": st["latency_p99_s"],
+                "queue_wait_p95_s": st["queue_wait_p95_s"],
+                "retries": st["retries"],
+                "dead_letter_rows": st.get("dead_letter_rows", 0),
+                # AIMD 并发上限从 TRANSPORT_CONC_INIT 起爬升，冷启动的排队会计入尾延迟
+                "transport_limit": max((h["concurrency_limit"] for h in summ["transport"].values()), default=None),
+                "server_requests": after["requests"] - before["requests"],
+                "server_max_inflight": after["max_inflight"],
+                "scores_match": bool(scores.equals(ref)),
+            }
+            rows.append(row)
+            lat = "/".join("n/a" if row[f"latency_p{q}_s"] is None else f"{row[f'latency_p{q}_s']:.3f}"
+                           for q in (50, 95, 99))
+            print(f"c={conc:<4d} items/s={row['items_per_s']:8.1f}  p50/p95/p99={lat}s  "
+                  f"retries={row['retries']} dead={row['dead_letter_rows']} match={row['scores_match']}")
+    finally:
+        server.shutdown()
+
+    failed = [f"c={r['concurrency']}: scores differ from c={rows[0]['concurrency']}"
+              for r in rows if not r["scores_match"]]
+    if args.max_p99_s is not None:
+        failed += [f"c={r['concurrency']}: p99 {r['latency_p99_s']:.3f}s > {args.max_p99_s}s"
+                   for r in rows if r["latency_p99_s"] is not None and r["latency_p99_s"] > args.max_p99_s]
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            base = {r["concurrency"]: r for r in json.load(f)["runs"]}
+        for r in rows:
+            b = base.get(r["concurrency"])
+            if b and r["items_per_s"] < b["items_per_s"] * (1.0 - args.tolerance):
+                failed.append(f"c={r['concurrency']}: items/s {r['items_per_s']} < baseline {b['items_per_s']} "
+                              f"-{args.tolerance:.0%}")
+
+    os.makedirs(args.out, exist_ok=True)
+    with open(os.path.join(args.out, "bench_score.json"), "w", encoding="utf-8") as f:
+        json.dump({"mock": vars(cfg), "dataset": args.dataset, "model": args.model, "rounds": args.rounds,
+                   "runs": rows, "failed": failed}, f, ensure_ascii=False, indent=2)
+    pd.DataFrame(rows).to_csv(os.path.join(args.out, "bench_score.csv"), index=False)
+    print(f"✅ wrote {os.path.join(args.out, 'bench_score.json')}")
+    for msg in failed:
+        print(f"FAIL {msg}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
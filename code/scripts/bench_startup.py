@@ -0,0 +1,82 @@
+import os, sys, json, argparse, subprocess, statistics
+
+# 每个子命令的 import 预算（毫秒，-X importtime 顶层累计之和的中位数）与禁止出现的模块。
+# "runner" = 仅 import runner.py（argparse 阶段）；其余 = runner.resolve_command(<子命令>)。
+BUDGET_MS = {
+    "runner": 60,
+    "mock-server": 200,
+    "datamap": 700,
+    "calibrate": 700,
+    "align": 700,
+    "rederive": 800,
+    "demo": 800,
+    "quant-parity": 1000,
+    "score": 1000,
+    "ingest-batch": 1000,
+}
+# 任何子命令在启动阶段都不应加载的重依赖（后端在 registry 里按模型名懒加载）
+FORBIDDEN = ("openai", "torch", "transformers", "matplotlib")
+# 只有 score / ingest-batch 需要进度条
+FORBIDDEN_EXCEPT = {"tqdm": {"score", "quant-parity", "ingest-batch"}}
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def importtime(cmd: str):
+    code = "import runner" if cmd == "runner" else f"import runner; runner.resolve_command({cmd!r})"
+    p = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                       cwd=ROOT, capture_output=True, text=True)
+    if p.returncode != 0:
+        raise RuntimeError(f"{cmd}: import failed\n{p.stderr.strip().splitlines()[-1]}")
+    total_us, modules = 0, set()
+    for line in p.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        modules.add(name.strip())
+        if not name.startswith("  "):  # 顶层 import（子模块有缩进）
+            total_us += int(cum)
+    return total_us / 1000.0, modules
+
+
+def main():
+    ap = argparse.ArgumentParser(description="runner.py 子命令启动耗时基准（python -X importtime）")
+    ap.add_argument("--cmd", nargs="*", default=list(BUDGET_MS), help="要测的子命令（默认全部）")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--out", default=None, help="可选：结果 JSON 路径")
+    ap.add_argument("--allow-missing", action="store_true",
+                    help="import 失败的子命令记为 SKIP 而不是 FAIL（默认会让退出码为 1）")
+    args = ap.parse_args()
+
+    rows, failed = [], False
+    for cmd in args.cmd:
+        try:
+            runs = [importtime(cmd) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            # 子命令 import 不了也算失败；缺模块是已知情况时用 --allow-missing 跳过
+            failed |= not args.allow_missing
+            rows.append({"cmd": cmd, "import_ms": None, "budget_ms": BUDGET_MS[cmd], "modules": 0,
+                         "forbidden": [], "ok": args.allow_missing, "error": str(e)})
+            print(f"{'SKIP' if args.allow_missing else 'FAIL'} {e}")
+            continue
+        ms = statistics.median(r[0] for r in runs)
+        mods = runs[0][1]
+        bad = [m for m in FORBIDDEN if m in mods]
+        bad += [m for m, ok in FORBIDDEN_EXCEPT.items() if m in mods and cmd not in ok]
+        over = ms > BUDGET_MS[cmd]
+        failed |= over or bool(bad)
+        rows.append({"cmd": cmd, "import_ms": round(ms, 1), "budget_ms": BUDGET_MS[cmd],
+                     "modules": len(mods), "forbidden": bad, "ok": not (over or bad)})
+        print(f"{'OK ' if rows[-1]['ok'] else 'FAIL'} {cmd:<13} {ms:8.1f} ms / {BUDGET_MS[cmd]:5d} ms  "
+              f"modules={len(mods):4d}" + (f"  forbidden={bad}" if bad else ""))
+
+    if args.out:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        print(f"✅ wrote {args.out}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
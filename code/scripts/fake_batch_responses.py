@@ -0,0 +1,52 @@
+import os, json, random, argparse
+
+from src.scoring.mock_server import mock_completion
+
+# 为 runner.py score --emit-batch 生成的请求文件伪造 Batch API 输出（离线测试 ingest-batch 用）。
+# 回答由 mock_completion 按 messages 确定性生成：同一请求走 Batch 或实时调用 mock 服务器（runner.py mock-server）得到同一组 logprobs。
+
+
+def main():
+    ap = argparse.ArgumentParser(description="为 --emit-batch 请求文件生成假的 Batch API 输出 JSONL")
+    ap.add_argument("--requests", required=True, nargs="+", help="score --emit-batch 写出的请求文件")
+    ap.add_argument("--out", required=True, help="输出 responses.jsonl")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="以该比例写出失败行（error / 非 200）")
+    ap.add_argument("--nonletter-first", type=float, default=0.05, help="首 token 为非字母的概率")
+    ap.add_argument("--shuffle", action="store_true", help="打乱输出顺序（Batch API 不保证顺序）")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    lines = []
+    for path in args.requests:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                req = json.loads(line)
+                cid = req["custom_id"]
+                if rng.random() < args.error_rate:
+                    if rng.random() < 0.5:
+                        rec = {"id": f"batch_req_{cid}", "custom_id": cid, "response": None,
+                               "error": {"code": "batch_expired", "message": "This request could not be executed before the completion window expired."}}
+                    else:
+                        rec = {"id": f"batch_req_{cid}", "custom_id": cid, "error": None,
+                               "response": {"status_code": 500, "request_id": "req_x",
+                                            "body": {"error": {"type": "server_error", "message": "fake failure"}}}}
+                else:
+                    rec = {"id": f"batch_req_{cid}", "custom_id": cid, "error": None,
+                           "response": {"status_code": 200, "request_id": "req_x",
+                                        "body": mock_completion(req["body"], args.nonletter_first)}}
+                lines.append(json.dumps(rec, ensure_ascii=False))
+    if args.shuffle:
+        rng.shuffle(lines)
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(line + "\n")
+    print(f"✅ wrote {args.out} ({len(lines)} lines)")
+
+
+if __name__ == "__main__":
+    main()
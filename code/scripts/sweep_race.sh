@@ -35,6 +35,5 @@ for T in "${TEMPS[@]}"; do
     --scores "$out/scores_wdiff.csv" \
     --outdir "$out"
 
-  # Gentle cooldown to avoid bursts on the API
-  sleep 0.5
+  # no cooldown needed: rate limits are handled by the client transport (backoff / Retry-After / AIMD)
 done
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import os
+import numpy as np
+import pandas as pd
+
+from src.analysis.datamap import summarize_scores, assign_regions
+from src.analysis.calibration import ece_bin, brier, temperature_scale
+
+
+def cmd_datamap(args):
+    df = pd.read_csv(args.inp)
+    df = df.dropna(subset=["p_correct", "correct"])
+    summ = summarize_scores(df)
+    summ = assign_regions(summ, method="quantile" if args.quantile else "fixed")
+    os.makedirs(args.out, exist_ok=True)
+    summ.to_csv(os.path.join(args.out, "datamap.csv"), index=False)
+    print("Data Map saved.")
+
+
+def cmd_calibrate(args):
+    import json
+
+    df = pd.read_csv(args.inp).dropna(subset=["p_correct", "correct"])
+
+    df = df.sample(frac=1.0, random_state=42).reset_index(drop=True)
+    n = len(df)
+    df_tr = df.iloc[: int(0.8 * n)]
+    df_te = df.iloc[int(0.8 * n) :]
+
+    y_tr = df_tr["correct"].values.astype(int)
+    p_tr = df_tr["p_correct"].values
+    y_te = df_te["correct"].values.astype(int)
+    p_te = df_te["p_correct"].values
+
+    ts = temperature_scale(p_tr, y_tr)
+
+    eps = 1e-12
+    logits_te = np.log(np.clip(p_te, eps, 1 - eps)) - np.log(np.clip(1 - p_te, eps, 1 - eps))
+    p_te_cal = 1 / (1 + np.exp(-logits_te / ts.T))
+
+    metrics = {
+        "ece_before": ece_bin(y_te, p_te, 10),
+        "brier_before": brier(y_te, p_te),
+        "ece_after": ece_bin(y_te, p_te_cal, 10),
+        "brier_after": brier(y_te, p_te_cal),
+        "T": ts.T,
+        "nll_before": ts.nll_before,
+        "nll_after": ts.nll_after,
+        "n_test": int(len(y_te)),
+    }
+
+    os.makedirs(args.out, exist_ok=True)
+    with open(os.path.join(args.out, "calibration.json"), "w", encoding="utf-8") as f:
+        json.dump(metrics, f, ensure_ascii=False, indent=2)
+    print("Calibration saved.")
+
+
+def cmd_align(args):
+    import os
+    import pandas as pd
+    from src.analysis.alignment import rank_corr
+
+    scores = pd.read_csv(args.scores)
+    if not {"question_id", "p_correct", "correct"}.issubset(scores.columns):
+        raise RuntimeError("scores.csv must have columns: question_id, p_correct, correct")
+
+    agg = (
+        scores.groupby("question_id", as_index=False)
+        .agg(mean_p=("p_correct", "mean"), acc=("correct", "mean"))
+    )
+
+    human = pd.read_csv(args.human)
+
+    candidates = ["diff_conf", "wrong_conf", "diff_conf_old", "error_rate"]
+    chosen = None
+    for c in candidates:
+        if c in human.columns and human[c].notna().sum() > 0:
+            chosen = c
+            break
+
+    if chosen is None:
+        raise RuntimeError(
+            f"No usable human difficulty column found in {args.human}. "
+            f"Expected one of {candidates} with at least one non-NaN value."
+        )
+
+    human_sel = human[["question_id", chosen]].rename(columns={chosen: "human_difficulty"})
+    merged = agg.merge(human_sel, on="question_id", how="inner")
+    merged = merged.dropna(subset=["human_difficulty", "mean_p"])
+
+    if merged.empty:
+        raise RuntimeError("After merge there are no rows with both human_difficulty and mean_p.")
+
+    os.makedirs(args.out, exist_ok=True)
+    merged.to_csv(os.path.join(args.out, "human_machine_merge.csv"), index=False)
+
+    corr = rank_corr(merged["human_difficulty"], 1.0 - merged["mean_p"])
+
+    with open(os.path.join(args.out, "correlation.txt"), "w") as f:
+        f.write(f"n_rows: {len(merged)}\n")
+        for k, v in corr.items():
+            f.write(f"{k}: {v:.6f}\n")
+
+    print("Wrote ->", os.path.join(args.out, "human_machine_merge.csv"))
+    print("Wrote ->", os.path.join(args.out, "correlation.txt"))
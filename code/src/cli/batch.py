@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import os
+import json
+import time
+import hashlib
+from collections import Counter
+
+from tqdm import tqdm
+
+from src.utils.io import read_jsonl, JsonlAppender
+from src.scoring.schema import PreparedItems, prepare_items
+from src.scoring.metrics import call_meta
+from src.cli.score import (
+    STREAM_NAME, LOGPROB_STREAM_NAME, DEAD_LETTER_NAME,
+    _load_questions, _perm_table, _item_ctx, _stream_records, _completed_keys,
+    _write_scores, _materialize_logprobs,
+)
+
+BATCH_URL = "/v1/chat/completions"
+MANIFEST_NAME = "batch_manifest.json"
+
+
+def _qid_digest(items: PreparedItems) -> str:
+    return hashlib.sha256("\n".join(str(q) for q in items.qids).encode("utf-8")).hexdigest()
+
+
+def _custom_id(model_idx: int, item: int, run_ids) -> str:
+    """`<model index>:<item index>:<run>.<run>...` — short enough for the Batch API's custom_id limit."""
+    return f"{model_idx}:{item}:" + ".".join(str(r) for r in run_ids)
+
+
+def _parse_custom_id(cid: str):
+    m, i, runs = str(cid).split(":")
+    return int(m), int(i), [int(r) for r in runs.split(".")]
+
+
+class _RequestWriter:
+    """
+    Batch input JSONL split into parts of at most `max_requests` lines / `max_mb`
+    megabytes (the Batch API's per-file limits); part k > 0 is `<stem>.<k><ext>`.
+    """
+
+    def __init__(self, path: str, max_requests: int, max_mb: float) -> None:
+        self.path = path
+        self.max_requests = max(1, int(max_requests))
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.paths: list = []
+        self._f = None
+        self._n = self._bytes = 0
+
+    def _open_next(self) -> None:
+        if self._f is not None:
+            self._f.close()
+        stem, ext = os.path.splitext(self.path)
+        path = self.path if not self.paths else f"{stem}.{len(self.paths)}{ext}"
+        os.makedirs(os.path.dirname(os.path.abspath(path)) or ".", exist_ok=True)
+        self._f = open(path, "w", encoding="utf-8")
+        self.paths.append(path)
+        self._n = self._bytes = 0
+
+    def write(self, record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        size = len(line.encode("utf-8"))
+        if self._f is None or self._n >= self.max_requests or (self._n and self._bytes + size > self.max_bytes):
+            self._open_next()
+        self._f.write(line)
+        self._n += 1
+        self._bytes += size
+
+    def close(self) -> None:
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+
+def emit_batch(args, items: PreparedItems, perms, perm_mode: str, clients: dict, models: list, jobs, done_by: dict) -> None:
+    """
+    `runner.py score --emit-batch PATH`: write one Batch API request line per
+    pending (model, question, round) — or per (model, question) with
+    --samples-per-call — whose body is exactly what the client would send, plus
+    <out>/batch_manifest.json, which `ingest-batch` needs to map results back.
+    With --resume, rows already in the score stream are not emitted again.
+    """
+    for m in models:
+        if not hasattr(clients[m], "batch_request"):
+            raise ValueError(f"--emit-batch needs a client that builds API request bodies (openai:*), got {m!r}")
+
+    writer = _RequestWriter(args.emit_batch, args.batch_max_requests, args.batch_max_mb)
+    top_k = {}
+    n_req, n_rows = Counter(), Counter()
+    try:
+        for job in tqdm(jobs, desc="emit-batch"):
+            key = str(job.ctx["question_id"])
+            for k, m in enumerate(models):
+                runs = [r for r in job.ctx.get("run_ids", [job.ctx["run_id"]]) if (key, r) not in done_by[m]]
+                if not runs:
+                    continue
+                body = clients[m].batch_request(job.prompt, job.image_path, n=len(runs))
+                top_k[m] = body.get("top_logprobs")
+                writer.write({"custom_id": _custom_id(k, job.ctx["item"], runs),
+                              "method": "POST", "url": BATCH_URL, "body": body})
+                n_req[m] += 1
+                n_rows[m] += len(runs)
+    finally:
+        writer.close()
+
+    manifest = {
+        "dataset": args.dataset, "split": args.split, "rounds": args.rounds, "permute": perm_mode,
+        "models": models, "n_items": len(items), "qid_sha256": _qid_digest(items),
+        "top_logprobs": top_k, "files": writer.paths,
+        "requests": dict(n_req), "rows": dict(n_rows),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    path = os.path.join(args.out, MANIFEST_NAME)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    for m in models:
+        print(f"[emit-batch] {m}: requests={n_req[m]} rows={n_rows[m]}")
+    print(f"Wrote -> {', '.join(writer.paths) or '(no pending requests)'}")
+    print(f"Wrote -> {path}")
+
+
+def _batch_error(rec: dict) -> str:
+    err = rec.get("error")
+    resp = rec.get("response") or {}
+    if not err:
+        err = (resp.get("body") or {}).get("error") or f"status_code={resp.get('status_code')}"
+    if isinstance(err, dict):
+        return f"{err.get('code') or err.get('type') or 'error'}: {err.get('message', '')}".strip()
+    return str(err)
+
+
+def cmd_ingest_batch(args):
+    """
+    `runner.py ingest-batch responses.jsonl... --out DIR`: parse Batch API output
+    into the same scores.stream.jsonl / scores.csv / logprobs.npz that
+    `runner.py score` writes to DIR (the --out of the emitting run).
+
+    Response files are streamed one line at a time, so their size does not
+    matter; memory grows only with the number of score rows. Lines may come in
+    any order and across several files; rows already in the stream are skipped,
+    so re-ingesting a file is harmless. Failed requests go to dead_letter.jsonl
+    and are re-emitted by `score --emit-batch --resume`.
+    """
+    # the openai SDK types are only needed here, not to start the CLI
+    from openai.types.chat import ChatCompletion
+    from pydantic import ValidationError
+    from src.scoring.openai_client_stub import parse_choices
+
+    with open(os.path.join(args.out, MANIFEST_NAME), encoding="utf-8") as f:
+        manifest = json.load(f)
+    items = prepare_items(_load_questions(manifest["dataset"], manifest["split"]), manifest["rounds"])
+    if len(items) != manifest["n_items"] or _qid_digest(items) != manifest["qid_sha256"]:
+        raise ValueError(f"{manifest['dataset']}/{manifest['split']} no longer matches the questions "
+                         f"the batch was emitted for ({MANIFEST_NAME})")
+    perms = _perm_table(items, manifest["rounds"], manifest["permute"])
+    models = manifest["models"]
+    multi = len(models) > 1
+
+    def tag(model, rec):
+        return {"model": model, **rec} if multi else rec
+
+    stream_path = os.path.join(args.out, STREAM_NAME)
+    lp_stream_path = os.path.join(args.out, LOGPROB_STREAM_NAME)
+    done = _completed_keys(stream_path)
+    done_by = {m: done.get(m if multi else None, set()) for m in models}
+
+    rows = JsonlAppender(stream_path, resume=True, fsync_every=args.fsync_every)
+    lp_rows = JsonlAppender(lp_stream_path, resume=True, fsync_every=args.fsync_every)
+    dead_path = os.path.join(args.out, DEAD_LETTER_NAME)
+    dead = JsonlAppender(dead_path, fsync_every=1)
+    n = Counter()
+
+    def fail(model, i, runs, cid, error):
+        dead.write(tag(model, {"question_id": items.qids[i], "run_ids": runs, "custom_id": cid, "error": error}))
+        n["failed"] += len(runs)
+
+    try:
+        for src in args.responses:
+            for rec in tqdm(read_jsonl(src), desc=os.path.basename(src), unit="req"):
+                cid = rec["custom_id"]
+                m, i, runs = _parse_custom_id(cid)
+                model, key = models[m], str(items.qids[i])
+                todo = [r for r in runs if (key, r) not in done_by[model]]
+                n["requests"] += 1
+                if not todo:
+                    n["duplicate"] += len(runs)
+                    continue
+                resp = rec.get("response") or {}
+                if rec.get("error") or resp.get("status_code") != 200 or not resp.get("body"):
+                    fail(model, i, todo, cid, _batch_error(rec))
+                    continue
+                try:
+                    completion = ChatCompletion.model_validate(resp["body"])
+                except ValidationError as exc:
+                    # a malformed / truncated body fails this request only, like a non-200 response
+                    first = exc.errors()[0]
+                    fail(model, i, todo, cid, f"invalid response body ({exc.error_count()} errors): "
+                                              f"{first['loc']} {first['msg']}")
+                    continue
+                if len(completion.choices) != len(runs):
+                    fail(model, i, todo, cid, f"requested n={len(runs)} choices, got {len(completion.choices)}")
+                    continue
+                # batch requests have no per-call latency; tokens come from the response usage
+                cm = {**call_meta(completion, 0.0, cache_hit=False), "latency_s": None, "queue_wait_s": None}
+                results = parse_choices(completion, cm, args.conf_mode, args.norm_scope,
+                                        manifest["top_logprobs"].get(model) or 20)
+                for r, sr in zip(runs, results):
+                    if (key, r) in done_by[model]:
+                        continue
+                    lp, row = _stream_records(_item_ctx(items, perms, i, r), sr)
+                    if lp is not None:
+                        lp_rows.write(tag(model, lp))
+                    rows.write(tag(model, row))
+                    done_by[model].add((key, r))
+                    n["rows"] += 1
+    finally:
+        rows.close()
+        lp_rows.close()
+        dead.close()
+
+    path = os.path.join(args.out, "scores.csv")
+    n_total = _write_scores(stream_path, path, items, models)
+    print(f"[ingest] requests={n['requests']} rows={n['rows']} failed={n['failed']} duplicate={n['duplicate']}")
+    print(f"Wrote -> {path} ({n_total} rows)")
+    lp_path = os.path.join(args.out, "logprobs.npz")
+    if _materialize_logprobs(lp_stream_path, lp_path, items, models):
+        print(f"Wrote -> {lp_path}")
+    expected = manifest["rounds"] * len(items) * len(models)
+    if n["failed"]:
+        print(f"[dead-letter] {n['failed']} rows failed -> {dead_path}; "
+              f"re-emit them with `score --emit-batch ... --resume`")
+    if n_total < expected:
+        print(f"[ingest] {expected - n_total} of {expected} rows still missing")
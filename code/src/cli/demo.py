@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import os
+import numpy as np
+import pandas as pd
+
+from src.scoring.dummy_client import DummyClient
+from src.scoring.prompts import build_prompt
+from src.analysis.datamap import summarize_scores
+
+LETTER_SET = ("A", "B", "C", "D")
+LETTER_IDX = {L: i for i, L in enumerate(LETTER_SET)}
+
+
+def cmd_demo(args):
+    os.makedirs("outputs/demo", exist_ok=True)
+    import json
+
+    qpath = "sample_data/race_demo.jsonl"
+    with open(qpath, encoding="utf-8") as f:
+        qs = [json.loads(l) for l in f]
+
+    client = DummyClient(seed=42)
+    prompts = [build_prompt(ex.get("passage", ""), ex["question"], ex["options"]) for ex in qs]
+    options = [ex["options"] for ex in qs]
+    answers = np.array([ex["answer"] for ex in qs], dtype=object)
+    gold = np.array([LETTER_IDX.get(a, -1) for a in answers])
+    qids = np.array([ex["id"] for ex in qs], dtype=object)
+    diff = np.array([ex.get("difficulty") for ex in qs], dtype=object)
+
+    # rounds are scored in batches of whole rounds (round-major, like the per-item loop)
+    n = len(qs)
+    per_batch = max(1, args.batch_size // max(1, n))
+    path = "outputs/demo/scores.csv"
+    frames = []
+    for r0 in range(0, args.rounds, per_batch):
+        k = min(per_batch, args.rounds - r0)
+        br = client.score_mcq_batch(prompts * k, options * k)
+        g = np.tile(gold, k)
+        rows = np.arange(n * k)
+        frames.append(pd.DataFrame({
+            "question_id": np.tile(qids, k),
+            "run_id": np.repeat(np.arange(r0, r0 + k), n),
+            "difficulty": np.tile(diff, k),
+            "chosen": np.array(LETTER_SET, dtype=object)[br.chosen],
+            "p_correct": np.where(g >= 0, br.probs[rows, np.clip(g, 0, 3)], 0.0),
+            "correct": (br.chosen == g).astype(int),
+            "correct_letter": np.tile(answers, k),
+        }))
+    df = pd.concat(frames, ignore_index=True)
+    df.to_csv(path, index=False)
+
+    summ = summarize_scores(df)
+    summ.to_csv("outputs/demo/datamap.csv", index=False)
+    print("Demo complete. See outputs/demo/")
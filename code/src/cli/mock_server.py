@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from src.scoring.mock_server import MockConfig, MockServer
+
+
+def cmd_mock_server(args):
+    cfg = MockConfig(
+        latency=args.latency, tail_prob=args.tail_prob, tail_ms=args.tail_ms,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, retry_after_ms=args.retry_after_ms,
+        capacity=args.capacity, nonletter_first=args.nonletter_first, seed=args.seed,
+    )
+    server = MockServer(cfg, args.host, args.port)
+    print(f"[mock] serving chat completions on {server.url} (stats: {server.url}/stats)")
+    print(f"[mock] OPENAI_BASE_URL={server.url} OPENAI_API_KEY=mock python runner.py score --model openai:gpt-4o-mini ...")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stats = server.stats()
+        stats.pop("config")
+        print(f"[mock] {stats}")
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import os
+import json
+import time
+import numpy as np
+
+from src.cli.score import _load_questions, _perm_table, _prepare_item
+from src.scoring.schema import prepare_items
+
+
+def cmd_quant_parity(args):
+    """Score a held-out slice with fp32 and int8 HF models and report probability drift."""
+    from src.scoring.hf_client import HFMultipleChoiceClient, parity_report
+
+    if not args.model.startswith("hf:"):
+        raise ValueError("quant-parity needs an hf:<model> scorer")
+    items = prepare_items(_load_questions(args.dataset, args.split), rounds=1)
+    rng = np.random.default_rng(args.seed)
+    pick = np.sort(rng.choice(len(items), size=min(args.n, len(items)), replace=False))
+    perms = _perm_table(items, 1, mode="0")
+    jobs = [_prepare_item(items, perms, int(i), 0) for i in pick]
+    prompts, options = [j.prompt for j in jobs], [j.options for j in jobs]
+
+    report = {"model": args.model, "dataset": args.dataset, "split": args.split, "seed": args.seed}
+    results = {}
+    for quant in ("none", "int8"):
+        client = HFMultipleChoiceClient(args.model.split(":", 1)[1], device="cpu", quantize=quant)
+        client.score_mcq_batch(prompts[:1], options[:1])  # warm-up
+        t0 = time.perf_counter()
+        results[quant] = client.score_mcq_batch(prompts, options)
+        dt = time.perf_counter() - t0
+        report[f"items_per_sec_{'fp32' if quant == 'none' else quant}"] = len(jobs) / dt if dt > 0 else float("inf")
+        del client
+    report.update(parity_report(results["none"], results["int8"]))
+    report["speedup"] = report["items_per_sec_int8"] / report["items_per_sec_fp32"]
+
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, "quant_parity.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(json.dumps(report, indent=2))
+    print(f"Wrote -> {path}")
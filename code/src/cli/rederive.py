@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import os
+
+from src.scoring.logprob_store import read_logprob_sidecar, derive_letter_probs
+from src.scoring.score_frame import scores_frame
+
+
+def cmd_rederive(args):
+    """Recompute scores.csv from a stored logprobs.npz for another CONF_MODE / NORM_SCOPE / TOP_LOGK."""
+    src = args.inp
+    if os.path.isdir(src):
+        src = os.path.join(src, "logprobs.npz")
+    z = read_logprob_sidecar(src)
+
+    stored_k = int(z["top_k"])
+    if args.top_logk is not None and args.top_logk > stored_k:
+        raise ValueError(f"TOP_LOGK={args.top_logk} exceeds the stored K={stored_k} in {src}")
+
+    probs_perm, chosen_perm = derive_letter_probs(
+        z["codes"], z["probs"], z["n_tokens"], z["text_letter"],
+        mode=args.conf_mode, scope=args.norm_scope, top_k=args.top_logk,
+    )
+    df = scores_frame(z["question_id"], z["run_id"], z["gold"], z["o2p"], probs_perm, chosen_perm)
+    if "model" in z:
+        df.insert(0, "model", z["model"])
+
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, "scores.csv")
+    df.to_csv(path, index=False)
+    print(f"Wrote -> {path} (CONF_MODE={args.conf_mode} NORM_SCOPE={args.norm_scope} "
+          f"TOP_LOGK={args.top_logk or stored_k}, rows={len(df)})")
@@ -0,0 +1,523 @@
+from __future__ import annotations
+
+import os
+import json
+import time
+import numpy as np
+import pandas as pd
+from tqdm import tqdm
+
+from src.utils.io import read_jsonl, JsonlAppender
+from src.scoring.prompts import build_prompt
+from src.scoring.registry import make_client
+from src.scoring.schema import PreparedItems, prepare_items
+from src.scoring.permute import (
+    permutation_table, identity_table, permuted_options, inverse_permutation, unpermute_probs,
+)
+from src.scoring.schema import norm_letter as _norm_letter
+from src.scoring.async_engine import ScoreJob, score_jobs, score_job_batches, fan_out, fan_out_batches
+from src.scoring.cache import ResponseCache
+from src.scoring.adaptive import SequentialStopper
+from src.scoring.priority import load_priority_sources, item_priority, priority_order
+from src.scoring.metrics import META_COLUMNS, meta_columns, run_summary
+from src.scoring.transport import transport_stats
+from src.scoring.image_cache import default_image_cache
+from src.scoring.logprob_store import write_logprob_sidecar
+from src.scoring.score_frame import ctx_arrays, scores_frame
+
+LETTER_SET = ("A", "B", "C", "D")
+LETTER_IDX = {L: i for i, L in enumerate(LETTER_SET)}
+
+
+def _load_questions(dataset: str, split: str):
+    if dataset == "race":
+        path = f"data/race/processed/race_{split}.jsonl"
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"Missing {path}. Please run: python -m src.data.prepare_race --split {split}"
+            )
+        return list(read_jsonl(path))
+    elif dataset == "eedi":
+        path = "data/eedi/processed/task34_for_llm.jsonl"
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                "Missing data/eedi/processed/task34_for_llm.jsonl. "
+                "Please run: python -m src.data.prepare_eedi "
+                "--in data/eedi/raw/interactions_task34.csv --out data/eedi/processed"
+            )
+        return list(read_jsonl(path))
+    else:
+        raise ValueError("dataset must be one of: race | eedi")
+
+
+def _make_cache(args):
+    """Open the response cache requested on the CLI (None when caching is off)."""
+    path = getattr(args, "cache", None)
+    if not path or args.cache_mode == "off":
+        return None
+    max_bytes = int(args.cache_max_mb * 1024 * 1024) if args.cache_max_mb else None
+    return ResponseCache(path, mode=args.cache_mode, max_bytes=max_bytes)
+
+
+def _item_ctx(items: PreparedItems, perms: np.ndarray, i: int, r: int) -> dict:
+    """What is needed to map a result for question `i` in round `r` back to the ORIGINAL letter space."""
+    perm = perms[i, r]
+    o2p = {LETTER_SET[k]: LETTER_SET[p] for k, p in enumerate(perm.tolist()) if p >= 0}
+    return {"question_id": items.qids[i], "run_id": r, "gold": items.gold_letter(i), "o2p": o2p, "perm": perm, "item": i}
+
+
+def _prepare_item(items: PreparedItems, perms: np.ndarray, i: int, r: int) -> ScoreJob:
+    """
+    Build the displayed (permuted) prompt for question `i` in round `r`.
+    All per-question fields and the (n_items, rounds, 4) permutation table were
+    computed up front; the job's ctx carries what is needed to map the result
+    back to the ORIGINAL letter space.
+    """
+    options_perm = permuted_options(items.options[i], perms[i, r])
+    prompt = build_prompt(items.passages[i], items.questions[i], options_perm)
+    return ScoreJob(prompt=prompt, options=options_perm, image_path=items.image_paths[i],
+                    ctx=_item_ctx(items, perms, i, r))
+
+
+def _as_float(v) -> float:
+    try:
+        return float(v)
+    except Exception:
+        return np.nan
+
+
+def _fmt(v, spec: str) -> str:
+    return "n/a" if v is None else format(v, spec)
+
+
+def _make_record(ctx: dict, sr) -> dict:
+    """Map a ScoreResult from permuted space back to ORIGINAL letters and build one output row."""
+    gold = ctx["gold"]
+    perm = ctx["perm"][None, :]
+
+    # probs in perm space -> original space (one gather through the permutation row)
+    raw_probs = sr.probs or {}
+    row = np.array([[_as_float(raw_probs[L]) if L in raw_probs else np.nan for L in LETTER_SET]])
+    probs_orig = unpermute_probs(row, perm)[0]
+
+    # chosen in perm space -> original space
+    choice_perm = _norm_letter(sr.chosen)
+    choice_orig = LETTER_SET[inverse_permutation(perm)[0, LETTER_IDX[choice_perm]]] if choice_perm else None
+
+    p_correct = (probs_orig[LETTER_IDX[gold]] if gold else np.nan)
+    p_chosen = (probs_orig[LETTER_IDX[choice_orig]] if choice_orig else np.nan)
+
+    return {
+        "question_id": ctx["question_id"],
+        "run_id": ctx["run_id"],
+        # gold / predicted in ORIGINAL letter space
+        "correct_letter": gold,
+        "chosen": choice_orig,
+        # probabilities in ORIGINAL space
+        "p_correct": float(p_correct),
+        "p_chosen": float(p_chosen),
+        "correct": (int(choice_orig == gold) if (gold and choice_orig) else np.nan),
+        "p_A": float(probs_orig[0]),
+        "p_B": float(probs_orig[1]),
+        "p_C": float(probs_orig[2]),
+        "p_D": float(probs_orig[3]),
+    }
+
+
+def _stream_records(ctx: dict, sr):
+    """
+    (logprob payload record or None, score row) of one result. The caller writes
+    the payload first, so a row that made it into the score stream always has it.
+    """
+    payload = (sr.meta or {}).get("logprobs")
+    lp = None
+    if payload is not None:
+        lp = {"question_id": ctx["question_id"], "run_id": ctx["run_id"],
+              "gold": ctx["gold"], "o2p": ctx["o2p"], "payload": payload}
+    return lp, {**_make_record(ctx, sr), **meta_columns(sr.meta)}
+
+
+STREAM_NAME = "scores.stream.jsonl"
+LOGPROB_STREAM_NAME = "logprobs.stream.jsonl"
+DEAD_LETTER_NAME = "dead_letter.jsonl"
+SCORE_COLUMNS = [
+    "question_id", "run_id", "correct_letter", "chosen", "p_correct", "p_chosen", "correct",
+    "p_A", "p_B", "p_C", "p_D", *META_COLUMNS,
+]
+
+
+def _completed_keys(path: str) -> dict:
+    """
+    (question_id, run_id) keys already present in a score stream, grouped by the
+    row's `model` (None for single-model runs).
+    """
+    done: dict = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn tail from an interrupted write
+                done.setdefault(rec.get("model"), set()).add((str(rec["question_id"]), int(rec["run_id"])))
+    return done
+
+
+def _perm_table(items: PreparedItems, rounds: int, mode: str) -> np.ndarray:
+    """
+    (n_items, rounds, 4) original -> displayed letter indices.
+    PERMUTE=1 reshuffles every round, PERMUTE=fixed reuses the round-0 shuffle
+    in every round, PERMUTE=0 keeps the original A-D order.
+    """
+    if mode == "0":
+        return identity_table(items.options, rounds)
+    if mode == "fixed":
+        return np.repeat(permutation_table(items.options, items.seeds[:, :1]), rounds, axis=1)
+    return permutation_table(items.options, items.seeds[:, :rounds])
+
+
+def _iter_jobs(items: PreparedItems, perms: np.ndarray, skip: set, order=None):
+    """
+    Lazily prepare jobs in (round, question) order, skipping completed keys.
+    `order` restricts / reorders the questions (item indices), e.g. one priority chunk.
+    """
+    keys = [str(q) for q in items.qids]
+    order = range(len(keys)) if order is None else [int(i) for i in order]
+    for r in range(perms.shape[1]):
+        for i in order:
+            if (keys[i], r) not in skip:
+                yield _prepare_item(items, perms, i, r)
+
+
+def _iter_sample_jobs(items: PreparedItems, perms: np.ndarray, skip: set, order=None):
+    """
+    One multi-sample job per question covering all of its remaining rounds.
+    Only valid when every round shows the same prompt (PERMUTE=0 or fixed).
+    """
+    order = range(len(items)) if order is None else [int(i) for i in order]
+    for i in order:
+        key = str(items.qids[i])
+        run_ids = [r for r in range(perms.shape[1]) if (key, r) not in skip]
+        if run_ids:
+            job = _prepare_item(items, perms, i, run_ids[0])
+            job.n = len(run_ids)
+            job.ctx["run_ids"] = run_ids
+            yield job
+
+
+def _stream_order(df: pd.DataFrame, items: PreparedItems, models=None) -> pd.DataFrame:
+    """
+    Restore the deterministic (round, question) order of a completion-ordered stream;
+    multi-model streams are grouped by model first, in CLI order.
+    """
+    key = df["question_id"].astype(str).map(items.position())
+    if models and "model" in df.columns:
+        df = df.assign(_m=df["model"].map({m: i for i, m in enumerate(models)}), _pos=key)
+        return df.sort_values(["_m", "run_id", "_pos"], kind="stable").drop(columns=["_m", "_pos"])
+    return df.assign(_pos=key).sort_values(["run_id", "_pos"], kind="stable").drop(columns="_pos")
+
+
+def _write_scores(stream_path: str, path: str, items: PreparedItems, models=None) -> int:
+    """Materialize the row stream as scores.csv (atomic replace, so readers never see a partial file)."""
+    df = pd.DataFrame(list(read_jsonl(stream_path)))
+    # every call may have been dead-lettered; still leave a readable (header-only) file
+    df = _stream_order(df, items, models) if len(df) else pd.DataFrame(columns=SCORE_COLUMNS)
+    tmp = path + ".tmp"
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+    return len(df)
+
+
+def _materialize_logprobs(stream_path: str, out_path: str, items: PreparedItems, models=None) -> int:
+    if not os.path.exists(stream_path):
+        return 0
+    recs = pd.DataFrame(list(read_jsonl(stream_path)))
+    if recs.empty:
+        return 0
+    # a crash between the two appends can leave a payload whose row was re-scored on resume
+    keys = (["model"] if "model" in recs.columns else []) + ["_k", "run_id"]
+    recs = recs.assign(_k=recs["question_id"].astype(str)).drop_duplicates(keys, keep="last")
+    recs = _stream_order(recs.drop(columns="_k"), items, models)
+    cols = (["model"] if "model" in recs.columns else []) + ["question_id", "run_id", "gold", "o2p"]
+    ctxs = recs[cols].to_dict("records")
+    return write_logprob_sidecar(out_path, ctxs, recs["payload"].tolist())
+
+
+def _split_arg(value, models, cast):
+    """Per-model CLI value: one entry for all models or a comma list aligned with --model."""
+    parts = [cast(v) for v in str(value).split(",")]
+    if len(parts) == 1:
+        return {m: parts[0] for m in models}
+    if len(parts) != len(models):
+        raise ValueError(f"expected 1 or {len(models)} comma-separated values, got {value!r}")
+    return dict(zip(models, parts))
+
+
+def _batch_size(args, clients: dict) -> int:
+    """
+    Jobs per `score_mcq_batch` call; 0 = per-item calls.
+
+    An explicit --batch-size wins. Left on auto, the clients' `preferred_batch_size`
+    is used (the smallest one when several models share the batched fan-out), so
+    local encoders batch by default and API clients keep the async engine. Modes
+    that need per-item calls (--samples-per-call, --emit-batch) stay per-item.
+    """
+    if args.batch_size is not None:
+        return int(args.batch_size)
+    if args.samples_per_call or args.emit_batch:
+        return 0
+    prefs = [int(getattr(c, "preferred_batch_size", 0) or 0) for c in clients.values()]
+    return min(prefs) if all(p > 0 for p in prefs) else 0
+
+
+def cmd_score(args):
+    os.makedirs(args.out, exist_ok=True)
+    models = [m.strip() for m in args.model.split(",") if m.strip()]
+    if len(set(models)) != len(models):
+        raise ValueError(f"duplicate model in --model {args.model!r}")
+    multi = len(models) > 1
+
+    # resolve every per-question field (and the round seeds) once, outside the scoring loop
+    items = prepare_items(_load_questions(args.dataset, args.split), args.rounds)
+    if items.n_fallback:
+        print(f"[schema] {items.n_fallback} records use gold fields outside the probed schema")
+    cache = _make_cache(args)
+    clients = {m: make_client(m, cache=cache) for m in models}
+    batch_size = _batch_size(args, clients)
+    if batch_size > 0 and args.batch_size is None:
+        print(f"[batch] scoring {batch_size} jobs per score_mcq_batch call (--batch-size 0 for per-item calls)")
+
+    stream_path = os.path.join(args.out, STREAM_NAME)
+    lp_stream_path = os.path.join(args.out, LOGPROB_STREAM_NAME)
+    done = _completed_keys(stream_path) if args.resume else {}
+    # multi-model rows carry a `model` column; single-model rows keep the original schema
+    done_by = {m: done.get(m if multi else None, set()) for m in models}
+    n_done = sum(len(v) for v in done_by.values())
+    if n_done:
+        print(f"[resume] {n_done} (question_id, run_id) rows already in {stream_path}")
+
+    perm_mode = os.getenv("PERMUTE", "1").strip().lower()
+    perms = _perm_table(items, args.rounds, perm_mode)
+    # each permuted prompt is built once and shared by every model that still needs it;
+    # done_all = (question_id, run_id) keys every model already has, the only ones skipped up front
+    done_all = set.intersection(*done_by.values())
+    if args.samples_per_call:
+        if batch_size > 0:
+            raise ValueError("--samples-per-call requests n choices per API call; it cannot be combined with --batch-size")
+        if not (perms == perms[:, :1]).all():
+            raise ValueError("--samples-per-call needs identical prompts across rounds: set PERMUTE=0 or PERMUTE=fixed")
+    make_jobs = _iter_sample_jobs if args.samples_per_call else _iter_jobs
+    jobs = make_jobs(items, perms, done_all)
+    total = max(0, args.rounds * len(items) * len(models) - n_done)
+
+    if args.emit_batch:
+        if args.adaptive or args.priority or batch_size > 0:
+            raise ValueError("--emit-batch writes every pending (question, round) request up front; "
+                             "it cannot be combined with --adaptive, --priority or --batch-size")
+        from src.cli.batch import emit_batch
+        emit_batch(args, items, perms, perm_mode, clients, models, jobs, done_by)
+        if cache is not None:
+            cache.close()
+        return
+
+    chunks = None
+    if args.priority:
+        if args.adaptive:
+            raise ValueError("--priority and --adaptive are separate schedulers; pick one")
+        # most-in-doubt items first, in chunks whose results are materialized as soon as they finish
+        evidence, labels = load_priority_sources(args.priority, tau=args.priority_tau)
+        pri = item_priority(items.qids, evidence, labels)
+        order = priority_order(pri)
+        pd.DataFrame({
+            "question_id": [items.qids[i] for i in order], "priority": pri[order], "rank": np.arange(len(order)),
+        }).to_csv(os.path.join(args.out, "priority.csv"), index=False)
+        step = max(1, int(args.chunk_items))
+        chunks = [order[k:k + step] for k in range(0, len(order), step)]
+
+    stopper = None
+    if args.adaptive:
+        if multi or args.samples_per_call:
+            raise ValueError("--adaptive schedules one model, one call per (question, round)")
+        stopper = SequentialStopper(len(items), args.rounds, min_rounds=args.min_rounds,
+                                    rule=args.stop_rule, ci_width=args.ci_width, audit_frac=args.audit_frac)
+        if n_done:
+            # replay the stream so the schedule continues where it stopped
+            pos = items.position()
+            for rec in read_jsonl(stream_path):
+                stopper.update(pos[str(rec["question_id"])], int(rec["run_id"]), rec.get("p_correct"))
+
+    def skip(model, job):
+        key = str(job.ctx["question_id"])
+        return all((key, r) in done_by[model] for r in job.ctx.get("run_ids", [job.ctx["run_id"]]))
+
+    def tag(model, rec):
+        return {"model": model, **rec} if multi else rec
+
+    # per-call instrumentation of this session, for run_summary.json
+    session = {m: [] for m in models}
+
+    # rows are appended as they complete; scores.csv is materialized at the end
+    rows = JsonlAppender(stream_path, resume=args.resume, fsync_every=args.fsync_every)
+    lp_rows = JsonlAppender(lp_stream_path, resume=args.resume, fsync_every=args.fsync_every)
+    # calls that failed for good are parked here instead of aborting the run; they are not in
+    # the score stream, so `--resume` replays them (the file lists this session's failures only)
+    dead_path = os.path.join(args.out, DEAD_LETTER_NAME)
+    dead = JsonlAppender(dead_path, fsync_every=1)
+    n_dead = {m: 0 for m in models}
+
+    def on_batch(model, chunk, br):
+        ctxs = [job.ctx for job in chunk]
+        gold, o2p = ctx_arrays(ctxs)
+        df = scores_frame(
+            [c["question_id"] for c in ctxs], [c["run_id"] for c in ctxs],
+            gold, o2p, br.probs, br.chosen,
+        )
+        if multi:
+            df.insert(0, "model", model)
+        metas = br.meta or [None] * len(chunk)
+        calls = [meta_columns(m) for m in metas]
+        session[model].extend(calls)
+        df = pd.concat([df, pd.DataFrame(calls, columns=list(META_COLUMNS))], axis=1)
+        lp_rows.write_many(
+            tag(model, {"question_id": c["question_id"], "run_id": c["run_id"],
+                        "gold": c["gold"], "o2p": c["o2p"], "payload": m["logprobs"]})
+            for c, m in zip(ctxs, metas) if m and m.get("logprobs") is not None
+        )
+        rows.write_frame(df)
+        if stopper is not None:
+            for c, p in zip(ctxs, df["p_correct"].tolist()):
+                stopper.update(c["item"], c["run_id"], p)
+        bar.update(len(chunk))
+
+    def on_done(model, job, sr):
+        if job.n > 1:
+            # one multi-sample call -> one row per run_id, same schema as per-round calls
+            key = str(job.ctx["question_id"])
+            for r, one in zip(job.ctx["run_ids"], sr):
+                if (key, r) not in done_by[model]:
+                    write_row(model, {**job.ctx, "run_id": r}, one)
+        else:
+            write_row(model, job.ctx, sr)
+
+    def write_row(model, ctx, sr):
+        lp, rec = _stream_records(ctx, sr)
+        if lp is not None:
+            lp_rows.write(tag(model, lp))
+        session[model].append({k: rec[k] for k in META_COLUMNS})
+        rows.write(tag(model, rec))
+        if stopper is not None:
+            stopper.update(ctx["item"], ctx["run_id"], rec["p_correct"])
+        bar.update(1)
+
+    def on_error(model, job, exc):
+        run_ids = job.ctx.get("run_ids", [job.ctx["run_id"]])
+        dead.write(tag(model, {"question_id": job.ctx["question_id"], "run_ids": run_ids,
+                               "attempts": exc.attempts, "error": str(exc)}))
+        n_dead[model] += len(run_ids)
+        bar.update(len(run_ids))
+
+    def dispatch(jobs):
+        if multi and batch_size > 0:
+            fan_out_batches(clients, jobs, batch_size, on_batch, skip=skip)
+        elif multi:
+            fan_out(clients, jobs, concurrency=_split_arg(args.concurrency, models, int),
+                    rate=_split_arg(args.rps, models, float), on_done=on_done, skip=skip, on_error=on_error)
+        elif batch_size > 0:
+            score_job_batches(clients[models[0]], jobs, batch_size,
+                              lambda chunk, br: on_batch(models[0], chunk, br))
+        else:
+            score_jobs(clients[models[0]], jobs,
+                       concurrency=_split_arg(args.concurrency, models, int)[models[0]],
+                       rate=_split_arg(args.rps, models, float)[models[0]],
+                       on_done=lambda job, sr: on_done(models[0], job, sr), collect=False,
+                       on_error=lambda job, exc: on_error(models[0], job, exc))
+
+    path = os.path.join(args.out, "scores.csv")
+
+    def checkpoint(k, chunk):
+        # partial scores.csv that downstream scripts can read at any point
+        rows.sync()
+        n_rows = _write_scores(stream_path, path, items, models)
+        with open(os.path.join(args.out, "progress.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "chunks_done": k + 1, "chunks_total": len(chunks),
+                "items_done": int(sum(len(c) for c in chunks[:k + 1])), "items_total": len(items),
+                "min_priority_done": float(pri[chunk].min()), "rows": n_rows,
+            }, f, ensure_ascii=False, indent=2)
+
+    started = time.perf_counter()
+    try:
+        with tqdm(total=total, desc=f"score x{args.concurrency}") as bar:
+            if chunks is not None:
+                for k, chunk in enumerate(chunks):
+                    dispatch(make_jobs(items, perms, done_all, order=chunk))
+                    checkpoint(k, chunk)
+            elif stopper is None:
+                dispatch(jobs)
+            else:
+                # one wave per round: round r only re-scores items whose estimate is still uncertain
+                keys = [str(q) for q in items.qids]
+                for r in range(args.rounds):
+                    active = np.flatnonzero(stopper.active(r))
+                    bar.total -= len(items) - len(active)
+                    bar.refresh()
+                    dispatch([_prepare_item(items, perms, int(i), r) for i in active if (keys[i], r) not in done_all])
+    finally:
+        rows.close()
+        lp_rows.close()
+        dead.close()
+    wall_s = time.perf_counter() - started
+
+    _write_scores(stream_path, path, items, models)
+    print(f"Wrote -> {path}" + (f" (long format, {len(models)} models)" if multi else ""))
+
+    lp_path = os.path.join(args.out, "logprobs.npz")
+    if _materialize_logprobs(lp_stream_path, lp_path, items, models):
+        print(f"Wrote -> {lp_path}")
+    if stopper is not None:
+        summ = stopper.summary(args.rounds)
+        with open(os.path.join(args.out, "adaptive.json"), "w", encoding="utf-8") as f:
+            json.dump(summ, f, ensure_ascii=False, indent=2)
+        print(f"[adaptive] rule={summ['rule']} calls={summ['calls']}/{summ['budget']} "
+              f"saved={summ['calls_saved']} ({summ['saved_frac']:.1%}) datamap={summ['datamap_counts']}")
+        if summ["audit"]["would_stop"]:
+            print(f"[adaptive] audit: {summ['audit']['region_flips']}/{summ['audit']['would_stop']} early stops "
+                  f"changed region ({summ['audit']['flip_rate']:.1%})")
+    price_in = _split_arg(args.price_in, models, float) if args.price_in is not None else {}
+    price_out = _split_arg(args.price_out, models, float) if args.price_out is not None else {}
+    summaries = {
+        m: run_summary(pd.DataFrame(session[m], columns=list(META_COLUMNS)), wall_s, model=m,
+                       price_in=price_in.get(m), price_out=price_out.get(m))
+        for m in models
+    }
+    for m in models:
+        summaries[m]["dead_letter_rows"] = n_dead[m]
+        payload_stats = getattr(clients[m], "payload_stats", None)
+        if payload_stats is not None:
+            summaries[m]["payload"] = payload_stats()
+    hosts = transport_stats()
+    images = default_image_cache().stats()
+    with open(os.path.join(args.out, "run_summary.json"), "w", encoding="utf-8") as f:
+        json.dump({"wall_s": wall_s, "resumed_rows": n_done, "models": summaries, "transport": hosts,
+                   "image_cache": images}, f, ensure_ascii=False, indent=2)
+    for m, st in summaries.items():
+        lat = "/".join(_fmt(st[f"latency_p{q}_s"], ".3f") for q in (50, 95, 99))
+        print(f"[run] {m}: rows={st['rows']} calls={st['calls']} latency p50/p95/p99={lat}s "
+              f"calls/s={st['calls_per_s']:.2f} tokens/s={st['tokens_per_s']:.1f} "
+              f"cost~${_fmt(st['cost_estimate_usd'], '.4f')}")
+        if "payload" in st:
+            pl = st["payload"]
+            print(f"[payload] {m}: requests={pl['requests']} sent={pl['request_bytes']}B (images {pl['image_bytes']}B)")
+    if images["lookups"]:
+        print(f"[images] encodes={images['encodes']} hits mem/disk={images['mem_hits']}/{images['disk_hits']} "
+              f"source={images['source_bytes']}B encoded={images['payload_bytes']}B")
+    for host, st in hosts.items():
+        print(f"[transport] {host}: retries={st['retries']} failed={st['failed']} "
+              f"breaker_trips={st['breaker_trips']} concurrency_limit={st['concurrency_limit']}")
+    if sum(n_dead.values()):
+        print(f"[dead-letter] {sum(n_dead.values())} rows failed -> {dead_path}; rerun with --resume to replay them")
+    if cache is not None:
+        st = cache.stats()
+        print(f"[cache] hits={st['hits']} misses={st['misses']} hit_rate={st['hit_rate']:.1%} "
+              f"entries={st['entries']} bytes={st['bytes']} evicted={st['evicted']}")
+        cache.close()
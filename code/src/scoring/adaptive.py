@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+__all__ = ["SequentialStopper", "datamap_region", "t975", "REGIONS"]
+
+
+REGIONS = ("Easy", "Ambiguous", "Hard", "Impossible")
+# mean_easy, std_easy, mean_hard, std_hard — same defaults as scripts/report_race.py
+DM_THRESHOLDS = (0.70, 0.15, 0.30, 0.15)
+
+
+def datamap_region(mean: np.ndarray, std: np.ndarray, thresholds: Sequence[float] = DM_THRESHOLDS) -> np.ndarray:
+    """
+    Vectorized Data Map region index (into REGIONS), with the rules of
+    `report_race.datamap_counts`: Easy = high mean & low std, Hard = low mean &
+    high std, Impossible = low mean & low std, everything else Ambiguous.
+    """
+    me, se, mh, sh = thresholds
+    mean, std = np.asarray(mean, dtype=float), np.asarray(std, dtype=float)
+    return np.select(
+        [(mean >= me) & (std < se), (mean < mh) & (std >= sh), (mean < mh) & (std < sh)],
+        [0, 2, 3],
+        default=1,
+    )
+
+# two-sided 95% Student-t quantiles by degrees of freedom (df > 30 uses the normal 1.96)
+_T975 = (
+    np.inf, 12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+
+
+def t975(df: np.ndarray) -> np.ndarray:
+    """Vectorized two-sided 95% t quantile (inf for df < 1)."""
+    df = np.asarray(df)
+    table = np.asarray(_T975)
+    return np.where(df > 30, 1.96, table[np.clip(df, 0, 30)])
+
+
+class SequentialStopper:
+    """
+    Per-item sequential stopping for adaptive round allocation.
+
+    Observed `p_correct` values are kept in an (n_items, max_rounds) table; the
+    decision for round r only looks at rounds < r, so replaying a stream (e.g.
+    on resume) reproduces the same schedule.
+
+    Rules (after `min_rounds` observations):
+
+        ci     : stop once the 95% Student-t half-width t * sd / sqrt(n) of
+                 mean p_correct is <= `ci_width`
+        region : stop once the box spanned by that interval and the matching
+                 interval on std (normal-theory SE sd / sqrt(2(n-1)), same t)
+                 lies in a single Data Map region, i.e. all four corners agree
+
+    The t quantile keeps two-round decisions conservative: only items whose
+    first rounds (nearly) agree stop early.
+
+    `audit_frac` keeps a random fraction of items running to the full budget
+    even after they would have stopped; `summary()` then reports how often the
+    Data Map region at the would-be stop differs from the full-budget region,
+    an empirical estimate of the region-count tolerance of the schedule.
+
+    Items without a gold letter (p_correct is NaN) stop after `min_rounds`.
+    """
+
+    def __init__(
+        self,
+        n_items: int,
+        max_rounds: int,
+        min_rounds: int = 2,
+        rule: str = "region",
+        ci_width: float = 0.1,
+        thresholds: Sequence[float] = DM_THRESHOLDS,
+        audit_frac: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        if rule not in {"ci", "region"}:
+            raise ValueError(f"rule must be 'ci' or 'region', got {rule!r}")
+        self.p = np.full((n_items, max_rounds), np.nan)
+        self.seen = np.zeros((n_items, max_rounds), dtype=bool)
+        self.min_rounds = max(1, int(min_rounds))
+        self.rule = rule
+        self.ci_width = float(ci_width)
+        self.thresholds = tuple(thresholds)
+        self.audit = np.random.default_rng(seed).random(n_items) < float(audit_frac)
+        self.audit_region = np.full(n_items, -1, dtype=np.int8)  # region at the would-be stop
+
+    def update(self, item: int, r: int, p_correct: Optional[float]) -> None:
+        self.seen[item, r] = True
+        self.p[item, r] = np.nan if p_correct is None else float(p_correct)
+
+    def stats(self, r: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(n, mean, std (ddof=0), CI half-width on mean, CI half-width on std) over the rounds before `r`."""
+        P = self.p[:, :r]
+        obs = ~np.isnan(P)
+        n = obs.sum(axis=1)
+        s1 = np.where(obs, P, 0.0).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = s1 / n
+            dev2 = np.where(obs, (P - mean[:, None]) ** 2, 0.0).sum(axis=1)
+            std0 = np.sqrt(dev2 / n)
+            sd1 = np.sqrt(dev2 / np.maximum(n - 1, 1))
+            t = t975(n - 1)
+            half = np.where(n >= 2, t * sd1 / np.sqrt(n), np.inf)
+            half_sd = np.where(n >= 2, t * sd1 / np.sqrt(2 * np.maximum(n - 1, 1)), np.inf)
+        return n, mean, std0, half, half_sd
+
+    def active(self, r: int) -> np.ndarray:
+        """Boolean mask of items that should be scored in round `r`."""
+        n_items = self.p.shape[0]
+        if r < self.min_rounds:
+            return np.ones(n_items, dtype=bool)
+        # an item that skipped an earlier round has already stopped
+        ran_all = self.seen[:, :r].all(axis=1)
+        n, mean, std0, half, half_sd = self.stats(r)
+        if self.rule == "ci":
+            settled = half <= self.ci_width
+        else:
+            corners = [
+                datamap_region(m, sd, self.thresholds)
+                for m in (mean - half, mean + half)
+                for sd in (np.maximum(std0 - half_sd, 0.0), std0 + half_sd)
+            ]
+            settled = np.isfinite(half) & np.all([c == corners[0] for c in corners[1:]], axis=0)
+        stop = ran_all & (n > 0) & settled
+        first = stop & self.audit & (self.audit_region < 0)
+        self.audit_region[first] = datamap_region(mean[first], std0[first], self.thresholds)
+        return ran_all & (n > 0) & (~settled | self.audit)
+
+    def summary(self, rounds_done: int) -> Dict[str, object]:
+        """Call counts and the Data Map region counts implied by the observed rounds."""
+        calls = int(self.seen.sum())
+        budget = int(self.seen.shape[0] * self.seen.shape[1])
+        n, mean, std0, _, _ = self.stats(rounds_done)
+        has = n > 0
+        regions = datamap_region(mean[has], std0[has], self.thresholds)
+        audited = self.audit_region >= 0
+        final = datamap_region(mean[audited], std0[audited], self.thresholds)
+        flips = int((final != self.audit_region[audited]).sum())
+        return {
+            "rule": self.rule,
+            "min_rounds": self.min_rounds,
+            "max_rounds": int(self.seen.shape[1]),
+            "ci_width": self.ci_width,
+            "dm_thresholds": list(self.thresholds),
+            "calls": calls,
+            "budget": budget,
+            "calls_saved": budget - calls,
+            "saved_frac": (budget - calls) / budget if budget else 0.0,
+            "rounds_per_item": np.bincount(self.seen.sum(axis=1), minlength=self.seen.shape[1] + 1).tolist(),
+            "datamap_counts": {k: int((regions == i).sum()) for i, k in enumerate(REGIONS)},
+            "audit": {
+                "items": int(self.audit.sum()),
+                "would_stop": int(audited.sum()),
+                "region_flips": flips,
+                "flip_rate": flips / int(audited.sum()) if audited.any() else 0.0,
+            },
+        }
@@ -0,0 +1,417 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from itertools import islice
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Union
+
+from .interface import BatchScoreResult, ScoreResult, accepted_kwargs
+from .transport import TransportError
+
+
+__all__ = [
+    "ScoreJob",
+    "TokenBucket",
+    "score_jobs_async",
+    "score_jobs",
+    "score_job_batches",
+    "fan_out_async",
+    "fan_out",
+    "fan_out_batches",
+]
+
+
+@dataclass
+class ScoreJob:
+    """
+    One scoring call: the exact prompt/options shown to the model.
+
+    Attributes
+    ----------
+    prompt : str
+        Fully formatted prompt (already permuted).
+    options : dict
+        Displayed options (letter -> text) in permuted space.
+    image_path : Optional[str]
+        Optional image forwarded to vision-capable clients.
+    ctx : Optional[dict]
+        Opaque caller context (e.g. qid / round / letter maps), handed back
+        untouched to the `on_done` callback.
+    n : int
+        Number of samples of this prompt. With n > 1 the client's
+        `score_mcq_samples` is used and `on_done` receives a list of n results.
+    """
+    prompt: str
+    options: dict
+    image_path: Optional[str] = None
+    ctx: Optional[dict] = None
+    n: int = 1
+
+
+class TokenBucket:
+    """
+    Async token-bucket rate limiter.
+
+    `rate` tokens are added per second up to `burst`; each `acquire()` takes one
+    token and sleeps until one is available. A non-positive rate disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        self.rate = float(rate or 0.0)
+        self.burst = float(burst if burst is not None else max(1.0, self.rate))
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+
+def _call_kwargs(client, job: ScoreJob) -> dict:
+    """
+    Keyword arguments of a client call. Clients with `keyed_samples` also get
+    `sample_key="<question_id>:<run_id>[.<run_id>...]"` from the job ctx, which
+    names the draw independently of how many calls this process made before
+    (so a resumed run does not reuse another round's cached sample). Callers pass
+    them through `accepted_kwargs`, so a client only gets the ones it declares.
+    """
+    kw = {"image_path": job.image_path}
+    ctx = job.ctx or {}
+    if getattr(client, "keyed_samples", False) and "question_id" in ctx:
+        runs = ctx.get("run_ids", [ctx.get("run_id")])
+        kw["sample_key"] = f"{ctx['question_id']}:" + ".".join(str(r) for r in runs)
+    return kw
+
+
+def _reserve(clients: Mapping[str, object], conc: Mapping[str, int]) -> None:
+    """
+    Let each shared per-host transport admit the engine's workers from the start:
+    clients on the same host (one `Transport`) add up their worker counts.
+    """
+    wanted: Dict[int, list] = {}
+    for n, client in clients.items():
+        transport = getattr(client, "transport", None)
+        if transport is not None and hasattr(transport, "reserve"):
+            entry = wanted.setdefault(id(transport), [transport, 0])
+            entry[1] += int(conc[n])
+    for transport, n_workers in wanted.values():
+        transport.reserve(n_workers)
+
+
+async def _call(client, job: ScoreJob) -> ScoreResult:
+    if job.n > 1:
+        asamples = getattr(client, "ascore_mcq_samples", None)
+        if asamples is None:
+            return await asyncio.to_thread(_call_sync, client, job)
+        return await asamples(job.prompt, job.options, job.n, **accepted_kwargs(asamples, _call_kwargs(client, job)))
+    ascore = getattr(client, "ascore_mcq", None)
+    if ascore is None:
+        # plain clients without the ModelClient base: run the blocking call in a thread
+        return await asyncio.to_thread(_call_sync, client, job)
+    return await ascore(job.prompt, job.options, **accepted_kwargs(ascore, _call_kwargs(client, job)))
+
+
+def _stamp(sr, latency_s: float, queue_wait_s: float):
+    """
+    Fill engine-side timing into the result meta. Latency / call counts reported
+    by the client win; a multi-sample list counts as one call, on its first result.
+    """
+    for k, r in enumerate(sr if isinstance(sr, list) else [sr]):
+        if r.meta is None:
+            r.meta = {}
+        r.meta.setdefault("latency_s", latency_s)
+        r.meta.setdefault("calls", 1 if k == 0 else 0)
+        # engine-side queueing plus any local wait the client reported (transport limiter / breaker)
+        r.meta["queue_wait_s"] = queue_wait_s + float(r.meta.get("queue_wait_s") or 0.0)
+    return sr
+
+
+def _stamp_batch(br: BatchScoreResult, latency_s: float) -> BatchScoreResult:
+    """Per-row meta of a batch call: the batch latency is amortized over its rows."""
+    n = len(br)
+    metas = list(br.meta) if br.meta is not None else [None] * n
+    for k, m in enumerate(metas):
+        m = metas[k] = m if m is not None else {}
+        m.setdefault("latency_s", latency_s / max(1, n))
+        m.setdefault("calls", 1)
+        m["queue_wait_s"] = 0.0
+    br.meta = metas
+    return br
+
+
+async def _timed_call(client, job: ScoreJob, ready: float):
+    start = time.perf_counter()
+    sr = await _call(client, job)
+    return _stamp(sr, time.perf_counter() - start, start - ready)
+
+
+def _timed_call_sync(client, job: ScoreJob):
+    start = time.perf_counter()
+    sr = _call_sync(client, job)
+    return _stamp(sr, time.perf_counter() - start, 0.0)
+
+
+def _call_sync(client, job: ScoreJob) -> ScoreResult:
+    if job.n > 1:
+        samples = getattr(client, "score_mcq_samples", None)
+        if samples is None:
+            return [_call_sync(client, ScoreJob(job.prompt, job.options, job.image_path, job.ctx)) for _ in range(job.n)]
+        return samples(job.prompt, job.options, job.n, **accepted_kwargs(samples, _call_kwargs(client, job)))
+    # image support is handled inside the client via USE_IMAGE env
+    return client.score_mcq(job.prompt, job.options, **accepted_kwargs(client.score_mcq, _call_kwargs(client, job)))
+
+
+async def score_jobs_async(
+    client,
+    jobs: Iterable[ScoreJob],
+    concurrency: int = 8,
+    rate: float = 0.0,
+    on_done: Optional[Callable[[ScoreJob, ScoreResult], None]] = None,
+    collect: bool = True,
+    on_error: Optional[Callable[[ScoreJob, TransportError], None]] = None,
+) -> List[ScoreResult]:
+    """
+    Score `jobs` with at most `concurrency` requests in flight.
+
+    A fixed pool of workers pulls jobs in submission order from a shared iterator,
+    so `jobs` may be a lazy generator and memory stays bounded by the window rather
+    than the number of jobs. `rate` (requests/second) is enforced with a shared
+    `TokenBucket`. `on_done(job, result)` is called as each job finishes (e.g. to
+    stream rows to disk). Each result's meta gets `latency_s` (unless the client
+    reported its own) and `queue_wait_s`, the time between the job being pulled
+    from the iterator and its call starting (rate limiting included), plus the wait
+    the client reports for its transport's concurrency limit / circuit breaker. With `collect=True` the results are also returned in
+    submission order, regardless of completion order; with `collect=False` nothing
+    is retained and an empty list is returned. With `on_error`, a job whose
+    remote call failed for good (`TransportError`) is handed to
+    `on_error(job, error)` (its result slot stays None) and the run goes on.
+    """
+    results: List[Optional[ScoreResult]] = []
+    bucket = TokenBucket(rate, burst=max(1, concurrency))
+    next_job = enumerate(jobs)
+
+    async def worker() -> None:
+        for i, job in next_job:
+            ready = time.perf_counter()
+            await bucket.acquire()
+            try:
+                sr = await _timed_call(client, job, ready)
+            except TransportError as exc:
+                if on_error is None:
+                    raise
+                on_error(job, exc)
+                continue
+            if collect:
+                if i >= len(results):
+                    results.extend([None] * (i + 1 - len(results)))
+                results[i] = sr
+            if on_done is not None:
+                on_done(job, sr)
+
+    n_workers = max(1, int(concurrency))
+    if hasattr(jobs, "__len__"):
+        n_workers = max(1, min(n_workers, len(jobs)))
+    _reserve({"": client}, {"": n_workers})
+    try:
+        await asyncio.gather(*(worker() for _ in range(n_workers)))
+    finally:
+        aclose = getattr(client, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    return results  # type: ignore[return-value]
+
+
+def score_jobs(
+    client,
+    jobs: Iterable[ScoreJob],
+    concurrency: int = 1,
+    rate: float = 0.0,
+    on_done: Optional[Callable[[ScoreJob, ScoreResult], None]] = None,
+    collect: bool = True,
+    on_error: Optional[Callable[[ScoreJob, TransportError], None]] = None,
+) -> List[ScoreResult]:
+    """
+    Synchronous entry point used by `runner.py score`.
+
+    `concurrency <= 1` without a rate limit keeps the original one-call-at-a-time
+    loop; otherwise the jobs are dispatched through `score_jobs_async` on a fresh
+    event loop.
+    """
+    if concurrency <= 1 and not rate:
+        out = []
+        for job in jobs:
+            try:
+                sr = _timed_call_sync(client, job)
+            except TransportError as exc:
+                if on_error is None:
+                    raise
+                on_error(job, exc)
+                continue
+            if collect:
+                out.append(sr)
+            if on_done is not None:
+                on_done(job, sr)
+        return out
+    return asyncio.run(score_jobs_async(
+        client, jobs, concurrency=concurrency, rate=rate, on_done=on_done, collect=collect, on_error=on_error,
+    ))
+
+
+def _call_batch(client, jobs: List[ScoreJob]) -> BatchScoreResult:
+    batch = getattr(client, "score_mcq_batch", None)
+    if batch is None:
+        return BatchScoreResult.from_results([_timed_call_sync(client, job) for job in jobs])
+    start = time.perf_counter()
+    br = batch(
+        [job.prompt for job in jobs],
+        [job.options for job in jobs],
+        image_paths=[job.image_path for job in jobs],
+    )
+    return _stamp_batch(br, time.perf_counter() - start)
+
+
+def score_job_batches(
+    client,
+    jobs: Iterable[ScoreJob],
+    batch_size: int,
+    on_batch: Callable[[List[ScoreJob], BatchScoreResult], None],
+) -> int:
+    """
+    Score `jobs` in chunks of `batch_size` through `client.score_mcq_batch`.
+
+    Each chunk and its array-backed result are handed to `on_batch(jobs, result)`
+    in submission order; nothing is retained between chunks. Returns the number
+    of jobs scored.
+    """
+    it = iter(jobs)
+    n = 0
+    while True:
+        chunk = list(islice(it, max(1, int(batch_size))))
+        if not chunk:
+            return n
+        on_batch(chunk, _call_batch(client, chunk))
+        n += len(chunk)
+
+
+def _per_client(value, names) -> Dict[str, float]:
+    if isinstance(value, Mapping):
+        return {n: value[n] for n in names}
+    return {n: value for n in names}
+
+
+async def fan_out_async(
+    clients: Mapping[str, object],
+    jobs: Iterable[ScoreJob],
+    concurrency: Union[int, Mapping[str, int]] = 8,
+    rate: Union[float, Mapping[str, float]] = 0.0,
+    on_done: Optional[Callable[[str, ScoreJob, ScoreResult], None]] = None,
+    skip: Optional[Callable[[str, ScoreJob], bool]] = None,
+    on_error: Optional[Callable[[str, ScoreJob, TransportError], None]] = None,
+) -> None:
+    """
+    Score every job against several clients concurrently.
+
+    `jobs` is consumed once: each job (prompt already built) is handed to a
+    bounded queue per client, and each client drains its queue with its own
+    worker pool (`concurrency`) and `TokenBucket` (`rate`), both given either
+    as one value for all clients or per client name. `on_done(name, job, result)`
+    is called as each call finishes. `skip(name, job)` lets the caller drop
+    (client, job) pairs that are already done, e.g. on resume. A slow client
+    only holds the others back once its queue is full. `queue_wait_s` in the
+    result meta runs from enqueue to call start. `on_error(name, job, error)`
+    receives (client, job) pairs whose remote call failed for good, as in
+    `score_jobs_async`.
+    """
+    names = list(clients)
+    conc = {n: max(1, int(c)) for n, c in _per_client(concurrency, names).items()}
+    rates = _per_client(rate, names)
+    queues = {n: asyncio.Queue(maxsize=max(64, 4 * conc[n])) for n in names}
+
+    async def producer() -> None:
+        for job in jobs:
+            for n in names:
+                if skip is None or not skip(n, job):
+                    await queues[n].put((job, time.perf_counter()))
+        for n in names:
+            for _ in range(conc[n]):
+                await queues[n].put(None)
+
+    async def worker(n: str, bucket: TokenBucket) -> None:
+        while True:
+            item = await queues[n].get()
+            if item is None:
+                return
+            job, ready = item
+            await bucket.acquire()
+            try:
+                sr = await _timed_call(clients[n], job, ready)
+            except TransportError as exc:
+                if on_error is None:
+                    raise
+                on_error(n, job, exc)
+                continue
+            if on_done is not None:
+                on_done(n, job, sr)
+
+    _reserve(clients, conc)
+    tasks = [producer()]
+    for n in names:
+        bucket = TokenBucket(rates[n], burst=conc[n])
+        tasks.extend(worker(n, bucket) for _ in range(conc[n]))
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for client in clients.values():
+            aclose = getattr(client, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+
+def fan_out(
+    clients: Mapping[str, object],
+    jobs: Iterable[ScoreJob],
+    concurrency: Union[int, Mapping[str, int]] = 1,
+    rate: Union[float, Mapping[str, float]] = 0.0,
+    on_done: Optional[Callable[[str, ScoreJob, ScoreResult], None]] = None,
+    skip: Optional[Callable[[str, ScoreJob], bool]] = None,
+    on_error: Optional[Callable[[str, ScoreJob, TransportError], None]] = None,
+) -> None:
+    """Synchronous entry point for `fan_out_async` (one event loop for all clients)."""
+    asyncio.run(fan_out_async(clients, jobs, concurrency=concurrency, rate=rate,
+                              on_done=on_done, skip=skip, on_error=on_error))
+
+
+def fan_out_batches(
+    clients: Mapping[str, object],
+    jobs: Iterable[ScoreJob],
+    batch_size: int,
+    on_batch: Callable[[str, List[ScoreJob], BatchScoreResult], None],
+    skip: Optional[Callable[[str, ScoreJob], bool]] = None,
+) -> int:
+    """
+    Batched counterpart of `fan_out`: each chunk of `batch_size` jobs is built
+    once and scored by every client in turn through `score_mcq_batch`.
+    Returns the number of (client, job) pairs scored.
+    """
+    it = iter(jobs)
+    n = 0
+    while True:
+        chunk = list(islice(it, max(1, int(batch_size))))
+        if not chunk:
+            return n
+        for name, client in clients.items():
+            todo = chunk if skip is None else [job for job in chunk if not skip(name, job)]
+            if todo:
+                on_batch(name, todo, _call_batch(client, todo))
+                n += len(todo)
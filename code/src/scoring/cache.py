@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional, Union
+
+
+__all__ = ["ResponseCache", "CacheMissError", "request_digest"]
+
+
+class CacheMissError(RuntimeError):
+    """Raised by a read-only cache when a request has no stored response."""
+
+
+def request_digest(request: Dict[str, Any], sample: Union[int, str] = 0) -> str:
+    """
+    Content address of a chat-completion request.
+
+    The digest covers every field that changes the response distribution
+    (model, messages incl. any image data URL, temperature, max_tokens,
+    top_logprobs, ...) via canonical JSON. `sample` distinguishes repeated
+    draws of the same request when sampling is stochastic (temperature > 0),
+    e.g. the "<question_id>:<run_id>" of the draw.
+    """
+    blob = json.dumps(request, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    h = hashlib.sha256(blob.encode("utf-8"))
+    h.update(f"#sample={sample}".encode())
+    return h.hexdigest()
+
+
+class ResponseCache:
+    """
+    Persistent SQLite cache of raw model responses keyed by `request_digest`.
+
+    Values are zlib-compressed JSON payloads (the full response, so any
+    post-processing such as CONF_MODE / NORM_SCOPE can be re-applied on a hit).
+
+    Parameters
+    ----------
+    path : str
+        SQLite file; parent directories are created as needed.
+    mode : str
+        "rw" (default) reads and writes; "ro" only reads and raises
+        `CacheMissError` on a miss, which makes offline replays reproducible
+        and guarantees no API call is made.
+    max_bytes : Optional[int]
+        Size budget for stored payloads. When exceeded, least recently used
+        entries are evicted down to 90% of the budget.
+    """
+
+    def __init__(self, path: str, mode: str = "rw", max_bytes: Optional[int] = None) -> None:
+        if mode not in {"rw", "ro"}:
+            raise ValueError(f"mode must be 'rw' or 'ro', got {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+
+        if mode == "ro":
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"read-only cache not found: {path}")
+            self._db = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            parent = os.path.dirname(os.path.abspath(path)) or "."
+            os.makedirs(parent, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+                " created REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses(last_access)")
+            self._db.commit()
+
+    # ---- lookup / store ----
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored payload for `key` or None (raises `CacheMissError` in ro mode)."""
+        with self._lock:
+            row = self._db.execute("SELECT value FROM responses WHERE key=?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                if self.mode == "ro":
+                    raise CacheMissError(f"no cached response for {key[:16]}… in {self.path}")
+                return None
+            self.hits += 1
+            if self.mode == "rw":
+                self._db.execute("UPDATE responses SET last_access=? WHERE key=?", (time.time(), key))
+                self._db.commit()
+        return json.loads(zlib.decompress(row[0]).decode("utf-8"))
+
+    def put(self, key: str, payload: Dict[str, Any]) -> None:
+        """Store a JSON-serialisable payload; a no-op in ro mode."""
+        if self.mode == "ro":
+            return
+        blob = zlib.compress(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses(key, value, size, created, last_access) VALUES (?,?,?,?,?)",
+                (key, blob, len(blob), now, now),
+            )
+            self._db.commit()
+            if self.max_bytes:
+                self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        cur = self._db.execute("SELECT key, size FROM responses ORDER BY last_access ASC")
+        drop = []
+        for key, size in cur:
+            if total <= target:
+                break
+            drop.append((key,))
+            total -= size
+        self._db.executemany("DELETE FROM responses WHERE key=?", drop)
+        self._db.commit()
+        self.evicted += len(drop)
+
+    # ---- reporting ----
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            n, size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            "evicted": self.evicted,
+            "entries": int(n),
+            "bytes": int(size),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
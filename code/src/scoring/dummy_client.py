@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import numpy as np
 
+from typing import Mapping, Optional, Sequence
+
 from .interface import (
     ModelClient,
     ScoreResult,
+    BatchScoreResult,
     normalize_probs,
     argmax_key,
     LETTERS,
@@ -19,6 +22,8 @@ class DummyClient(ModelClient):
     """
 
     name: str = "dummy"
+    # the batch draw is one vectorized call, so `score` batches by default
+    preferred_batch_size: int = 4096
 
     def __init__(self, seed: int = 42) -> None:
         self.rng = np.random.default_rng(seed)
@@ -33,4 +38,18 @@ class DummyClient(ModelClient):
         probs = normalize_probs(probs)
         chosen = argmax_key(probs)
 
-        return ScoreResult(question_id="", chosen=chosen, probs=probs)
\ No newline at end of file
+        return ScoreResult(question_id="", chosen=chosen, probs=probs)
+
+    def score_mcq_batch(
+        self,
+        prompts: Sequence[str],
+        options_list: Sequence[Mapping[str, str]],
+        image_paths: Optional[Sequence[Optional[str]]] = None,
+    ) -> BatchScoreResult:
+        # One (N, 4) draw consumes the generator exactly like N calls of size 4,
+        # so batched and per-item scoring produce identical numbers.
+        z = self.rng.normal(loc=0.0, scale=1.0, size=(len(prompts), 4))
+        p = np.exp(z - z.max(axis=1, keepdims=True))
+        p = p / p.sum(axis=1, keepdims=True)
+        p = p / p.sum(axis=1, keepdims=True)  # same renormalization as normalize_probs
+        return BatchScoreResult(probs=p, chosen=p.argmax(axis=1))
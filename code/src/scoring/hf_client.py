@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import List, Mapping, Optional, Sequence
+
+import numpy as np
+import torch
+from transformers import AutoModelForMultipleChoice, AutoTokenizer
+
+from .interface import LETTERS, BatchScoreResult, ModelClient, ScoreResult
+from .token_cache import TokenCache
+
+
+__all__ = ["HFMultipleChoiceClient", "plan_batches", "quantize_int8", "parity_report"]
+
+
+def _context_from_prompt(prompt: str) -> str:
+    """
+    Drop the options listing and answer-format line that `build_prompt` appends:
+    an encoder multiple-choice head sees each option as the second segment instead.
+    """
+    return prompt.split("\n\nOptions:\n", 1)[0].strip()
+
+
+def plan_batches(lengths: Sequence[int], token_budget: int) -> List[np.ndarray]:
+    """
+    Group items into length-bucketed batches under a padded-token budget.
+
+    Items are sorted by length, then packed greedily while
+    `n_items * 4 * longest_in_batch <= token_budget` (4 choice rows per item,
+    each padded to the longest sequence of the batch). Returns arrays of
+    original item indices; a single over-budget item still forms its own batch.
+    """
+    order = np.argsort(np.asarray(lengths), kind="stable")
+    batches, cur, longest = [], [], 0
+    for i in order:
+        L = int(lengths[i])
+        new_longest = max(longest, L)
+        if cur and (len(cur) + 1) * 4 * new_longest > token_budget:
+            batches.append(np.array(cur))
+            cur, new_longest = [], L
+        cur.append(int(i))
+        longest = new_longest
+    if cur:
+        batches.append(np.array(cur))
+    return batches
+
+
+def quantize_int8(model):
+    """
+    Dynamic int8 quantization of every `nn.Linear` (weights int8, activations
+    quantized on the fly). CPU only; attention/FFN matmuls dominate encoder
+    inference, so this is where most of the speed-up comes from.
+    """
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def parity_report(ref: BatchScoreResult, test: BatchScoreResult) -> dict:
+    """
+    Compare a reduced-precision run against the fp32 reference on the same items:
+    max / mean absolute difference over prob_A..prob_D and pred_choice agreement.
+    """
+    diff = np.abs(np.asarray(test.probs) - np.asarray(ref.probs))
+    n = int(diff.shape[0])
+    return {
+        "n_items": n,
+        "max_abs_prob_diff": float(diff.max()) if n else 0.0,
+        "mean_abs_prob_diff": float(diff.mean()) if n else 0.0,
+        "pred_agreement": float((np.asarray(test.chosen) == np.asarray(ref.chosen)).mean()) if n else 1.0,
+    }
+
+
+class HFMultipleChoiceClient(ModelClient):
+    """
+    Local encoder scorer using a HuggingFace `AutoModelForMultipleChoice` head.
+
+    Each item is encoded as 4 (context, option) pairs, where the context is the
+    runner prompt without its options block. `score_mcq_batch` tokenizes the
+    whole batch once, sorts items by token length and packs them into batches
+    under a padded-token budget, so short Eedi stems are not padded to the
+    longest RACE passage. Inference runs under `torch.inference_mode()` and
+    logits are copied to host once per batch. Per-row meta carries the raw
+    logits, the item's unpadded token count (prompt_tokens) and its share of
+    the batch wall time (latency_s).
+
+    Environment controls (constructor arguments take precedence):
+
+        DEVICE=cpu|cuda        : torch device (default cpu)
+        HF_MAX_LEN=int         : truncation length per (context, option) pair (default 512)
+        HF_TOKEN_BUDGET=int    : max padded tokens per forward pass, 4 rows/item (default 16384)
+        HF_THREADS=int         : torch intra-op threads (default: torch's own choice)
+        HF_TOKEN_CACHE=dir     : memory-mapped tokenization cache shared by every model
+                                 with the same tokenizer (default: off)
+        HF_QUANT=none|int8     : opt-in dynamic int8 quantization of Linear layers (CPU only);
+                                 check drift first with `runner.py quant-parity`
+    """
+
+    name: str = "hf"
+    # `plan_batches` re-packs each call under the token budget; this only bounds
+    # how many prompts are tokenized and held per call
+    preferred_batch_size: int = 512
+
+    def __init__(
+        self,
+        model_name: str,
+        device: Optional[str] = None,
+        max_len: Optional[int] = None,
+        token_budget: Optional[int] = None,
+        threads: Optional[int] = None,
+        token_cache: Optional[str] = None,
+        quantize: Optional[str] = None,
+    ) -> None:
+        self.model_name = model_name
+        self.device = device or os.getenv("DEVICE", "cpu")
+        self.max_len = int(max_len or os.getenv("HF_MAX_LEN", "512"))
+        self.token_budget = int(token_budget or os.getenv("HF_TOKEN_BUDGET", "16384"))
+        threads = threads or int(os.getenv("HF_THREADS", "0"))
+        if threads > 0:
+            torch.set_num_threads(threads)
+
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+        self.model = AutoModelForMultipleChoice.from_pretrained(model_name).to(self.device)
+        self.model.eval()
+
+        self.quantize = (quantize or os.getenv("HF_QUANT", "none")).strip().lower()
+        if self.quantize == "int8":
+            if self.device != "cpu":
+                raise ValueError("HF_QUANT=int8 (dynamic quantization) is CPU-only; set DEVICE=cpu")
+            self.model = quantize_int8(self.model)
+        elif self.quantize not in {"none", ""}:
+            raise ValueError(f"HF_QUANT must be none | int8, got {self.quantize!r}")
+
+        token_cache = token_cache or os.getenv("HF_TOKEN_CACHE")
+        self.token_cache = TokenCache(token_cache, self.tokenizer, self.max_len) if token_cache else None
+
+    # ---- encoding ----
+    def _tokenize(self, prompts: Sequence[str], options_list: Sequence[Mapping[str, str]]) -> dict:
+        """Tokenize all 4N (context, option) pairs once, unpadded."""
+        firsts, seconds = [], []
+        for prompt, options in zip(prompts, options_list):
+            ctx = _context_from_prompt(prompt)
+            for L in LETTERS:
+                v = options.get(L, "")
+                firsts.append(ctx)
+                seconds.append("" if v is None else str(v))
+        if self.token_cache is not None:
+            return self.token_cache.encode_pairs(firsts, seconds)
+        return self.tokenizer(firsts, seconds, truncation=True, max_length=self.max_len, padding=False)
+
+    def _collate(self, enc: dict, items: np.ndarray) -> dict:
+        """Pad the 4 rows of each item in `items` to the batch's longest row."""
+        rows = [4 * int(i) + k for i in items for k in range(4)]
+        feats = [{key: enc[key][r] for key in enc.keys()} for r in rows]
+        batch = self.tokenizer.pad(feats, padding="longest", return_tensors="pt")
+        return {k: v.view(len(items), 4, -1).to(self.device) for k, v in batch.items()}
+
+    # ---- scoring ----
+    def score_mcq_batch(
+        self,
+        prompts: Sequence[str],
+        options_list: Sequence[Mapping[str, str]],
+        image_paths: Optional[Sequence[Optional[str]]] = None,
+    ) -> BatchScoreResult:
+        n = len(prompts)
+        logits = np.zeros((n, 4), dtype=np.float32)
+        if n == 0:
+            return BatchScoreResult(probs=logits.astype(float), chosen=np.zeros(0, dtype=np.int64))
+
+        start = time.perf_counter()
+        enc = self._tokenize(prompts, options_list)
+        row_lens = np.array([len(ids) for ids in enc["input_ids"]]).reshape(n, 4)
+        lengths = row_lens.max(axis=1)
+
+        with torch.inference_mode():
+            for items in plan_batches(lengths, self.token_budget):
+                out = self.model(**self._collate(enc, items)).logits
+                logits[items] = out.float().cpu().numpy()  # one host copy per batch
+
+        z = logits.astype(np.float64)
+        p = np.exp(z - z.max(axis=1, keepdims=True))
+        p = p / p.sum(axis=1, keepdims=True)
+        latency = (time.perf_counter() - start) / n
+        meta = [
+            {"logits": row, "latency_s": latency, "prompt_tokens": int(t), "completion_tokens": 0,
+             "retries": 0, "cache_hit": False, "calls": 1}
+            for row, t in zip(logits.tolist(), row_lens.sum(axis=1).tolist())
+        ]
+        return BatchScoreResult(probs=p, chosen=p.argmax(axis=1), meta=meta)
+
+    def score_mcq(self, prompt: str, options: Mapping[str, str]) -> ScoreResult:
+        return self.score_mcq_batch([prompt], [options]).to_results()[0]
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+__all__ = ["ImagePayloadCache", "default_image_cache"]
+
+
+_FORMATS = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp"}
+
+
+class ImagePayloadCache:
+    """
+    Cache of image data URLs for vision requests.
+
+    A data URL is keyed by the file's absolute path, mtime and size plus the
+    encoding settings, so an edited image is re-encoded and a changed
+    `max_side` never serves a stale payload. Lookups go memory LRU (bounded by
+    `max_mb` of URL text) -> on-disk cache (`disk_dir`, one file per key,
+    written atomically) -> encode.
+
+    With `max_side` > 0 images larger than that are downscaled (aspect ratio
+    kept) and re-encoded as `fmt` (default: the source format) with `quality`;
+    a re-encode that would not be smaller than the original keeps the original
+    bytes. Downscaling needs Pillow (an ImportError names it when missing).
+
+    Environment controls (see `default_image_cache`):
+
+        IMAGE_CACHE_MB=float   : memory budget of the LRU (default 64)
+        IMAGE_CACHE_DIR=dir    : on-disk cache directory (default: off)
+        IMAGE_MAX_SIDE=int     : downscale so the longer side is <= this (default 0 = original)
+        IMAGE_FORMAT=JPEG|PNG|WEBP : re-encode format when downscaling (default: keep)
+        IMAGE_QUALITY=int      : JPEG / WEBP quality (default 85)
+    """
+
+    def __init__(
+        self,
+        max_mb: float = 64.0,
+        disk_dir: Optional[str] = None,
+        max_side: int = 0,
+        fmt: Optional[str] = None,
+        quality: int = 85,
+    ) -> None:
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.disk_dir = disk_dir
+        self.max_side = int(max_side or 0)
+        self.fmt = fmt.upper() if fmt else None
+        if self.fmt is not None and self.fmt not in _FORMATS:
+            raise ValueError(f"IMAGE_FORMAT must be one of {sorted(_FORMATS)}, got {fmt!r}")
+        self.quality = int(quality)
+        self._mem: "OrderedDict[str, str]" = OrderedDict()
+        self._mem_bytes = 0
+        self._lock = threading.Lock()
+        self.mem_hits = 0
+        self.disk_hits = 0
+        self.encodes = 0
+        self.source_bytes = 0    # raw file bytes read by encodes
+        self.payload_bytes = 0   # data URL bytes produced by encodes
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def _key(self, path: str) -> Optional[str]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        ident = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{self.max_side}|{self.fmt}|{self.quality}"
+        return hashlib.sha256(ident.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, url: str) -> None:
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                return
+            self._mem[key] = url
+            self._mem_bytes += len(url)
+            while self._mem_bytes > self.max_bytes and len(self._mem) > 1:
+                _, old = self._mem.popitem(last=False)
+                self._mem_bytes -= len(old)
+
+    def _encode(self, path: str) -> str:
+        with open(path, "rb") as f:
+            raw = f.read()
+        mime = mimetypes.guess_type(path)[0] or "image/png"
+        data = raw
+        if self.max_side > 0:
+            data, mime = self._downscale(raw, mime)
+        url = f"data:{mime};base64,{base64.b64encode(data).decode('utf-8')}"
+        self.encodes += 1
+        self.source_bytes += len(raw)
+        self.payload_bytes += len(url)
+        return url
+
+    def _downscale(self, raw: bytes, mime: str) -> tuple:
+        try:
+            from PIL import Image
+        except ImportError as e:
+            raise ImportError("IMAGE_MAX_SIDE downscaling needs Pillow (pip install pillow)") from e
+        with Image.open(io.BytesIO(raw)) as im:
+            fmt = self.fmt or (im.format or "PNG").upper()
+            if fmt not in _FORMATS:
+                fmt = "PNG"
+            if max(im.size) <= self.max_side and fmt == (im.format or "").upper():
+                return raw, mime
+            im.thumbnail((self.max_side, self.max_side), Image.LANCZOS)
+            if fmt == "JPEG" and im.mode not in ("RGB", "L"):
+                im = im.convert("RGB")
+            buf = io.BytesIO()
+            im.save(buf, format=fmt, quality=self.quality, optimize=True)
+        out = buf.getvalue()
+        return (out, _FORMATS[fmt]) if len(out) < len(raw) else (raw, mime)
+
+    def get(self, path: str) -> Optional[str]:
+        """Data URL of the image at `path`, or None when the file does not exist."""
+        if not path:
+            return None
+        key = self._key(path)
+        if key is None:
+            return None
+        with self._lock:
+            url = self._mem.get(key)
+            if url is not None:
+                self._mem.move_to_end(key)
+                self.mem_hits += 1
+                return url
+        disk_path = os.path.join(self.disk_dir, key + ".url") if self.disk_dir else None
+        if disk_path and os.path.exists(disk_path):
+            with open(disk_path, encoding="utf-8") as f:
+                url = f.read()
+            self.disk_hits += 1
+        else:
+            url = self._encode(path)
+            if disk_path:
+                tmp = f"{disk_path}.{os.getpid()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(url)
+                os.replace(tmp, disk_path)
+        self._remember(key, url)
+        return url
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.mem_hits + self.disk_hits + self.encodes
+        return {
+            "lookups": lookups,
+            "mem_hits": self.mem_hits,
+            "disk_hits": self.disk_hits,
+            "encodes": self.encodes,
+            "source_bytes": self.source_bytes,
+            "payload_bytes": self.payload_bytes,
+            "mem_entries": len(self._mem),
+            "mem_bytes": self._mem_bytes,
+        }
+
+
+_DEFAULT: Optional[ImagePayloadCache] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def default_image_cache() -> ImagePayloadCache:
+    """Process-wide cache configured from the IMAGE_* environment, shared by every client."""
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = ImagePayloadCache(
+                max_mb=float(os.getenv("IMAGE_CACHE_MB", "64")),
+                disk_dir=os.getenv("IMAGE_CACHE_DIR") or None,
+                max_side=int(os.getenv("IMAGE_MAX_SIDE", "0")),
+                fmt=os.getenv("IMAGE_FORMAT") or None,
+                quality=int(os.getenv("IMAGE_QUALITY", "85")),
+            )
+        return _DEFAULT
@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import asyncio
+import inspect
 from dataclasses import dataclass
-from typing import Dict, Mapping, Optional, Sequence
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Sequence
+
+import numpy as np
 
 
 __all__ = [
     "ScoreResult",
+    "BatchScoreResult",
     "ModelClient",
     "normalize_probs",
     "validate_option_keys",
     "argmax_key",
+    "accepted_kwargs",
 ]
 
 
@@ -42,6 +49,49 @@ class ScoreResult:
     meta: Optional[dict] = None
 
 
+@dataclass
+class BatchScoreResult:
+    """
+    Array-backed result of scoring N multiple-choice questions at once.
+
+    Attributes
+    ----------
+    probs : np.ndarray
+        (N, 4) float array; row i is the normalized distribution over A..D.
+    chosen : np.ndarray
+        (N,) int array of argmax indices into LETTERS.
+    meta : Optional[List[Optional[dict]]]
+        Optional per-row metadata, aligned with the rows of `probs`.
+    """
+    probs: np.ndarray
+    chosen: np.ndarray
+    meta: Optional[List[Optional[dict]]] = None
+
+    def __len__(self) -> int:
+        return int(self.probs.shape[0])
+
+    def to_results(self) -> List[ScoreResult]:
+        """Per-row `ScoreResult` view for code that consumes single results."""
+        metas = self.meta or [None] * len(self)
+        return [
+            ScoreResult(
+                question_id="",
+                chosen=LETTERS[int(c)],
+                probs={k: float(v) for k, v in zip(LETTERS, row)},
+                meta=m,
+            )
+            for row, c, m in zip(self.probs.tolist(), self.chosen, metas)
+        ]
+
+    @classmethod
+    def from_results(cls, results: Sequence[ScoreResult]) -> "BatchScoreResult":
+        """Stack single results (probs over A..D, chosen letter) into arrays."""
+        probs = np.array([[float(r.probs.get(k, 0.0)) for k in LETTERS] for r in results], dtype=float)
+        probs = probs.reshape(len(results), len(LETTERS))
+        chosen = np.array([LETTERS.index(r.chosen) if r.chosen in LETTERS else 0 for r in results], dtype=np.int64)
+        return cls(probs=probs, chosen=chosen, meta=[r.meta for r in results])
+
+
 def validate_option_keys(options: Mapping[str, str]) -> None:
     """
     Validate that the options mapping contains exactly A, B, C, D.
@@ -92,6 +142,34 @@ def argmax_key(probs: Mapping[str, float]) -> str:
     return str(best_k)
 
 
+@lru_cache(maxsize=None)
+def _keyword_params(func) -> Optional[FrozenSet[str]]:
+    """Keyword-passable parameter names of `func`, or None when it takes **kwargs."""
+    try:
+        params = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):  # builtins / C callables without a readable signature
+        return None
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params):
+        return None
+    return frozenset(p.name for p in params
+                     if p.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY))
+
+
+def accepted_kwargs(fn, kwargs: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    The subset of `kwargs` that the callable `fn` accepts, decided from its
+    signature (cached per underlying function), so optional arguments such as
+    `image_path` / `sample_key` are only passed to clients that declare them.
+
+    A call is never retried without its arguments on `TypeError`: that error may
+    come from inside the client (response parsing, SDK code) after a paid request.
+    """
+    params = _keyword_params(getattr(fn, "__func__", fn))
+    if params is None:
+        return dict(kwargs)
+    return {k: v for k, v in kwargs.items() if k in params}
+
+
 class ModelClient:
     """
     Base interface for model scoring clients.
@@ -102,6 +180,9 @@ class ModelClient:
     """
 
     name: str = "abstract"
+    # jobs per `score_mcq_batch` call when `score --batch-size` is left on auto;
+    # 0 = per-item calls through the async engine (API clients)
+    preferred_batch_size: int = 0
 
     def score_mcq(self, prompt: str, options: Mapping[str, str]) -> ScoreResult:
         """
@@ -126,4 +207,57 @@ class ModelClient:
         """
         raise RuntimeError(
             "ModelClient.score_mcq must be implemented by a concrete subclass."
-        )
\ No newline at end of file
+        )
+
+    async def ascore_mcq(self, prompt: str, options: Mapping[str, str], **kwargs) -> ScoreResult:
+        """
+        Async variant of `score_mcq`.
+
+        The base implementation runs the blocking `score_mcq` in a worker thread so
+        every client can be driven by the async scoring engine. Clients with a native
+        async transport (e.g. `OpenAIClient`) should override this.
+        """
+        return await asyncio.to_thread(self.score_mcq, prompt, options, **accepted_kwargs(self.score_mcq, kwargs))
+
+    def score_mcq_batch(
+        self,
+        prompts: Sequence[str],
+        options_list: Sequence[Mapping[str, str]],
+        image_paths: Optional[Sequence[Optional[str]]] = None,
+    ) -> BatchScoreResult:
+        """
+        Score N questions at once.
+
+        The base implementation loops over `score_mcq`; local backends that can
+        vectorize (e.g. `DummyClient`) should override it.
+
+        Returns
+        -------
+        BatchScoreResult
+            (N, 4) probability matrix and (N,) chosen indices.
+        """
+        image_paths = image_paths or [None] * len(prompts)
+        results = []
+        for prompt, options, image_path in zip(prompts, options_list, image_paths):
+            kw = accepted_kwargs(self.score_mcq, {"image_path": image_path})
+            results.append(self.score_mcq(prompt, options, **kw))
+        return BatchScoreResult.from_results(results)
+
+    def score_mcq_samples(self, prompt: str, options: Mapping[str, str], n: int, **kwargs) -> List[ScoreResult]:
+        """
+        Score the same prompt `n` times (one result per sample).
+
+        The base implementation makes `n` independent `score_mcq` calls; API
+        clients that can return several choices per request (e.g. `OpenAIClient`
+        with `n=`) should override it to make a single call.
+        """
+        kwargs = accepted_kwargs(self.score_mcq, kwargs)
+        out = [self.score_mcq(prompt, options, **kwargs) for _ in range(int(n))]
+        for r in out:
+            # every sample was its own call
+            r.meta = {"calls": 1, **(r.meta or {})}
+        return out
+
+    async def ascore_mcq_samples(self, prompt: str, options: Mapping[str, str], n: int, **kwargs) -> List[ScoreResult]:
+        """Async variant of `score_mcq_samples`; runs the blocking call in a worker thread."""
+        return await asyncio.to_thread(self.score_mcq_samples, prompt, options, n, **kwargs)
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+__all__ = [
+    "compact_logprobs",
+    "write_logprob_sidecar",
+    "read_logprob_sidecar",
+    "derive_letter_probs",
+]
+
+
+LETTER_IDX = {"A": 0, "B": 1, "C": 2, "D": 3}
+NO_LETTER = -1
+
+
+def compact_logprobs(token_entries, text_letter: Optional[str], top_k: int, to_letter) -> Dict[str, Any]:
+    """
+    Reduce one response's logprob payload to the compact form stored in the sidecar.
+
+    Each generated token position becomes one row of entries: column 0 is the
+    sampled token, columns 1.. are its top_logprobs alternatives in API order.
+    Tokens are stored only as their A-D code (`to_letter` is the client's
+    token -> letter mapping; -1 for non-letters) since that is all the
+    CONF_MODE / NORM_SCOPE post-processing looks at. Probabilities are kept as
+    `math.exp(logprob)` exactly as `collect_distribution` computes them, so a
+    re-derivation reproduces the live scores.csv bit-for-bit.
+    """
+    codes, probs = [], []
+    for ent in (token_entries or []):
+        row_c = [LETTER_IDX.get(to_letter(getattr(ent, "token", "")), NO_LETTER)]
+        act_lp = getattr(ent, "logprob", None)
+        row_p = [np.nan if act_lp is None else math.exp(float(act_lp))]
+        for alt in (getattr(ent, "top_logprobs", []) or []):
+            row_c.append(LETTER_IDX.get(to_letter(getattr(alt, "token", "")), NO_LETTER))
+            logp = getattr(alt, "logprob", None)
+            row_p.append(np.nan if logp is None else math.exp(float(logp)))
+        codes.append(row_c)
+        probs.append(row_p)
+    return {
+        "codes": codes,
+        "probs": probs,
+        "text_letter": LETTER_IDX.get(text_letter, NO_LETTER),
+        "top_k": int(top_k),
+    }
+
+
+def _pad(rows: Sequence[Sequence[Sequence[float]]], t_max: int, e_max: int, fill, dtype) -> np.ndarray:
+    out = np.full((len(rows), t_max, e_max), fill, dtype=dtype)
+    for i, toks in enumerate(rows):
+        for t, ents in enumerate(toks):
+            out[i, t, : len(ents)] = ents
+    return out
+
+
+def write_logprob_sidecar(path: str, ctxs: Sequence[dict], payloads: Sequence[Optional[dict]]) -> int:
+    """
+    Write the per-(qid, round) logprob payloads of a run as one compressed `.npz`.
+
+    Alongside the padded (N, T, 1+K) `codes` / `probs` tensors the file keeps
+    everything `rederive` needs to rebuild scores.csv offline: question_id, run_id,
+    gold letter index and the original -> displayed letter permutation (plus the
+    model name when the contexts carry one).
+    Returns the number of rows written.
+    """
+    payloads = [p or {"codes": [], "probs": [], "text_letter": NO_LETTER, "top_k": 0} for p in payloads]
+    t_max = max([len(p["codes"]) for p in payloads] + [1])
+    e_max = max([len(row) for p in payloads for row in p["codes"]] + [1])
+
+    o2p = np.full((len(ctxs), 4), NO_LETTER, dtype=np.int8)
+    for i, ctx in enumerate(ctxs):
+        for L, Lp in ctx["o2p"].items():
+            if L in LETTER_IDX and Lp in LETTER_IDX:
+                o2p[i, LETTER_IDX[L]] = LETTER_IDX[Lp]
+
+    # multi-model runs add a model column; single-model sidecars keep the original layout
+    extra = {}
+    if any("model" in c for c in ctxs):
+        extra["model"] = np.array([str(c.get("model", "")) for c in ctxs], dtype=str)
+
+    np.savez_compressed(
+        path,
+        **extra,
+        question_id=np.array([str(c["question_id"]) for c in ctxs], dtype=str),
+        run_id=np.array([c["run_id"] for c in ctxs], dtype=np.int32),
+        gold=np.array([LETTER_IDX.get(c["gold"], NO_LETTER) for c in ctxs], dtype=np.int8),
+        o2p=o2p,
+        n_tokens=np.array([len(p["codes"]) for p in payloads], dtype=np.int16),
+        codes=_pad([p["codes"] for p in payloads], t_max, e_max, NO_LETTER, np.int8),
+        probs=_pad([p["probs"] for p in payloads], t_max, e_max, np.nan, np.float64),
+        text_letter=np.array([p["text_letter"] for p in payloads], dtype=np.int8),
+        top_k=np.int32(max([p["top_k"] for p in payloads] + [0])),
+    )
+    return len(ctxs)
+
+
+def read_logprob_sidecar(path: str) -> Dict[str, np.ndarray]:
+    """Load a sidecar written by `write_logprob_sidecar` into a dict of arrays."""
+    with np.load(path, allow_pickle=False) as z:
+        return {k: z[k] for k in z.files}
+
+
+def derive_letter_probs(
+    codes: np.ndarray,
+    token_probs: np.ndarray,
+    n_tokens: np.ndarray,
+    text_letter: np.ndarray,
+    mode: str = "first_letter",
+    scope: str = "letters",
+    top_k: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized equivalent of `OpenAIClient._parse_response` over a whole run.
+
+    Parameters
+    ----------
+    codes, token_probs : (N, T, 1+K) arrays
+        Letter code / probability of the sampled token (column 0) and alternatives
+        (NaN where the API returned no logprob or the row is padding).
+    n_tokens : (N,) int
+        Number of generated tokens per row (rows are padded to T).
+    text_letter : (N,) int
+        Letter parsed from the text output, used for the one-hot fallback.
+    mode, scope : str
+        CONF_MODE (first_letter | first_raw) and NORM_SCOPE (letters | all).
+    top_k : Optional[int]
+        Keep only the first `top_k` alternatives (<= stored K); None keeps all.
+
+    Returns
+    -------
+    (probs, chosen) : ((N, 4) float64, (N,) int)
+        Distribution over displayed letters A..D and argmax index.
+    """
+    n, t_max, e_max = codes.shape
+    p = np.nan_to_num(token_probs, nan=0.0)
+    if top_k is not None:
+        p[:, :, 1 + int(top_k):] = 0.0
+    p[np.arange(t_max)[None, :] >= n_tokens[:, None]] = 0.0
+
+    # (N, T, E, 5) one-hot over A..D + "other"; reducing over the (non-last) E axis
+    # keeps the sequential actual-then-alternatives summation of `collect_distribution`
+    slot = np.where(codes < 0, 4, codes)
+    onehot = slot[..., None] == np.arange(5, dtype=slot.dtype)
+    mass = np.where(onehot, p[..., None], 0.0).sum(axis=2)
+    letters, other = mass[..., :4], mass[..., 4]
+    sum_letters = letters.sum(axis=2)
+
+    denom = sum_letters if scope == "letters" else sum_letters + other
+    with np.errstate(invalid="ignore", divide="ignore"):
+        dist = np.where((denom > 0)[..., None], letters / denom[..., None], 0.0)
+    usable = dist.sum(axis=2) > 0
+
+    present = np.arange(t_max)[None, :] < n_tokens[:, None]
+    is_letter = (codes[:, :, 0] >= 0) & present
+    cand = is_letter & usable
+    if mode == "first_raw":
+        # the very first token wins if it carries any letter mass, else first_letter
+        cand = cand.copy()
+        first_ok = usable[:, 0] & present[:, 0]
+        cand[first_ok, :] = False
+        cand[first_ok, 0] = True
+
+    has = cand.any(axis=1)
+    t_sel = np.argmax(cand, axis=1)
+    probs = dist[np.arange(n), t_sel]
+
+    # one-hot fallback on the parsed text output ("A" when nothing parses)
+    fb = np.where(text_letter >= 0, text_letter, 0).astype(np.int64)
+    probs[~has] = 0.0
+    probs[np.flatnonzero(~has), fb[~has]] = 1.0
+    chosen = probs.argmax(axis=1)
+    return probs, chosen
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+
+__all__ = ["META_COLUMNS", "call_meta", "meta_columns", "run_summary", "PRICES_PER_MTOK"]
+
+
+# per-call instrumentation persisted as scores.csv columns, in this order
+META_COLUMNS = ("latency_s", "queue_wait_s", "prompt_tokens", "completion_tokens", "retries", "cache_hit", "calls")
+
+# USD per 1M (input, output) tokens, used for the cost estimate when --price-in/--price-out are not given
+PRICES_PER_MTOK = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+
+
+def call_meta(resp, latency_s: float, cache_hit: bool, retries: int = 0, queue_wait_s: float = 0.0) -> Dict[str, Any]:
+    """
+    Instrumentation of one chat-completion call (tokens from `resp.usage` when present).
+    `queue_wait_s` is client-side waiting (transport limiter / breaker / backoff),
+    already excluded from `latency_s`; the engine adds its own queueing on top.
+    """
+    usage = getattr(resp, "usage", None)
+    return {
+        "latency_s": float(latency_s),
+        "queue_wait_s": float(queue_wait_s),
+        "prompt_tokens": getattr(usage, "prompt_tokens", None),
+        "completion_tokens": getattr(usage, "completion_tokens", None),
+        "retries": int(retries),
+        "cache_hit": bool(cache_hit),
+        "calls": 1,
+    }
+
+
+def meta_columns(meta: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    """The META_COLUMNS subset of a result's meta (None where a client did not report a field)."""
+    meta = meta or {}
+    return {k: meta.get(k) for k in META_COLUMNS}
+
+
+def _pct(x: np.ndarray, q: float) -> Optional[float]:
+    return float(np.percentile(x, q)) if len(x) else None
+
+
+def _num(df: pd.DataFrame, col: str) -> pd.Series:
+    if col not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    return pd.to_numeric(df[col], errors="coerce")
+
+
+def run_summary(
+    df: pd.DataFrame,
+    wall_s: float,
+    model: str = "",
+    price_in: Optional[float] = None,
+    price_out: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Latency / throughput / cost summary of one model's rows.
+
+    Latency percentiles are over rows that issued a call (`calls > 0`); rates
+    divide by `wall_s`, the wall-clock time of the scoring session. The cost
+    estimate and `tokens_per_s` only count rows that were not served from the
+    response cache (tokens actually sent / generated); `prompt_tokens` /
+    `completion_tokens` are totals over all rows.
+    """
+    calls = _num(df, "calls").fillna(0)
+    is_call = calls > 0
+    lat = _num(df, "latency_s")[is_call].dropna().to_numpy()
+    wait = _num(df, "queue_wait_s")[is_call].dropna().to_numpy()
+    hit = df["cache_hit"].fillna(False).astype(bool) if "cache_hit" in df.columns else pd.Series(False, index=df.index)
+    p_tok = _num(df, "prompt_tokens").fillna(0)
+    c_tok = _num(df, "completion_tokens").fillna(0)
+
+    name = model.split(":", 1)[-1]
+    default_in, default_out = PRICES_PER_MTOK.get(name, (None, None))
+    price_in = default_in if price_in is None else price_in
+    price_out = default_out if price_out is None else price_out
+    billable = ~hit
+    tokens = float(p_tok[billable].sum() + c_tok[billable].sum())
+    cost = None
+    if price_in is not None and price_out is not None:
+        cost = (float(p_tok[billable].sum()) * price_in + float(c_tok[billable].sum()) * price_out) / 1e6
+
+    wall = wall_s if wall_s > 0 else math.nan
+    return {
+        "model": model,
+        "rows": int(len(df)),
+        "calls": int(calls.sum()),
+        "cache_hits": int((hit & is_call).sum()),
+        "retries": int(_num(df, "retries").fillna(0).sum()),
+        "wall_s": float(wall_s),
+        "latency_p50_s": _pct(lat, 50),
+        "latency_p95_s": _pct(lat, 95),
+        "latency_p99_s": _pct(lat, 99),
+        "queue_wait_p50_s": _pct(wait, 50),
+        "queue_wait_p95_s": _pct(wait, 95),
+        "prompt_tokens": int(p_tok.sum()),
+        "completion_tokens": int(c_tok.sum()),
+        "tokens_per_s": tokens / wall,
+        "calls_per_s": float(calls.sum()) / wall,
+        "rows_per_s": len(df) / wall,
+        "price_per_mtok_in": price_in,
+        "price_per_mtok_out": price_out,
+        "cost_estimate_usd": cost,
+    }
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import random
+import hashlib
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+__all__ = ["MockConfig", "latency_sampler", "mock_completion", "MockServer", "start_mock_server"]
+
+
+LETTERS = ("A", "B", "C", "D")
+# non-letter alternatives a chat model puts next to the answer letter
+NON_LETTERS = (" ", "The", "Answer", "**", "\n", "I")
+
+
+def latency_sampler(spec: str) -> Callable[[random.Random], float]:
+    """
+    Latency distribution (seconds) from a spec in milliseconds:
+
+        const:MS | uniform:LO,HI | lognormal:MEDIAN,SIGMA | exp:MEAN
+    """
+    kind, _, params = str(spec).partition(":")
+    vals = [float(v) for v in params.split(",") if v.strip()] if params else []
+    kind = kind.strip().lower()
+    if kind == "const" and len(vals) == 1:
+        return lambda rng: vals[0] / 1000.0
+    if kind == "uniform" and len(vals) == 2:
+        return lambda rng: rng.uniform(vals[0], vals[1]) / 1000.0
+    if kind == "lognormal" and len(vals) == 2:
+        mu = math.log(max(vals[0], 1e-6))
+        return lambda rng: rng.lognormvariate(mu, vals[1]) / 1000.0
+    if kind == "exp" and len(vals) == 1:
+        return lambda rng: rng.expovariate(1.0 / max(vals[0], 1e-6)) / 1000.0
+    raise ValueError(f"bad latency spec {spec!r}: const:MS | uniform:LO,HI | lognormal:MEDIAN,SIGMA | exp:MEAN")
+
+
+def _rng(*parts: Any) -> random.Random:
+    key = "|".join(str(p) for p in parts)
+    return random.Random(int(hashlib.sha256(key.encode("utf-8")).hexdigest(), 16))
+
+
+def _token(tok: str, lp: float) -> Dict[str, Any]:
+    return {"token": tok, "logprob": lp, "bytes": list(tok.encode("utf-8"))}
+
+
+def mock_completion(body: Dict[str, Any], nonletter_first: float = 0.05) -> Dict[str, Any]:
+    """
+    Deterministic chat.completion for a request body.
+
+    The answer distribution depends only on `messages`, so the same prompt gets
+    the same logprobs whether it is sent live, in a batch or at any
+    concurrency. Letter mass is split between "X" and " X" variants and
+    1-20% goes to non-letter tokens (what NORM_SCOPE=all measures). With
+    probability `nonletter_first` the first generated token is a non-letter
+    (what CONF_MODE=first_raw / first_letter disagree on), followed by the
+    letter when `max_tokens` allows. Each of the `n` choices samples its own
+    token from the shared distribution.
+    """
+    key = json.dumps(body.get("messages"), ensure_ascii=False, sort_keys=True)
+    rng = _rng("dist", key)
+    conc = rng.choice((0.3, 1.0, 3.0))  # confident ... diffuse items
+    mass = {}
+    for L in LETTERS:
+        m = rng.gammavariate(conc, 1.0)
+        split = rng.uniform(0.6, 1.0)
+        mass[L] = m * split
+        mass[" " + L] = m * (1.0 - split)
+    letter_total = sum(mass.values())
+    other = rng.uniform(0.01, 0.2)
+    noise = {t: rng.random() for t in NON_LETTERS}
+    z = sum(noise.values())
+    for t, v in noise.items():
+        mass[t] = letter_total * other / (1.0 - other) * v / z
+    total = sum(mass.values())
+    ranked = sorted(((t, math.log(v / total)) for t, v in mass.items() if v > 0), key=lambda x: -x[1])
+    letters_only = [(t, lp) for t, lp in ranked if t.strip() in LETTERS]
+    lz = math.log(sum(math.exp(lp) for _, lp in letters_only))
+    letters_only = [(t, lp - lz) for t, lp in letters_only]
+    logp = dict(ranked)
+
+    k = max(0, min(20, int(body.get("top_logprobs") or 0))) if body.get("logprobs") else 0
+    max_tokens = max(1, int(body.get("max_tokens") or 1))
+    choices = []
+    for i in range(int(body.get("n") or 1)):
+        srng = _rng("sample", key, i)
+        if srng.random() < nonletter_first:
+            # e.g. "The" then the letter (conditional distribution over letters)
+            steps = [(next((t, lp) for t, lp in ranked if t.strip() not in LETTERS), ranked)]
+            if max_tokens >= 2:
+                steps.append((_sample(letters_only, srng), letters_only))
+        else:
+            tok = _sample(letters_only, srng)[0]
+            steps = [((tok, logp[tok]), ranked)]
+        entries = [
+            {**_token(tok, lp), "top_logprobs": [_token(t, l) for t, l in alts[:k]]}
+            for (tok, lp), alts in steps
+        ]
+        choices.append({
+            "index": i, "finish_reason": "stop",
+            "message": {"role": "assistant", "content": "".join(e["token"] for e in entries)},
+            "logprobs": {"content": entries} if body.get("logprobs") else None,
+        })
+    n_prompt = max(1, len(key) // 4)
+    n_completion = sum(len(c["logprobs"]["content"]) if c["logprobs"] else 1 for c in choices)
+    return {
+        "id": "chatcmpl-mock-" + hashlib.md5(key.encode("utf-8")).hexdigest()[:12],
+        "object": "chat.completion", "created": 0, "model": body.get("model", "mock"),
+        "choices": choices,
+        "usage": {"prompt_tokens": n_prompt, "completion_tokens": n_completion,
+                  "total_tokens": n_prompt + n_completion},
+    }
+
+
+def _sample(dist: List[Tuple[str, float]], rng: random.Random) -> Tuple[str, float]:
+    u, acc = rng.random(), 0.0
+    for tok, lp in dist:
+        acc += math.exp(lp)
+        if u <= acc:
+            return tok, lp
+    return dist[0]
+
+
+@dataclass
+class MockConfig:
+    """
+    Behavior of the mock chat-completions endpoint.
+
+    latency        : latency spec, see `latency_sampler` (e.g. "lognormal:40,0.6")
+    tail_prob      : probability of a straggler that takes `tail_ms` on top
+    error_rate     : probability of a 500 response
+    rate_limit_rate: probability of a 429 with Retry-After (`retry_after_ms`)
+    capacity       : concurrent requests served; the excess gets 429 (0 = unlimited)
+    nonletter_first: probability that the first generated token is not a letter
+    seed           : seed of the latency / error draws (payloads depend only on the request)
+    """
+
+    latency: str = "lognormal:40,0.5"
+    tail_prob: float = 0.0
+    tail_ms: float = 1000.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_ms: int = 100
+    capacity: int = 0
+    nonletter_first: float = 0.05
+    seed: int = 0
+
+
+_REASONS = {200: "OK", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+class MockServer:
+    """
+    OpenAI-compatible `POST /v1/chat/completions` for load tests without API
+    credits; `GET /v1/stats` returns the request counters. Point the scorer at it
+    with OPENAI_BASE_URL=<url> (any OPENAI_API_KEY).
+
+    A single asyncio loop speaks keep-alive HTTP/1.1 and sleeps out the
+    latencies, so thousands of in-flight requests cost no threads and the mock
+    is not what limits a benchmark. `serve_forever()` blocks; `start()` serves
+    from a daemon thread and returns once the port is bound.
+    """
+
+    def __init__(self, cfg: MockConfig, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.cfg = cfg
+        self.host = host
+        self.port = port
+        self._latency = latency_sampler(cfg.latency)
+        self._rng = random.Random(cfg.seed)
+        self._inflight = 0
+        self._counts = {"requests": 0, "ok": 0, "errors": 0, "rate_limited": 0, "overloaded": 0, "max_inflight": 0}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._counts, "inflight": self._inflight, "config": asdict(self.cfg)}
+
+    async def respond(self, body: Dict[str, Any]):
+        cfg = self.cfg
+        self._counts["requests"] += 1
+        if cfg.capacity and self._inflight >= cfg.capacity:
+            self._counts["overloaded"] += 1
+            return 429, {"error": {"type": "rate_limit_error", "message": "over capacity"}}, \
+                {"retry-after-ms": str(cfg.retry_after_ms)}
+        self._inflight += 1
+        self._counts["max_inflight"] = max(self._counts["max_inflight"], self._inflight)
+        try:
+            delay = self._latency(self._rng)
+            if cfg.tail_prob and self._rng.random() < cfg.tail_prob:
+                delay += cfg.tail_ms / 1000.0
+            u = self._rng.random()
+            await asyncio.sleep(delay)
+            if u < cfg.error_rate:
+                self._counts["errors"] += 1
+                return 500, {"error": {"type": "server_error", "message": "mock failure"}}, {}
+            if u < cfg.error_rate + cfg.rate_limit_rate:
+                self._counts["rate_limited"] += 1
+                return 429, {"error": {"type": "rate_limit_error", "message": "mock rate limit"}}, \
+                    {"retry-after-ms": str(cfg.retry_after_ms)}
+            payload = mock_completion(body, cfg.nonletter_first)
+            self._counts["ok"] += 1
+            return 200, payload, {}
+        finally:
+            self._inflight -= 1
+
+    async def _route(self, method: str, path: str, raw: bytes):
+        path = path.split("?", 1)[0].rstrip("/")
+        if method == "GET" and path.endswith("/stats"):
+            return 200, self.stats(), {}
+        if method == "POST" and path.endswith("/chat/completions"):
+            return await self.respond(json.loads(raw or b"{}"))
+        return 404, {"error": {"message": f"no route {method} {path}"}}, {}
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+                method, path = head[0].split(" ")[:2]
+                headers = {k.strip().lower(): v.strip() for k, _, v in (h.partition(":") for h in head[1:] if h)}
+                raw = await reader.readexactly(int(headers.get("content-length") or 0))
+                status, payload, extra = await self._route(method, path, raw)
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                lines = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", "Content-Type: application/json",
+                         f"Content-Length: {len(data)}", *(f"{k}: {v}" for k, v in extra.items())]
+                writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + data)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass  # client went away
+        finally:
+            writer.close()
+
+    async def _serve(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        server = await asyncio.start_server(self._connection, self.host, self.port, backlog=4096)
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with server:
+            await self._stop.wait()
+
+    def serve_forever(self) -> None:
+        asyncio.run(self._serve())
+
+    def start(self) -> "MockServer":
+        threading.Thread(target=self.serve_forever, name="mock-server", daemon=True).start()
+        self._ready.wait()
+        return self
+
+    def shutdown(self) -> None:
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+
+
+def start_mock_server(cfg: MockConfig, host: str = "127.0.0.1", port: int = 0) -> MockServer:
+    """Serve `cfg` from a daemon thread (port 0 = any free port); stop with `server.shutdown()`."""
+    return MockServer(cfg, host, port).start()
@@ -2,30 +2,41 @@ from __future__ import annotations
 
 import os
 import re
+import json
 import math
-import base64
-import mimetypes
-from typing import Dict, Optional, List
+import time
+from typing import Dict, Optional, List, Tuple
 from dataclasses import dataclass
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+from openai.types.chat import ChatCompletion
+
+from src.scoring.cache import ResponseCache, request_digest
+from src.scoring.logprob_store import compact_logprobs
+from src.scoring.metrics import call_meta
+from src.scoring.transport import transport_for
+from src.scoring.image_cache import default_image_cache
 
 # ------------------------------
 # Fallback ScoreResult (compat)
 # ------------------------------
 try:
-    from src.scoring.interface import ScoreResult  # preferred
+    from src.scoring.interface import ScoreResult, ModelClient  # preferred
 except Exception:
+    ModelClient = object
+
     @dataclass
     class ScoreResult:
         chosen: str
         probs: Dict[str, float]
         question_id: Optional[str] = None
+        meta: Optional[dict] = None
 
 
 # ------------------------------
 # Helpers
 # ------------------------------
 LETTER_SET = {"A", "B", "C", "D"}
+PROB_KEYS = ("A", "B", "C", "D")
 
 
 def _norm_letter(text: object) -> Optional[str]:
@@ -61,21 +72,166 @@ def _token_to_letter(tok: str) -> Optional[str]:
     return m.group(0) if m else None
 
 
-def _encode_image_to_data_url(path: str) -> Optional[str]:
-    if not path or not os.path.exists(path):
+def collect_distribution(entry) -> Tuple[Dict[str, float], float]:
+    """
+    Collect unnormalized mass for letters and non-letter mass at this token.
+    Includes BOTH the actual token and the top_logprobs alternatives.
+    Returns: (letters_mass_dict, other_mass)
+    """
+    letters = {k: 0.0 for k in PROB_KEYS}
+    other = 0.0
+
+    # actual token
+    act_tok = getattr(entry, "token", "")
+    act_lp = getattr(entry, "logprob", None)
+    if act_lp is not None:
+        act_p = math.exp(float(act_lp))
+        letter = _token_to_letter(act_tok)
+        if letter in LETTER_SET:
+            letters[letter] += act_p
+        else:
+            other += act_p
+
+    # alternatives
+    for alt in (getattr(entry, "top_logprobs", []) or []):
+        tok = getattr(alt, "token", "")
+        logp = getattr(alt, "logprob", None)
+        if logp is None:
+            continue
+        p = math.exp(float(logp))
+        letter = _token_to_letter(tok)
+        if letter in LETTER_SET:
+            letters[letter] += p
+        else:
+            other += p
+
+    return letters, other
+
+
+def normalize_letters(letters: Dict[str, float], other: float, scope: str = "letters") -> Dict[str, float]:
+    """
+    Apply normalization according to NORM_SCOPE.
+    - letters: raw letter masses
+    - other  : raw non-letter mass
+    """
+    out = {k: 0.0 for k in PROB_KEYS}
+    sum_letters = sum(letters.values())
+
+    if scope == "letters":
+        # Normalize within letters only
+        if sum_letters > 0:
+            for k, v in letters.items():
+                out[k] = v / sum_letters
+    else:
+        # "all": include non-letter mass in the denominator
+        denom = sum_letters + other
+        if denom > 0:
+            # We keep the mass share of letters vs all tokens
+            # so the sum over A/B/C/D is <= 1.0
+            for k, v in letters.items():
+                out[k] = v / denom
+    return out
+
+
+def letter_distribution(token_entries, mode: str = "first_letter", scope: str = "letters") -> Optional[Dict[str, float]]:
+    """
+    Pick the token that carries the answer (per CONF_MODE) and return its A-D distribution,
+    or None when no usable letter mass was found (callers then fall back to the text output).
+    """
+    if not token_entries:
+        return None
+
+    # helper that tries one entry
+    def try_entry(ent) -> Optional[Dict[str, float]]:
+        letters, other = collect_distribution(ent)
+        # must be a token that actually involves a letter if first_letter mode
+        if mode == "first_letter":
+            if _token_to_letter(getattr(ent, "token", "")) not in LETTER_SET:
+                return None
+        dist = normalize_letters(letters, other, scope)
+        if sum(dist.values()) > 0:
+            return dist
         return None
-    mime, _ = mimetypes.guess_type(path)
-    if mime is None:
-        mime = "image/png"
-    with open(path, "rb") as f:
-        b64 = base64.b64encode(f.read()).decode("utf-8")
-    return f"data:{mime};base64,{b64}"
+
+    if mode == "first_raw":
+        # Try the very first generated token
+        dist = try_entry(token_entries[0])
+        if dist is not None:
+            return dist
+    # first_letter (or first_raw fallback): first token that actually contains a letter
+    for ent in token_entries:
+        if _token_to_letter(getattr(ent, "token", "")) in LETTER_SET:
+            dist = try_entry(ent)
+            if dist is not None:
+                return dist
+    return None
+
+
+def parse_choice(choice, mode: str = "first_letter", scope: str = "letters", top_k: int = 20) -> ScoreResult:
+    """
+    ScoreResult of one chat-completion choice: the CONF_MODE / NORM_SCOPE letter
+    distribution of its logprobs, or a one-hot on the letter in its text when no
+    letter mass was returned. Shared by live calls and `runner.py ingest-batch`.
+    """
+    # textual output (fallback path)
+    text_out = (choice.message.content or "").strip()
+
+    lp = choice.logprobs
+    token_entries = getattr(lp, "content", None) if lp else None
+
+    dist = letter_distribution(token_entries, mode, scope)
+
+    # Choose final letter
+    if dist is not None:
+        probs = {k: dist[k] for k in PROB_KEYS}
+        chosen = max(probs, key=probs.get)
+    else:
+        parsed = _norm_letter(text_out)
+        chosen = parsed or "A"
+        # fallback: one-hot
+        probs = {k: (1.0 if k == chosen else 0.0) for k in PROB_KEYS}
+
+    # keep the raw per-token top-logprobs so other CONF_MODE / NORM_SCOPE / TOP_LOGK
+    # settings can be re-derived offline (`runner.py rederive`)
+    meta = {"logprobs": compact_logprobs(token_entries, _norm_letter(text_out), top_k, _token_to_letter)}
+
+    # Return (runner.py does not require question_id here)
+    return ScoreResult(question_id="", chosen=chosen, probs=probs, meta=meta)
+
+
+def parse_choices(resp, cm: dict, mode: str = "first_letter", scope: str = "letters", top_k: int = 20) -> List[ScoreResult]:
+    """
+    One ScoreResult per choice of `resp`, in `choice.index` order, each carrying
+    the call meta `cm`. The call is counted on the first choice only, so per-row
+    token sums stay equal to the billed usage.
+    """
+    order = sorted(range(len(resp.choices)), key=lambda i: resp.choices[i].index)
+    out = [parse_choice(resp.choices[i], mode, scope, top_k) for i in order]
+    rest = {**cm, "prompt_tokens": 0, "completion_tokens": 0, "calls": 0}
+    for k, sr in enumerate(out):
+        sr.meta.update(cm if k == 0 else rest)
+    return out
+
+
+def _encode_image_to_data_url(path: str) -> Optional[str]:
+    # encoded once per (path, mtime, size) and shared by every round / model, see ImagePayloadCache
+    return default_image_cache().get(path)
+
+
+def _payload_bytes(kwargs: dict) -> Tuple[int, int]:
+    """(request body bytes, image data URL bytes) of one chat-completion request."""
+    image = 0
+    for msg in kwargs.get("messages", []):
+        content = msg.get("content")
+        if isinstance(content, list):
+            image += sum(len(part["image_url"]["url"]) for part in content if part.get("type") == "image_url")
+    return len(json.dumps(kwargs, ensure_ascii=False).encode("utf-8")), image
 
 
 # ------------------------------
 # Core client
 # ------------------------------
-class OpenAIClient:
+class OpenAIClient(ModelClient):
     """
     Robust MCQ scorer using Chat Completions + logprobs.
 
@@ -86,7 +242,8 @@ class OpenAIClient:
       (controlled by NORM_SCOPE).
     - Environment controls:
 
-        USE_IMAGE=1|0          : whether to include an image (as data URL)
+        USE_IMAGE=1|0          : whether to include an image (as data URL; encodes are cached
+                                 in memory / on disk and can be downscaled, see ImagePayloadCache)
         STRICT_LETTER=1|0      : strongly nudge the model to output only a single letter
         LETTER_TOKENS=int      : max_tokens when STRICT_LETTER=1 (default 1)
         TOP_LOGK=int           : top_logprobs K (1..20; default 20)
@@ -97,11 +254,45 @@ class OpenAIClient:
                                  - letters (default): normalize within {A,B,C,D}
                                  - all             : include non-letter mass in the denominator
         GEN_T / TEMPERATURE     : sampling temperature (float, default 1.0)
+
+    An optional `ResponseCache` is consulted before every API call. Raw responses
+    are cached, so CONF_MODE / NORM_SCOPE changes are served from the cache too.
+    With temperature > 0 each draw is cached under its `sample_key` (the engine
+    passes "<question_id>:<run_id>" from the job ctx), so every round keeps its own
+    sampling noise, also across --resume; stochastic calls without a key bypass the cache.
+
+    `score_mcq_samples(prompt, options, n)` requests `n` choices in one call
+    (used by `runner.py score --samples-per-call` when every round shows the same prompt).
+
+    Requests go through the shared per-host `Transport` (src/scoring/transport.py):
+    exponential backoff with jitter honoring Retry-After, an AIMD concurrency
+    limit and a circuit breaker; the SDK's own retries are disabled so every
+    retry is counted. A call that still fails raises `TransportError`, which
+    `runner.py score` routes to dead_letter.jsonl. See `TransportConfig` for the
+    TRANSPORT_* / BREAKER_* settings; OPENAI_TIMEOUT=s sets the per-request timeout (default 60).
+
+    Every result's meta records the call: latency_s (cache lookup + request,
+    without the transport's local waiting, which is reported as queue_wait_s),
+    prompt_tokens / completion_tokens (from `usage`), retries and cache_hit.
+    A multi-sample call reports its tokens and `calls=1` on the first choice only.
+    `payload_stats()` sums the request bytes actually sent (cache hits excluded).
+
+    `batch_request(prompt, image_path, n)` returns the request body without
+    sending it (`runner.py score --emit-batch`); Batch API output is parsed by the
+    same `parse_choices` (`runner.py ingest-batch`).
     """
 
-    def __init__(self, model: str = "gpt-4o"):
+    name: str = "openai"
+    # the scoring engine passes `sample_key=` (see `_cache_key`)
+    keyed_samples: bool = True
+
+    def __init__(self, model: str = "gpt-4o", cache: Optional[ResponseCache] = None):
         self.model = model
-        self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"), max_retries=0, timeout=self._timeout())
+        self.transport = transport_for(self.client.base_url.host or "")
+        self._aclient: Optional[AsyncOpenAI] = None
+        self.cache = cache
+        self._sent = {"requests": 0, "request_bytes": 0, "image_bytes": 0}
 
     # ---- env toggles ----
     def _use_image(self) -> bool:
@@ -138,18 +329,18 @@ class OpenAIClient:
             t = 1.0
         return t
 
+    def _timeout(self) -> float:
+        try:
+            return float(os.getenv("OPENAI_TIMEOUT", "60"))
+        except ValueError:
+            return 60.0
+
     def _norm_scope(self) -> str:
         m = os.getenv("NORM_SCOPE", "letters").strip().lower()
         return m if m in {"letters", "all"} else "letters"
 
-    # ---- main ----
-    def score_mcq(
-        self,
-        prompt: str,
-        options: Dict[str, str],
-        image_path: Optional[str] = None,
-    ) -> ScoreResult:
-
+    # ---- request building ----
+    def _build_messages(self, prompt: str, image_path: Optional[str] = None) -> List[dict]:
         # Strong system nudge to return a single letter
         sys_msg = None
         if self._strict_letter():
@@ -171,8 +362,10 @@ class OpenAIClient:
         messages = [{"role": "user", "content": content}]
         if sys_msg:
             messages.insert(0, sys_msg)
+        return messages
 
-        resp = self.client.chat.completions.create(
+    def _request_kwargs(self, messages: List[dict], n: int = 1) -> dict:
+        kwargs = dict(
             model=self.model,
             messages=messages,
             temperature=self._temperature(),
@@ -180,125 +373,147 @@ class OpenAIClient:
             logprobs=True,
             top_logprobs=self._top_logk(),
         )
-
-        # textual output (fallback path)
-        text_out = (resp.choices[0].message.content or "").strip()
-
-        # Prepare letter distribution
-        probs = {"A": 0.0, "B": 0.0, "C": 0.0, "D": 0.0}
-
-        lp = resp.choices[0].logprobs
-        token_entries = getattr(lp, "content", None) if lp else None
-
-        def collect_distribution(entry) -> (Dict[str, float], float):
-            """
-            Collect unnormalized mass for letters and non-letter mass at this token.
-            Includes BOTH the actual token and the top_logprobs alternatives.
-            Returns: (letters_mass_dict, other_mass)
-            """
-            letters = {k: 0.0 for k in LETTER_SET}
-            other = 0.0
-
-            # actual token
-            act_tok = getattr(entry, "token", "")
-            act_lp = getattr(entry, "logprob", None)
-            if act_lp is not None:
-                act_p = math.exp(float(act_lp))
-                letter = _token_to_letter(act_tok)
-                if letter in LETTER_SET:
-                    letters[letter] += act_p
-                else:
-                    other += act_p
-
-            # alternatives
-            for alt in (getattr(entry, "top_logprobs", []) or []):
-                tok = getattr(alt, "token", "")
-                logp = getattr(alt, "logprob", None)
-                if logp is None:
-                    continue
-                p = math.exp(float(logp))
-                letter = _token_to_letter(tok)
-                if letter in LETTER_SET:
-                    letters[letter] += p
-                else:
-                    other += p
-
-            return letters, other
-
-        def normalize_letters(letters: Dict[str, float], other: float) -> Dict[str, float]:
-            """
-            Apply normalization according to NORM_SCOPE.
-            - letters: raw letter masses
-            - other  : raw non-letter mass
-            """
-            scope = self._norm_scope()
-            out = {k: 0.0 for k in LETTER_SET}
-            sum_letters = sum(letters.values())
-
-            if scope == "letters":
-                # Normalize within letters only
-                if sum_letters > 0:
-                    for k, v in letters.items():
-                        out[k] = v / sum_letters
-            else:
-                # "all": include non-letter mass in the denominator
-                denom = sum_letters + other
-                if denom > 0:
-                    # We keep the mass share of letters vs all tokens
-                    # so the sum over A/B/C/D is <= 1.0
-                    for k, v in letters.items():
-                        out[k] = v / denom
-            return out
-
-        got_letter_probs = False
-        if token_entries:
-            mode = self._conf_mode()
-
-            # helper that tries one entry
-            def try_entry(ent) -> Optional[Dict[str, float]]:
-                letters, other = collect_distribution(ent)
-                # must be a token that actually involves a letter if first_letter mode
-                if self._conf_mode() == "first_letter":
-                    if _token_to_letter(getattr(ent, "token", "")) not in LETTER_SET:
-                        return None
-                dist = normalize_letters(letters, other)
-                if sum(dist.values()) > 0:
-                    return dist
+        if n > 1:
+            # only multi-sample requests carry `n`, so single-sample cache keys are unchanged
+            kwargs["n"] = int(n)
+        return kwargs
+
+    # ---- response cache ----
+    def _cache_key(self, kwargs: dict, sample_key: Optional[str] = None) -> Optional[str]:
+        if self.cache is None:
+            return None
+        if kwargs.get("temperature", 0.0) > 0:
+            # a stochastic draw is reusable only for the same (question, round)
+            if sample_key is None:
                 return None
+            return request_digest(kwargs, sample=sample_key)
+        return request_digest(kwargs)
+
+    def _cache_get(self, key: Optional[str]):
+        if key is None:
+            return None
+        payload = self.cache.get(key)
+        return ChatCompletion.model_validate(payload) if payload is not None else None
+
+    def _cache_put(self, key: Optional[str], resp) -> None:
+        if key is not None:
+            self.cache.put(key, resp.model_dump(mode="json"))
+
+    def _create(self, kwargs: dict, sample_key: Optional[str] = None):
+        """Cached request; returns (response, call meta)."""
+        key = self._cache_key(kwargs, sample_key)
+        start = time.perf_counter()
+        resp = self._cache_get(key)
+        hit, retries, waited = resp is not None, 0, 0.0
+        if not hit:
+            self._count_sent(kwargs)
+            resp, retries, waited = self.transport.call_sync(lambda: self.client.chat.completions.create(**kwargs))
+            self._cache_put(key, resp)
+        return resp, call_meta(resp, time.perf_counter() - start - waited, hit, retries, waited)
+
+    async def _acreate(self, kwargs: dict, sample_key: Optional[str] = None):
+        """Async variant of `_create` backed by `AsyncOpenAI`."""
+        key = self._cache_key(kwargs, sample_key)
+        start = time.perf_counter()
+        resp = self._cache_get(key)
+        hit, retries, waited = resp is not None, 0, 0.0
+        if not hit:
+            if self._aclient is None:
+                self._aclient = AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"), max_retries=0,
+                                            timeout=self._timeout())
+            aclient = self._aclient
+            self._count_sent(kwargs)
+            resp, retries, waited = await self.transport.call(lambda: aclient.chat.completions.create(**kwargs))
+            self._cache_put(key, resp)
+        return resp, call_meta(resp, time.perf_counter() - start - waited, hit, retries, waited)
+
+    def _count_sent(self, kwargs: dict) -> None:
+        total, image = _payload_bytes(kwargs)
+        self._sent["requests"] += 1
+        self._sent["request_bytes"] += total
+        self._sent["image_bytes"] += image
+
+    def payload_stats(self) -> Dict[str, int]:
+        """Bytes sent by this client (once per request, retries not repeated)."""
+        return dict(self._sent)
+
+    # ---- response parsing ----
+    def _parse_response(self, resp, index: int = 0) -> ScoreResult:
+        return parse_choice(resp.choices[index], self._conf_mode(), self._norm_scope(), self._top_logk())
+
+    def batch_request(self, prompt: str, image_path: Optional[str] = None, n: int = 1) -> dict:
+        """Request body `score_mcq` / `score_mcq_samples` would send, for Batch API input files."""
+        return self._request_kwargs(self._build_messages(prompt, image_path), n=n)
 
-            if mode == "first_raw":
-                # Try the very first generated token
-                dist = try_entry(token_entries[0])
-                if dist is not None:
-                    probs.update(dist)
-                    got_letter_probs = True
-                # If not useful, fall back to first token that actually contains a letter
-                if not got_letter_probs:
-                    for ent in token_entries:
-                        if _token_to_letter(getattr(ent, "token", "")) in LETTER_SET:
-                            dist = try_entry(ent)
-                            if dist is not None:
-                                probs.update(dist)
-                                got_letter_probs = True
-                                break
-            else:
-                # first_letter: scan for the first token that contains A/B/C/D
-                for ent in token_entries:
-                    if _token_to_letter(getattr(ent, "token", "")) in LETTER_SET:
-                        dist = try_entry(ent)
-                        if dist is not None:
-                            probs.update(dist)
-                            got_letter_probs = True
-                            break
-
-        # Choose final letter
-        if got_letter_probs and sum(probs.values()) > 0:
-            chosen = max(probs, key=probs.get)
-        else:
-            parsed = _norm_letter(text_out)
-            chosen = parsed or "A"
-            # fallback: one-hot
-            probs = {k: (1.0 if k == chosen else 0.0) for k in probs}
+    # ---- main ----
+    def score_mcq(
+        self,
+        prompt: str,
+        options: Dict[str, str],
+        image_path: Optional[str] = None,
+        sample_key: Optional[str] = None,
+    ) -> ScoreResult:
+        kwargs = self._request_kwargs(self._build_messages(prompt, image_path))
+        resp, cm = self._create(kwargs, sample_key)
+        sr = self._parse_response(resp)
+        sr.meta.update(cm)
+        return sr
 
-        # Return (runner.py does not require question_id here)
-        return ScoreResult(question_id="", chosen=chosen, probs=probs)
\ No newline at end of file
+    async def ascore_mcq(
+        self,
+        prompt: str,
+        options: Dict[str, str],
+        image_path: Optional[str] = None,
+        sample_key: Optional[str] = None,
+    ) -> ScoreResult:
+        """Async variant of `score_mcq` backed by `AsyncOpenAI` (same request, same parsing)."""
+        kwargs = self._request_kwargs(self._build_messages(prompt, image_path))
+        resp, cm = await self._acreate(kwargs, sample_key)
+        sr = self._parse_response(resp)
+        sr.meta.update(cm)
+        return sr
+
+    def _sample_results(self, resp, n: int, cm: dict) -> List[ScoreResult]:
+        if len(resp.choices) != n:
+            raise RuntimeError(f"requested n={n} choices, got {len(resp.choices)}")
+        return parse_choices(resp, cm, self._conf_mode(), self._norm_scope(), self._top_logk())
+
+    def score_mcq_samples(
+        self,
+        prompt: str,
+        options: Dict[str, str],
+        n: int,
+        image_path: Optional[str] = None,
+        sample_key: Optional[str] = None,
+    ) -> List[ScoreResult]:
+        """
+        One request with `n` choices; each choice is parsed exactly like a
+        single-sample response, so the results are interchangeable with `n`
+        separate `score_mcq` calls (sampling noise aside).
+        """
+        if n <= 1:
+            return [self.score_mcq(prompt, options, image_path=image_path, sample_key=sample_key)]
+        kwargs = self._request_kwargs(self._build_messages(prompt, image_path), n=n)
+        resp, cm = self._create(kwargs, sample_key)
+        return self._sample_results(resp, n, cm)
+
+    async def ascore_mcq_samples(
+        self,
+        prompt: str,
+        options: Dict[str, str],
+        n: int,
+        image_path: Optional[str] = None,
+        sample_key: Optional[str] = None,
+    ) -> List[ScoreResult]:
+        """Async variant of `score_mcq_samples` backed by `AsyncOpenAI`."""
+        if n <= 1:
+            return [await self.ascore_mcq(prompt, options, image_path=image_path, sample_key=sample_key)]
+        kwargs = self._request_kwargs(self._build_messages(prompt, image_path), n=n)
+        resp, cm = await self._acreate(kwargs, sample_key)
+        return self._sample_results(resp, n, cm)
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client (it is bound to the event loop that created it)."""
+        if self._aclient is not None:
+            await self._aclient.close()
+            self._aclient = None
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, Sequence
+
+import numpy as np
+
+
+__all__ = [
+    "permutation_table",
+    "identity_table",
+    "permuted_options",
+    "inverse_permutation",
+    "unpermute_probs",
+]
+
+
+LETTER_SET = ("A", "B", "C", "D")
+
+
+def _present(options: Dict[str, Any]) -> list:
+    return [k for k, L in enumerate(LETTER_SET) if L in options]
+
+
+def permutation_table(options_list: Sequence[Dict[str, Any]], seeds: np.ndarray) -> np.ndarray:
+    """
+    Option permutations for every (question, round) pair.
+
+    Returns an int8 array `o2p` of shape (n_items, rounds, 4) where
+    `o2p[i, r, L]` is the displayed letter index of original letter L
+    (-1 when the option is absent). Each row is exactly what
+    `random.Random(seeds[i, r]).shuffle` produces on the present letters, so
+    runs reproduce the historical per-item permutations bit-for-bit; a single
+    generator is re-seeded per pair instead of building one per call.
+    """
+    n, rounds = seeds.shape
+    rows = []
+    rng = random.Random()
+    for options, item_seeds in zip(options_list, seeds.tolist()):
+        present = _present(options)
+        for seed in item_seeds:
+            perm = present[:]
+            rng.seed(seed)
+            rng.shuffle(perm)
+            row = [-1, -1, -1, -1]
+            for k, p in zip(present, perm):
+                row[k] = p
+            rows.append(row)
+    return np.array(rows, dtype=np.int8).reshape(n, rounds, 4)
+
+
+def identity_table(options_list: Sequence[Dict[str, Any]], rounds: int) -> np.ndarray:
+    """(n_items, rounds, 4) int8 table that keeps every option in place (PERMUTE=0)."""
+    out = np.full((len(options_list), rounds, 4), -1, dtype=np.int8)
+    for i, options in enumerate(options_list):
+        present = _present(options)
+        out[i][:, present] = present
+    return out
+
+
+def permuted_options(options: Dict[str, Any], o2p: np.ndarray) -> Dict[str, Any]:
+    """Displayed options (letter -> text) for one permutation row."""
+    return {LETTER_SET[p]: options[LETTER_SET[k]] for k, p in enumerate(o2p.tolist()) if p >= 0}
+
+
+def inverse_permutation(o2p: np.ndarray) -> np.ndarray:
+    """
+    Displayed -> original letter indices for an (N, 4) `o2p` block.
+    Displayed letters outside the permutation map to themselves.
+    """
+    o2p = np.asarray(o2p, dtype=np.int64)
+    p2o = np.tile(np.arange(4), (len(o2p), 1))
+    r_idx, o_idx = np.nonzero(o2p >= 0)
+    p2o[r_idx, o2p[r_idx, o_idx]] = o_idx
+    return p2o
+
+
+def unpermute_probs(probs_perm: np.ndarray, o2p: np.ndarray) -> np.ndarray:
+    """Map an (N, 4) displayed-space probability matrix to original letters with one gather."""
+    o2p = np.asarray(o2p, dtype=np.int64)
+    gathered = np.take_along_axis(np.asarray(probs_perm, dtype=float), np.clip(o2p, 0, 3), axis=1)
+    return np.where(o2p >= 0, gathered, np.nan)
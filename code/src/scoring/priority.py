@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+__all__ = ["MACHINE_TAGS", "load_priority_sources", "item_priority", "priority_order"]
+
+
+# machine tags of tag_model_only.py, in a fixed order
+MACHINE_TAGS = ("简单M", "中等M", "困难M")
+# human proxy label -> the machine tag that counts as "aligned"
+PROXY_TO_TAG = {"简单H_proxy": "简单M", "中等H_proxy": "中等M", "困难H_proxy": "困难M"}
+
+
+def _qid_col(df: pd.DataFrame) -> str:
+    for c in ("qid", "question_id"):
+        if c in df.columns:
+            return c
+    raise ValueError(f"priority source needs a qid / question_id column, got {list(df.columns)}")
+
+
+def _soft_tags(p_chosen: np.ndarray, correct: np.ndarray, tau: float, band: float) -> np.ndarray:
+    """
+    (N, 3) soft version of `tag_model_only.tag_row`: the hard p >= tau test is
+    replaced by a logistic of width `band`, so rows near tau split their mass.
+    """
+    p = np.nan_to_num(np.asarray(p_chosen, dtype=float), nan=0.0)
+    c = np.nan_to_num(np.asarray(correct, dtype=float), nan=0.0)
+    hi = 1.0 / (1.0 + np.exp(-(p - tau) / max(band, 1e-9)))
+    return np.stack([hi * c, 1.0 - hi, hi * (1.0 - c)], axis=1)
+
+
+def load_priority_sources(
+    paths: Sequence[str], tau: float = 0.8, band: float = 0.05,
+) -> tuple[pd.DataFrame, Optional[pd.Series]]:
+    """
+    Read priority sources and return (machine tag evidence, human proxy labels).
+
+    Each CSV is sniffed by its columns:
+
+        scores.csv (p_chosen, correct; long format allowed) : one soft tag per row
+        model tags (M_tau, e.g. tag_model_only.py output)   : one hard tag per row
+        proxy labels (H_proxy)                              : human side of the alignment label
+
+    The evidence frame has one row per (source row) with columns qid and the
+    three MACHINE_TAGS weights; rounds, models and files simply add rows.
+    """
+    evidence, labels = [], []
+    for path in paths:
+        df = pd.read_csv(path)
+        q = _qid_col(df)
+        qid = df[q].astype(str).to_numpy()
+        if "M_tau" in df.columns:
+            tags = df["M_tau"].astype(str).to_numpy()
+            w = np.stack([(tags == t).astype(float) for t in MACHINE_TAGS], axis=1)
+        elif {"p_chosen", "correct"}.issubset(df.columns):
+            w = _soft_tags(df["p_chosen"].to_numpy(), df["correct"].to_numpy(), tau, band)
+        elif "H_proxy" in df.columns:
+            labels.append(pd.Series(df["H_proxy"].astype(str).to_numpy(), index=qid))
+            continue
+        else:
+            raise ValueError(f"{path}: expected M_tau, p_chosen+correct or H_proxy columns")
+        evidence.append(pd.DataFrame(w, columns=list(MACHINE_TAGS)).assign(qid=qid))
+    ev = (pd.concat(evidence, ignore_index=True) if evidence
+          else pd.DataFrame(columns=["qid", *MACHINE_TAGS]))
+    lab = pd.concat(labels) if labels else None
+    if lab is not None:
+        lab = lab[~lab.index.duplicated(keep="last")]
+    return ev, lab
+
+
+def _entropy(p: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(p > 0, -p * np.log2(p), 0.0)
+    return t.sum(axis=1)
+
+
+def item_priority(qids: Iterable, evidence: pd.DataFrame, labels: Optional[pd.Series] = None) -> np.ndarray:
+    """
+    Expected information gain per item, in [0, 1].
+
+    The machine tag distribution q of an item pools all its evidence rows
+    (rounds, models, files), so items near tau and items on which models
+    disagree both get a spread-out q. Without proxy labels the priority is the
+    entropy of q (normalized by log2 3). With a proxy label the quantity of
+    interest is the human-machine alignment label, so the priority is the binary
+    entropy of P(aligned) = q[tag matching the label]. Items with no evidence get
+    the maximum priority: nothing is known about them yet.
+    """
+    keys = [str(q) for q in qids]
+    out = np.ones(len(keys))
+    if len(evidence):
+        q = evidence.groupby("qid")[list(MACHINE_TAGS)].sum()
+        q = q.div(q.sum(axis=1).where(lambda s: s > 0, 1.0), axis=0)
+        q = q.reindex(keys)
+        has = q.notna().all(axis=1).to_numpy()
+        qv = q.to_numpy(dtype=float)
+        pri = _entropy(np.nan_to_num(qv)) / np.log2(len(MACHINE_TAGS))
+        if labels is not None:
+            lab = labels.reindex(keys).map(PROXY_TO_TAG)
+            idx = lab.map({t: i for i, t in enumerate(MACHINE_TAGS)})
+            has_lab = idx.notna().to_numpy()
+            a = np.zeros(len(keys))
+            a[has_lab] = np.nan_to_num(qv[has_lab, idx[has_lab].astype(int).to_numpy()])
+            binary = _entropy(np.stack([a, 1.0 - a], axis=1))
+            pri = np.where(has_lab, binary, pri)
+        out = np.where(has, pri, 1.0)
+    return out
+
+
+def priority_order(priority: np.ndarray) -> np.ndarray:
+    """Item indices by descending priority; ties keep dataset order."""
+    return np.argsort(-np.asarray(priority), kind="stable")
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional
+
+
+__all__ = ["register_client", "make_client", "available_clients"]
+
+
+# factory(arg, cache) -> client; `arg` is the text after "<prefix>:" (None when absent)
+ClientFactory = Callable[[Optional[str], Any], Any]
+
+
+def _dummy(arg: Optional[str], cache=None):
+    from src.scoring.dummy_client import DummyClient
+    return DummyClient()
+
+
+def _openai(arg: Optional[str], cache=None):
+    # the openai SDK is only imported when an openai:* model is actually requested
+    from src.scoring.openai_client_stub import OpenAIClient
+    return OpenAIClient(model=arg or "gpt-4o", cache=cache)
+
+
+def _hf(arg: Optional[str], cache=None):
+    # torch / transformers are only needed for local encoder scoring
+    if not arg:
+        raise NotImplementedError("hf scorer needs a model name: hf:<name-or-path>")
+    from src.scoring.hf_client import HFMultipleChoiceClient
+    return HFMultipleChoiceClient(arg)
+
+
+_REGISTRY: Dict[str, ClientFactory] = {
+    "dummy": _dummy,
+    "openai": _openai,
+    "hf": _hf,
+}
+
+
+def register_client(prefix: str, factory: ClientFactory) -> None:
+    """Make `<prefix>` / `<prefix>:<arg>` resolvable by `make_client`; import heavy backends inside `factory`."""
+    _REGISTRY[prefix] = factory
+
+
+def available_clients() -> List[str]:
+    return sorted(_REGISTRY)
+
+
+def make_client(name: str, cache=None):
+    """
+    Build a scoring client from a CLI model name such as `dummy`,
+    `openai:gpt-4o` or `hf:roberta-large`.
+
+    Backends are imported only when resolved, so commands that never score
+    (datamap, calibrate, ...) do not pay for (or require) the openai SDK or torch.
+    """
+    prefix, sep, arg = name.partition(":")
+    factory = _REGISTRY.get(prefix)
+    if factory is None:
+        raise NotImplementedError(f"unknown model: {name} (known: {', '.join(available_clients())})")
+    return factory(arg if sep else None, cache)
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+__all__ = [
+    "ItemSchema",
+    "PreparedItems",
+    "infer_schema",
+    "prepare_items",
+    "round_seed",
+    "norm_letter",
+    "extract_gold_letter",
+]
+
+
+LETTER_SET = ("A", "B", "C", "D")
+LETTER_IDX = {L: i for i, L in enumerate(LETTER_SET)}
+
+# candidate gold fields, in priority order
+GOLD_LETTER_KEYS = (
+    "answer", "correct_letter", "CorrectLetter", "correctLetter",
+    "CorrectAnswer", "correct_answer", "AnswerValue", "gold", "gold_letter",
+    "label", "target", "solution", "gt",
+)
+GOLD_INDEX_KEYS = (
+    "answer_idx", "answer_index", "correct_idx", "correct_index",
+    "CorrectIndex", "index", "gold_idx", "gold_index",
+)
+GOLD_TEXT_KEYS = ("correct_text", "correct_answer_text", "CorrectAnswerText", "gold_text")
+QID_KEYS = ("id", "question_id")
+QUESTION_KEYS = ("question", "stem")
+_ALL_GOLD_KEYS = frozenset(GOLD_LETTER_KEYS + GOLD_INDEX_KEYS + GOLD_TEXT_KEYS)
+
+
+def norm_letter(x: object) -> str | None:
+    """Normalize an answer hint into A/B/C/D if possible."""
+    if x is None:
+        return None
+    s = str(x).strip().upper()
+
+    # 1) Direct letter first (A/B/C/D anywhere)
+    m = re.search(r"\b([ABCD])\b", s)
+    if m:
+        return m.group(1)
+
+    # 2) Common patterns like "Answer: C" / "Option B"
+    m = re.search(r"(ANSWER|OPTION)[^A-Z0-9]*([ABCD])\b", s)
+    if m:
+        return m.group(2)
+
+    # 3) Map digits to letters (1-4 => A-D)
+    m = re.search(r"\b([1-4])\b", s)
+    if m:
+        return "ABCD"[int(m.group(1)) - 1]
+
+    # 4) Also tolerate zero-based (0-3 => A-D)
+    m = re.search(r"\b([0-3])\b", s)
+    if m:
+        return "ABCD"[int(m.group(1))]
+
+    return None
+
+
+def _map_digit(v: str) -> str | None:
+    m = re.fullmatch(r"\s*([1-4])\s*", v)
+    if m:  # 1-4 -> A-D
+        return "ABCD"[int(m.group(1)) - 1]
+    m = re.fullmatch(r"\s*([0-3])\s*", v)
+    if m:  # 0-3 -> A-D
+        return "ABCD"[int(m.group(1))]
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _letter_from_value(s: str) -> str | None:
+    # gold columns take a handful of distinct values, so the regexes run once per value
+    L = norm_letter(s)
+    if L in LETTER_SET:
+        return L
+    L = _map_digit(s)
+    return L if L in LETTER_SET else None
+
+
+@lru_cache(maxsize=4096)
+def _letter_from_index(s: str) -> str | None:
+    L = _map_digit(s)
+    return L if L in LETTER_SET else None
+
+
+def _gold_from_keys(ex: dict, options_orig: dict, letter_keys, index_keys, text_keys) -> str | None:
+    # 1) common letter-like fields
+    for k in letter_keys:
+        if k in ex and ex[k] is not None:
+            L = _letter_from_value(str(ex[k]).strip())
+            if L is not None:
+                return L
+
+    # 2) index-like fields (1-4 or 0-3)
+    for k in index_keys:
+        if k in ex and ex[k] is not None:
+            L = _letter_from_index(str(ex[k]).strip())
+            if L is not None:
+                return L
+
+    # 3) match by text if a correct answer text is present
+    for k in text_keys:
+        if k in ex and ex[k]:
+            txt = str(ex[k]).strip()
+            if txt:
+                for L, opt in options_orig.items():
+                    if str(opt).strip() == txt:
+                        return L
+    return None
+
+
+def extract_gold_letter(ex: dict, options_orig: dict) -> str | None:
+    """
+    Robustly extract the correct option as A/B/C/D from various schemas.
+    - Supports letter fields (A-D)
+    - Supports digit fields (1-4 and 0-3)
+    - Falls back to matching correct answer text against options
+    """
+    return _gold_from_keys(ex, options_orig, GOLD_LETTER_KEYS, GOLD_INDEX_KEYS, GOLD_TEXT_KEYS)
+
+
+def round_seed(qid: Any, r: int) -> int:
+    """Deterministic per-(question, round) permutation seed: sha256("<qid>-<round>") mod 2**32."""
+    return int(hashlib.sha256(f"{qid}-{r}".encode()).hexdigest(), 16) % (2**32)
+
+
+@dataclass(frozen=True)
+class ItemSchema:
+    """
+    Field layout of a question dataset, resolved once from its first records.
+
+    Attributes
+    ----------
+    gold_letter_keys, gold_index_keys, gold_text_keys : tuple of str
+        Candidate gold fields that actually occur in the dataset, in the same
+        priority order `extract_gold_letter` probes them.
+    options_key : Optional[str]
+        "options" when options come as a dict, None when they are spread over
+        A/B/C/D fields.
+    """
+    gold_letter_keys: Tuple[str, ...]
+    gold_index_keys: Tuple[str, ...]
+    gold_text_keys: Tuple[str, ...]
+    options_key: Optional[str]
+
+    @property
+    def gold_keys(self) -> frozenset:
+        return frozenset(self.gold_letter_keys + self.gold_index_keys + self.gold_text_keys)
+
+
+def infer_schema(records: Sequence[dict], n_probe: int = 1000) -> ItemSchema:
+    """Resolve which candidate fields a dataset uses by inspecting its first `n_probe` records."""
+    seen = set()
+    for ex in records[:n_probe]:
+        seen.update(ex.keys())
+    return ItemSchema(
+        gold_letter_keys=tuple(k for k in GOLD_LETTER_KEYS if k in seen),
+        gold_index_keys=tuple(k for k in GOLD_INDEX_KEYS if k in seen),
+        gold_text_keys=tuple(k for k in GOLD_TEXT_KEYS if k in seen),
+        options_key="options" if "options" in seen else None,
+    )
+
+
+@dataclass
+class PreparedItems:
+    """
+    Per-question fields resolved once before scoring.
+
+    Attributes
+    ----------
+    qids : list
+        Question ids as they appear in the data (`id`, else `question_id`, else "").
+    passages, questions, image_paths : list
+        Prompt inputs per question.
+    options : list of dict
+        Original (unpermuted) options, letter -> text.
+    gold : np.ndarray
+        (n_items,) int8 gold letter index, -1 when no gold could be resolved.
+    seeds : np.ndarray
+        (n_items, rounds) uint32 permutation seeds, see `round_seed`.
+    """
+    qids: List[Any]
+    passages: List[Any]
+    questions: List[str]
+    options: List[Dict[str, Any]]
+    image_paths: List[Optional[str]]
+    gold: np.ndarray
+    seeds: np.ndarray
+    schema: ItemSchema
+    n_fallback: int = 0
+    _pos: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.qids)
+
+    def gold_letter(self, i: int) -> str | None:
+        g = int(self.gold[i])
+        return LETTER_SET[g] if g >= 0 else None
+
+    def position(self) -> Dict[str, int]:
+        """str(qid) -> first index, used to restore the deterministic output order."""
+        if not self._pos:
+            for i, q in enumerate(self.qids):
+                self._pos.setdefault(str(q), i)
+        return self._pos
+
+
+def prepare_items(records: Sequence[dict], rounds: int, schema: Optional[ItemSchema] = None) -> PreparedItems:
+    """
+    Resolve qid / prompt fields / options / gold for every record and precompute
+    the (n_items, rounds) seed table, so the scoring loop only formats prompts.
+
+    Records carrying a gold field outside the probed schema fall back to the full
+    `extract_gold_letter` scan (counted in `n_fallback`), so the result always
+    matches the per-record resolution.
+    """
+    schema = schema or infer_schema(records)
+    known = schema.gold_keys
+    n = len(records)
+    qids, passages, questions, options_l, images = [], [], [], [], []
+    gold = np.full(n, -1, dtype=np.int8)
+    n_fallback = 0
+
+    for i, ex in enumerate(records):
+        # options may appear as dict or A/B/C/D fields; fall back to letters if missing
+        options = ex.get("options")
+        if options is None:
+            cand = {L: ex.get(L) for L in LETTER_SET if ex.get(L) is not None}
+            options = cand if cand else {"A": "A", "B": "B", "C": "C", "D": "D"}
+        options = dict(options)
+
+        if _ALL_GOLD_KEYS.intersection(ex.keys()) <= known:
+            g = _gold_from_keys(ex, options, schema.gold_letter_keys,
+                                schema.gold_index_keys, schema.gold_text_keys)
+        else:
+            n_fallback += 1
+            g = extract_gold_letter(ex, options)
+
+        qids.append(ex.get("id") or ex.get("question_id") or "")
+        passages.append(ex.get("passage", None))
+        questions.append(ex.get("question") or ex.get("stem") or "")
+        options_l.append(options)
+        images.append(ex.get("image_path"))
+        gold[i] = LETTER_IDX.get(g, -1)
+
+    seeds = np.array([[round_seed(q, r) for r in range(rounds)] for q in qids],
+                     dtype=np.uint32).reshape(n, rounds)
+    return PreparedItems(
+        qids=qids, passages=passages, questions=questions, options=options_l,
+        image_paths=images, gold=gold, seeds=seeds, schema=schema, n_fallback=n_fallback,
+    )
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.scoring.permute import inverse_permutation, unpermute_probs
+
+
+__all__ = ["ctx_arrays", "scores_frame"]
+
+
+LETTER_SET = ("A", "B", "C", "D")
+LETTER_IDX = {L: i for i, L in enumerate(LETTER_SET)}
+
+
+def ctx_arrays(ctxs) -> tuple[np.ndarray, np.ndarray]:
+    """Gold letter indices (N,) and original -> displayed letter indices (N, 4) from job contexts."""
+    gold = np.array([LETTER_IDX.get(c["gold"], -1) for c in ctxs], dtype=np.int64).reshape(-1)
+    o2p = np.stack([c["perm"] for c in ctxs]).astype(np.int64) if ctxs else np.zeros((0, 4), np.int64)
+    return gold, o2p
+
+
+def scores_frame(question_id, run_id, gold, o2p, probs_perm, chosen_perm) -> pd.DataFrame:
+    """
+    Vectorized counterpart of `src.cli.score._make_record` for a whole run.
+
+    gold / chosen_perm are letter indices (-1 = unknown); o2p[i, L] is the displayed
+    index of original letter L (-1 = option absent). probs_perm is (N, 4) in
+    displayed space and is un-permuted with a single gather.
+    """
+    n = len(question_id)
+    rows = np.arange(n)
+    letters = np.array(LETTER_SET, dtype=object)
+
+    probs_orig = unpermute_probs(probs_perm, o2p)
+
+    # displayed -> original letter; letters outside the permutation map to themselves
+    p2o = inverse_permutation(o2p)
+    chosen = np.where(chosen_perm >= 0, p2o[rows, np.clip(chosen_perm, 0, 3)], -1)
+
+    has_gold, has_choice = gold >= 0, chosen >= 0
+    p_correct = np.where(has_gold, probs_orig[rows, np.clip(gold, 0, 3)], np.nan)
+    p_chosen = np.where(has_choice, probs_orig[rows, np.clip(chosen, 0, 3)], np.nan)
+    correct = np.where(has_gold & has_choice, (chosen == gold).astype(float), np.nan)
+
+    df = pd.DataFrame({
+        "question_id": question_id,
+        "run_id": run_id,
+        "correct_letter": np.where(has_gold, letters[np.clip(gold, 0, 3)], None),
+        "chosen": np.where(has_choice, letters[np.clip(chosen, 0, 3)], None),
+        "p_correct": p_correct,
+        "p_chosen": p_chosen,
+        "correct": correct,
+        "p_A": probs_orig[:, 0],
+        "p_B": probs_orig[:, 1],
+        "p_C": probs_orig[:, 2],
+        "p_D": probs_orig[:, 3],
+    })
+    if not np.isnan(correct).any():
+        df["correct"] = correct.astype(int)
+    return df
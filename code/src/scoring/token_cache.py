@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+
+__all__ = ["TokenCache", "tokenizer_fingerprint"]
+
+
+def tokenizer_fingerprint(tokenizer) -> str:
+    """
+    Hash of everything that determines token ids: the fast tokenizer's serialized
+    pipeline (vocab, merges, normalizer, post-processor) when available, else the
+    vocab. Tokenizers that are byte-identical (e.g. roberta-large and
+    distilroberta-base) share a fingerprint and therefore a cache.
+    """
+    backend = getattr(tokenizer, "backend_tokenizer", None)
+    if backend is not None:
+        blob = backend.to_str()
+    else:
+        blob = json.dumps(sorted(tokenizer.get_vocab().items()), ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def _pair_key(first: str, second: str) -> bytes:
+    return hashlib.sha1(f"{first}\x1f{second}".encode("utf-8")).digest()[:16]
+
+
+class TokenCache:
+    """
+    Content-addressed, memory-mapped store of tokenized (first, second) text pairs.
+
+    One store lives under `<root>/<fingerprint>-L<max_len>/` and holds, for every
+    pair ever tokenized with that tokenizer and truncation length:
+
+        <field>.i32   : flat int32 token arrays (input_ids, attention_mask, ...)
+        offsets.i64   : row start offsets (n_rows + 1)
+        keys.bin      : 16-byte pair digests, one per row
+        meta.json     : tokenizer name / fingerprint, max_len and field names
+
+    Lookups hit the memory-mapped arrays; only unseen pairs are tokenized (in one
+    call) and appended. Because rows are keyed by pair content rather than by
+    position, permuted rounds, repeated runs and models sharing a tokenizer all
+    reuse the same rows. Assumes a single writer per store.
+    """
+
+    KEY_BYTES = 16
+
+    def __init__(self, root: str, tokenizer, max_len: int) -> None:
+        self.tokenizer = tokenizer
+        self.max_len = int(max_len)
+        self.fingerprint = tokenizer_fingerprint(tokenizer)
+        self.dir = os.path.join(root, f"{self.fingerprint}-L{self.max_len}")
+        os.makedirs(self.dir, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+        meta_path = os.path.join(self.dir, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                self.fields: List[str] = json.load(f)["fields"]
+        else:
+            self.fields = []
+        self._load()
+
+    # ---- storage ----
+    def _path(self, name: str) -> str:
+        return os.path.join(self.dir, name)
+
+    def _load(self) -> None:
+        off_path, key_path = self._path("offsets.i64"), self._path("keys.bin")
+        offsets = np.fromfile(off_path, dtype=np.int64) if os.path.exists(off_path) else np.zeros(1, np.int64)
+        keys = (np.fromfile(key_path, dtype=np.uint8) if os.path.exists(key_path) else np.zeros(0, np.uint8))
+        keys = keys[: len(keys) // self.KEY_BYTES * self.KEY_BYTES].reshape(-1, self.KEY_BYTES)
+        # a crash mid-append leaves extra data bytes or offsets; trust only complete rows
+        n = min(len(keys), len(offsets) - 1)
+        self._offsets = offsets[: n + 1]
+        self._index: Dict[bytes, int] = {k.tobytes(): i for i, k in enumerate(keys[:n])}
+        total = int(self._offsets[-1])
+        self._arrays = {
+            f: (np.memmap(self._path(f"{f}.i32"), dtype=np.int32, mode="r", shape=(total,))
+                if total else np.zeros(0, np.int32))
+            for f in self.fields
+        }
+
+    def _truncate_to_index(self) -> None:
+        """Drop bytes past the last complete row (left behind by an interrupted append)."""
+        n = len(self._offsets) - 1
+        sizes = {"offsets.i64": (n + 1) * 8, "keys.bin": n * self.KEY_BYTES}
+        sizes.update({f"{f}.i32": int(self._offsets[-1]) * 4 for f in self.fields})
+        for name, size in sizes.items():
+            path = self._path(name)
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                with open(path, "rb+") as f:
+                    f.truncate(size)
+
+    def _append(self, keys: List[bytes], enc: dict) -> None:
+        if not self.fields:
+            self.fields = list(enc.keys())
+            with open(self._path("meta.json"), "w", encoding="utf-8") as f:
+                json.dump({
+                    "tokenizer": getattr(self.tokenizer, "name_or_path", ""),
+                    "fingerprint": self.fingerprint,
+                    "max_len": self.max_len,
+                    "fields": self.fields,
+                }, f, indent=2)
+        self._arrays = {}  # release the maps before touching the files
+        self._truncate_to_index()
+
+        lengths = np.array([len(x) for x in enc[self.fields[0]]], dtype=np.int64)
+        # data first, then offsets, then keys: a row only exists once its key is written
+        for fld in self.fields:
+            flat = np.fromiter((t for row in enc[fld] for t in row), dtype=np.int32, count=int(lengths.sum()))
+            with open(self._path(f"{fld}.i32"), "ab") as f:
+                flat.tofile(f)
+        off_path = self._path("offsets.i64")
+        fresh = not os.path.exists(off_path) or os.path.getsize(off_path) == 0
+        with open(off_path, "ab") as f:
+            if fresh:
+                np.zeros(1, np.int64).tofile(f)
+            (self._offsets[-1] + np.cumsum(lengths)).tofile(f)
+        with open(self._path("keys.bin"), "ab") as f:
+            f.write(b"".join(keys))
+        self._load()
+
+    # ---- lookup ----
+    def encode_pairs(self, firsts: Sequence[str], seconds: Sequence[str]) -> Dict[str, List[np.ndarray]]:
+        """
+        Return tokenizer-style output (field -> list of unpadded int32 arrays) for
+        each (first, second) pair, tokenizing only pairs not already stored.
+        """
+        keys = [_pair_key(a, b) for a, b in zip(firsts, seconds)]
+        missing: Dict[bytes, int] = {}
+        for i, k in enumerate(keys):
+            if k not in self._index and k not in missing:
+                missing[k] = i
+        self.misses += len(missing)
+        self.hits += len(keys) - len(missing)
+
+        if missing:
+            idx = list(missing.values())
+            enc = self.tokenizer(
+                [firsts[i] for i in idx], [seconds[i] for i in idx],
+                truncation=True, max_length=self.max_len, padding=False,
+            )
+            self._append(list(missing.keys()), dict(enc))
+
+        rows = [self._index[k] for k in keys]
+        starts, ends = self._offsets[:-1], self._offsets[1:]
+        return {
+            f: [self._arrays[f][starts[r]:ends[r]] for r in rows]
+            for f in self.fields
+        }
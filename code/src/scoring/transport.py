@@ -0,0 +1,410 @@
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+__all__ = [
+    "TransportConfig",
+    "TransportError",
+    "AIMDLimiter",
+    "CircuitBreaker",
+    "Transport",
+    "transport_for",
+    "transport_stats",
+    "classify_error",
+]
+
+
+# statuses worth retrying; 429 / 503 also mean "slow down" to the concurrency limiter
+RETRY_STATUS = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+OVERLOAD_STATUS = frozenset({429, 503})
+
+
+class TransportError(RuntimeError):
+    """
+    A remote call that failed for good: retries exhausted or a non-retryable
+    error. `attempts` counts every try; `cause` is the last underlying error.
+    Callers that keep the run alive (dead-letter file) catch exactly this type.
+    """
+
+    def __init__(self, message: str, attempts: int, cause: Optional[BaseException] = None) -> None:
+        super().__init__(message)
+        self.attempts = attempts
+        self.cause = cause
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    """
+    Retry / concurrency / circuit-breaker settings, read from the environment by `from_env`.
+
+        TRANSPORT_MAX_RETRIES=int   : retries per call after the first attempt (default 6)
+        TRANSPORT_BACKOFF_BASE=s    : first backoff ceiling in seconds (default 0.5)
+        TRANSPORT_BACKOFF_MAX=s     : backoff ceiling cap (default 30)
+        TRANSPORT_CONC_INIT=int     : initial per-host concurrency limit (default 8; raised to the
+                                      engine's --concurrency, see `Transport.reserve`)
+        TRANSPORT_CONC_MAX=int      : upper bound of the adaptive limit (default 256)
+        BREAKER_THRESHOLD=int       : consecutive failed attempts that open the breaker (default 5)
+        BREAKER_COOLDOWN=s          : seconds dispatch stays paused once open (default 30)
+        BREAKER_GIVE_UP=s           : after this long without a success, paused calls fail
+                                      instead of waiting (default 600)
+    """
+    max_retries: int = 6
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    conc_init: int = 8
+    conc_max: int = 256
+    breaker_threshold: int = 5
+    breaker_cooldown: float = 30.0
+    breaker_give_up: float = 600.0
+
+    @classmethod
+    def from_env(cls) -> "TransportConfig":
+        return cls(
+            max_retries=int(_env_float("TRANSPORT_MAX_RETRIES", 6)),
+            backoff_base=_env_float("TRANSPORT_BACKOFF_BASE", 0.5),
+            backoff_max=_env_float("TRANSPORT_BACKOFF_MAX", 30.0),
+            conc_init=max(1, int(_env_float("TRANSPORT_CONC_INIT", 8))),
+            conc_max=max(1, int(_env_float("TRANSPORT_CONC_MAX", 256))),
+            breaker_threshold=max(1, int(_env_float("BREAKER_THRESHOLD", 5))),
+            breaker_cooldown=_env_float("BREAKER_COOLDOWN", 30.0),
+            breaker_give_up=_env_float("BREAKER_GIVE_UP", 600.0),
+        )
+
+
+def _retry_after(headers) -> Optional[float]:
+    """Seconds requested by `retry-after-ms` / `Retry-After` (delta seconds or an HTTP date)."""
+    if not headers:
+        return None
+    ms = headers.get("retry-after-ms")
+    if ms is not None:
+        try:
+            return max(0.0, float(ms) / 1000.0)
+        except ValueError:
+            pass
+    ra = headers.get("retry-after")
+    if ra is None:
+        return None
+    try:
+        return max(0.0, float(ra))
+    except ValueError:
+        when = email.utils.parsedate_to_datetime(ra) if ra else None
+        return max(0.0, when.timestamp() - time.time()) if when is not None else None
+
+
+def classify_error(exc: BaseException) -> Tuple[bool, bool, Optional[float]]:
+    """
+    (retryable, overload, retry_after) for an exception raised by an HTTP client.
+
+    HTTP errors are recognized by a `status_code` attribute (and `response.headers`
+    for Retry-After), as on openai / httpx exceptions; timeouts and connection
+    errors without a status are retryable.
+    """
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        transient = isinstance(exc, (TimeoutError, ConnectionError)) or any(
+            k in type(exc).__name__ for k in ("Timeout", "Connection")
+        )
+        return transient, transient, None
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    status = int(status)
+    return status in RETRY_STATUS, status in OVERLOAD_STATUS, _retry_after(headers)
+
+
+class AIMDLimiter:
+    """
+    Additive-increase / multiplicative-decrease cap on in-flight calls to one host.
+
+    The limit grows by 1/limit per success while the host is saturated (all
+    slots in use), i.e. about +1 per round trip of a full window, and halves on
+    an overload signal (429 / 503 / timeout), at most once per `cooldown` so one
+    burst of rejections counts as a single congestion event.
+    """
+
+    def __init__(self, initial: int = 8, maximum: int = 256, minimum: int = 1, cooldown: float = 1.0) -> None:
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.minimum = float(minimum)
+        self.maximum = float(maximum)
+        self.cooldown = cooldown
+        self.inflight = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._cond: Optional[asyncio.Condition] = None
+        self._loop = None
+
+    def _condition(self) -> asyncio.Condition:
+        # the limiter outlives a single asyncio.run, so the condition is rebuilt per event loop
+        loop = asyncio.get_running_loop()
+        if self._cond is None or self._loop is not loop:
+            self._cond, self._loop = asyncio.Condition(), loop
+        return self._cond
+
+    async def acquire(self) -> bool:
+        """Take a slot; returns whether the host was saturated at that point."""
+        cond = self._condition()
+        async with cond:
+            while self.inflight >= int(self.limit):
+                await cond.wait()
+            self.inflight += 1
+            return self.inflight >= int(self.limit)
+
+    async def release(self) -> None:
+        cond = self._condition()
+        async with cond:
+            self.inflight -= 1
+            cond.notify_all()
+
+    def seed(self, n: int) -> float:
+        """Start from at least `n` slots (capped at `maximum`); returns the resulting limit."""
+        self.limit = max(self.limit, min(float(n), self.maximum))
+        return self.limit
+
+    def on_success(self, saturated: bool) -> None:
+        if saturated:
+            self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+
+    def on_overload(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease >= self.cooldown:
+            self.limit = max(self.minimum, self.limit / 2.0)
+            self._last_decrease = now
+            self.decreases += 1
+
+
+class CircuitBreaker:
+    """
+    Pauses dispatch to a host after `threshold` consecutive failed attempts.
+
+    closed    : calls flow
+    open      : every caller waits until `cooldown` has elapsed
+    half_open : one probe call goes through; success closes the breaker,
+                failure re-opens it for another cooldown
+
+    A host that stays down for `give_up` seconds is considered gone: `down()`
+    turns true and waiting callers stop waiting (they fail, and the run can drain
+    its remaining items to the dead-letter file instead of pausing forever).
+
+    State is plain attributes guarded by a thread lock, so the same breaker
+    serves the sync and async call paths.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0, give_up: float = 600.0) -> None:
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.give_up = give_up
+        self.failures = 0
+        self.trips = 0
+        self.state = "closed"
+        self._opened_at = 0.0
+        self._down_since: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def wait_time(self) -> float:
+        """0 when the caller may dispatch now (and, if half-open, becomes the probe), else seconds to wait."""
+        with self._lock:
+            if self.state == "closed":
+                return 0.0
+            left = self._opened_at + self.cooldown - time.monotonic()
+            if self.state == "open" and left > 0:
+                return left
+            self.state = "half_open"
+            if self._probing:
+                return min(0.1, self.cooldown)
+            self._probing = True
+            return 0.0
+
+    def down(self) -> bool:
+        with self._lock:
+            return self._down_since is not None and time.monotonic() - self._down_since >= self.give_up
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._down_since = None
+            self.state = "closed"
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.threshold:
+                if self.state != "open":
+                    self.trips += 1
+                if self._down_since is None:
+                    self._down_since = time.monotonic()
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+
+class Transport:
+    """
+    Shared call wrapper for remote clients: retries, adaptive concurrency and a
+    circuit breaker, one instance per host (see `transport_for`).
+
+    `call(fn)` / `call_sync(fn)` run `fn` (a zero-argument callable making one
+    request) and return (result, retries, wait_s), where wait_s is the time spent
+    locally before requests went out: circuit-breaker pauses, waiting for a
+    concurrency slot and retry backoff. Callers subtract it from their request
+    latency and report it as queue wait. Retryable failures back off with full
+    jitter, uniform(0, min(backoff_max, backoff_base * 2**attempt)), but never
+    less than the server's Retry-After. When retries run out, or the error is not
+    retryable, a `TransportError` is raised.
+    """
+
+    def __init__(
+        self,
+        host: str = "",
+        config: Optional[TransportConfig] = None,
+        classify: Callable[[BaseException], Tuple[bool, bool, Optional[float]]] = classify_error,
+    ) -> None:
+        self.host = host
+        self.config = config or TransportConfig.from_env()
+        self.classify = classify
+        self.limiter = AIMDLimiter(self.config.conc_init, self.config.conc_max)
+        self.breaker = CircuitBreaker(self.config.breaker_threshold, self.config.breaker_cooldown,
+                                      self.config.breaker_give_up)
+        self.calls = 0
+        self.retries = 0
+        self.failed = 0
+        self._rng = random.Random()
+
+    def reserve(self, concurrency: int) -> None:
+        """
+        Seed the adaptive limit with the caller's worker count, so `--concurrency 64`
+        is not held at TRANSPORT_CONC_INIT while AIMD slowly ramps up. Overload
+        signals still halve it from there.
+        """
+        limit = self.limiter.seed(concurrency)
+        if concurrency > limit:
+            print(f"[transport] {self.host or 'remote'}: --concurrency {concurrency} exceeds "
+                  f"TRANSPORT_CONC_MAX={int(self.limiter.maximum)}; at most {int(limit)} calls in flight")
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        ceiling = min(self.config.backoff_max, self.config.backoff_base * (2 ** attempt))
+        delay = self._rng.uniform(0.0, ceiling)
+        return max(delay, retry_after) if retry_after is not None else delay
+
+    def _failed(self, exc: BaseException, attempt: int) -> Optional[float]:
+        """Book a failed attempt; returns the backoff delay, or None when the call should give up."""
+        retryable, overload, retry_after = self.classify(exc)
+        if retryable:
+            self.breaker.record_failure()
+        else:
+            # the host answered: a rejected request (400, 401, ...) says it is up
+            self.breaker.record_success()
+        if overload:
+            self.limiter.on_overload()
+        if not retryable or attempt >= self.config.max_retries:
+            self.failed += 1
+            return None
+        self.retries += 1
+        return self.backoff(attempt, retry_after)
+
+    def _give_up(self, exc: BaseException, attempt: int) -> TransportError:
+        return TransportError(f"{self.host or 'remote'}: {type(exc).__name__}: {exc}", attempt + 1, exc)
+
+    def _host_down(self, attempt: int) -> TransportError:
+        self.failed += 1
+        return TransportError(f"{self.host or 'remote'}: circuit open for {self.breaker.give_up:.0f}s, giving up", attempt)
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, int, float]:
+        self.calls += 1
+        attempt, waited = 0, 0.0
+        while True:
+            t0 = time.perf_counter()
+            wait = self.breaker.wait_time()
+            while wait > 0:
+                if self.breaker.down():
+                    raise self._host_down(attempt)
+                await asyncio.sleep(wait)
+                wait = self.breaker.wait_time()
+            saturated = await self.limiter.acquire()
+            waited += time.perf_counter() - t0
+            try:
+                result = await fn()
+            except Exception as exc:
+                delay = self._failed(exc, attempt)
+                if delay is None:
+                    raise self._give_up(exc, attempt) from exc
+            else:
+                self.breaker.record_success()
+                self.limiter.on_success(saturated)
+                return result, attempt, waited
+            finally:
+                await self.limiter.release()
+            await asyncio.sleep(delay)
+            waited += delay
+            attempt += 1
+
+    def call_sync(self, fn: Callable[[], Any]) -> Tuple[Any, int, float]:
+        """Blocking variant for the sequential path (no concurrency limit to enforce)."""
+        self.calls += 1
+        attempt, waited = 0, 0.0
+        while True:
+            t0 = time.perf_counter()
+            wait = self.breaker.wait_time()
+            while wait > 0:
+                if self.breaker.down():
+                    raise self._host_down(attempt)
+                time.sleep(wait)
+                wait = self.breaker.wait_time()
+            waited += time.perf_counter() - t0
+            try:
+                result = fn()
+            except Exception as exc:
+                delay = self._failed(exc, attempt)
+                if delay is None:
+                    raise self._give_up(exc, attempt) from exc
+            else:
+                self.breaker.record_success()
+                return result, attempt, waited
+            time.sleep(delay)
+            waited += delay
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failed": self.failed,
+            "breaker_trips": self.breaker.trips,
+            "breaker_state": self.breaker.state,
+            "concurrency_limit": round(self.limiter.limit, 2),
+            "limit_decreases": self.limiter.decreases,
+        }
+
+
+_TRANSPORTS: Dict[str, Transport] = {}
+_TRANSPORTS_LOCK = threading.Lock()
+
+
+def transport_for(host: str, classify: Callable = classify_error) -> Transport:
+    """The process-wide `Transport` of `host`, so every client talking to it shares one limit / breaker."""
+    with _TRANSPORTS_LOCK:
+        t = _TRANSPORTS.get(host)
+        if t is None:
+            t = _TRANSPORTS[host] = Transport(host, classify=classify)
+        return t
+
+
+def transport_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-host counters of every transport created in this process."""
+    with _TRANSPORTS_LOCK:
+        return {h: t.stats() for h, t in _TRANSPORTS.items()}
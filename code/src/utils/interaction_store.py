@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+__all__ = ["InteractionStore", "is_store", "open_store", "convert_csv"]
+
+
+META_NAME = "meta.json"
+FORMAT = "interaction-store"
+VERSION = 1
+MISSING = -1
+# answer codes a-d are fixed so stores built from different logs agree on them
+BASE_ANSWERS = ("a", "b", "c", "d")
+COLUMNS = {
+    "user_idx": "int32",
+    "item_idx": "int32",
+    "answer": "int8",
+    "correct": "int8",
+    "timestamp": "int64",
+}
+# flat CSV column -> store column, first present name wins
+SOURCE_COLUMNS = {
+    "user_id": ("user_id",),
+    "item_id": ("item_id", "question_id", "problem_id"),
+    "answer": ("student_answer", "user_answer"),
+    "correct": ("correct",),
+    "timestamp": ("timestamp",),
+}
+
+
+class _Dictionary:
+    """String -> dense code in first-seen order; missing values encode to MISSING."""
+
+    def __init__(self, seed: Sequence[str] = ()) -> None:
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+        for v in seed:
+            self._code(v)
+
+    def _code(self, v: str) -> int:
+        g = self.codes.get(v)
+        if g is None:
+            g = self.codes[v] = len(self.values)
+            self.values.append(v)
+        return g
+
+    def encode(self, series: pd.Series) -> np.ndarray:
+        codes, uniques = pd.factorize(series, sort=False)
+        table = np.array([self._code(str(v)) for v in uniques] + [MISSING], dtype=np.int64)
+        return table[codes]  # code -1 (missing) picks the trailing MISSING
+
+
+class InteractionStore:
+    """
+    Memory-mapped interaction log (EdNet / Eedi style), one row per interaction.
+
+    Columns are `.npy` arrays opened with `mmap_mode="r"`, so opening a store
+    costs only the JSON dictionaries and pages are read as they are touched:
+
+        user_idx  int32  index into `users` (sorted by user id)
+        item_idx  int32  index into `items` (first appearance in store order)
+        answer    int8   index into `answers` (a-d = 0-3), -1 = missing
+        correct   int8   1 / 0, -1 = missing
+        timestamp int64  -1 = missing
+
+    Rows are sorted by (user, timestamp) (stable, missing timestamps last), so
+    `user_offsets[u]:user_offsets[u + 1]` is user u's time-ordered sequence.
+    `frame()` / `iter_frames()` decode rows back to the flat-CSV columns for
+    code that still works on DataFrames.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(os.path.join(path, META_NAME), encoding="utf-8") as f:
+            self.meta: Dict[str, Any] = json.load(f)
+        if self.meta.get("format") != FORMAT:
+            raise ValueError(f"{path} is not an interaction store (format={self.meta.get('format')!r})")
+        if self.meta.get("version") != VERSION:
+            raise ValueError(f"{path}: unsupported interaction store version {self.meta.get('version')}")
+        self.users: List[str] = self._read_json("users.json")
+        self.items: List[str] = self._read_json("items.json")
+        self.answers: List[str] = self._read_json("answers.json")
+        for name in list(COLUMNS) + ["user_offsets"]:
+            setattr(self, name, np.load(os.path.join(path, name + ".npy"), mmap_mode="r"))
+        self._user_arr: Optional[np.ndarray] = None
+        self._item_arr: Optional[np.ndarray] = None
+        self._answer_arr: Optional[np.ndarray] = None
+
+    def _read_json(self, name: str):
+        with open(os.path.join(self.path, name), encoding="utf-8") as f:
+            return json.load(f)
+
+    def __len__(self) -> int:
+        return int(self.meta["n_rows"])
+
+    def __repr__(self) -> str:
+        return f"InteractionStore({self.path!r}, rows={len(self)}, users={self.n_users}, items={self.n_items})"
+
+    @property
+    def n_users(self) -> int:
+        return len(self.users)
+
+    @property
+    def n_items(self) -> int:
+        return len(self.items)
+
+    def user_rows(self, u: int) -> slice:
+        """Row range of user index `u`."""
+        return slice(int(self.user_offsets[u]), int(self.user_offsets[u + 1]))
+
+    def user_ids(self, idx) -> np.ndarray:
+        """Decode user indices to user id strings."""
+        if self._user_arr is None:
+            self._user_arr = np.array(self.users, dtype=object)
+        return self._user_arr[np.asarray(idx)]
+
+    def item_ids(self, idx) -> np.ndarray:
+        """Decode item indices to item id strings."""
+        if self._item_arr is None:
+            self._item_arr = np.array(self.items, dtype=object)
+        return self._item_arr[np.asarray(idx)]
+
+    def frame(self, start: int = 0, stop: Optional[int] = None,
+              columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        Rows [start, stop) decoded to the flat-CSV layout: user_id, item_id,
+        student_answer, correct, timestamp (missing values as NA).
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        columns = list(columns or ("user_id", "item_id", "student_answer", "correct", "timestamp"))
+        out = {}
+        for c in columns:
+            if c == "user_id":
+                out[c] = self.user_ids(self.user_idx[start:stop])
+            elif c == "item_id":
+                out[c] = self.item_ids(self.item_idx[start:stop])
+            elif c == "student_answer":
+                if self._answer_arr is None:
+                    self._answer_arr = np.array(self.answers + [np.nan], dtype=object)
+                out[c] = self._answer_arr[np.asarray(self.answer[start:stop])]  # -1 -> trailing NaN
+            elif c in ("correct", "timestamp"):
+                v = pd.Series(np.asarray(getattr(self, c)[start:stop]), dtype="Int64")
+                out[c] = v.mask(v == MISSING).array
+            else:
+                raise KeyError(f"unknown column {c!r}")
+        return pd.DataFrame(out, columns=columns)
+
+    def iter_frames(self, chunksize: int = 500_000,
+                    columns: Optional[Sequence[str]] = None) -> Iterator[pd.DataFrame]:
+        """Decoded chunks in row order, a drop-in for `pd.read_csv(..., chunksize=...)` loops."""
+        for s in range(0, len(self), chunksize):
+            yield self.frame(s, s + chunksize, columns)
+
+
+def is_store(path: str) -> bool:
+    """True when `path` is an interaction store directory."""
+    return os.path.isfile(os.path.join(path, META_NAME))
+
+
+def open_store(path: str) -> InteractionStore:
+    """Open the store at `path` (columns memory-mapped read-only)."""
+    return InteractionStore(path)
+
+
+def _pick(columns: Sequence[str], names: Sequence[str]) -> Optional[str]:
+    return next((c for c in names if c in columns), None)
+
+
+def _to_int(series: pd.Series, dtype) -> np.ndarray:
+    v = pd.to_numeric(series, errors="coerce")
+    return v.fillna(MISSING).to_numpy().astype(dtype)
+
+
+def convert_csv(paths: Sequence[str], out: str, chunksize: int = 1_000_000,
+                progress: Optional[Callable[[str], None]] = print) -> Dict[str, Any]:
+    """
+    Convert flat interaction CSVs (ednet_flatten_* output: user_id, item_id,
+    optional student_answer / correct / timestamp) into a store at `out`.
+
+    Pass 1 streams the CSVs chunk by chunk, dictionary-encodes them and spills
+    the codes to raw files in `out`; memory holds only the dictionaries. The
+    sort then needs the user / timestamp keys and the permutation in memory
+    (about 20 bytes per row) and gathers one column at a time into its final
+    `.npy`. Rows without a user or item id are dropped (counted in meta.json).
+    Returns the meta dict.
+    """
+    log = progress or (lambda msg: None)
+    os.makedirs(out, exist_ok=True)
+    users, items, answers = _Dictionary(), _Dictionary(), _Dictionary(BASE_ANSWERS)
+    spill = {c: os.path.join(out, c + ".spill") for c in COLUMNS}
+    files = {c: open(p, "wb") for c, p in spill.items()}
+    total = dropped = 0
+    t0 = time.perf_counter()
+    try:
+        for path in paths:
+            header = pd.read_csv(path, nrows=0).columns.tolist()
+            src = {k: _pick(header, names) for k, names in SOURCE_COLUMNS.items()}
+            if src["user_id"] is None or src["item_id"] is None:
+                raise ValueError(f"{path}: needs user_id and item_id columns, got {header}")
+            usecols = [c for c in src.values() if c]
+            text = {src[k]: str for k in ("user_id", "item_id", "answer") if src[k]}
+            for chunk in pd.read_csv(path, usecols=usecols, dtype=text, chunksize=chunksize):
+                u = users.encode(chunk[src["user_id"]])
+                it = items.encode(chunk[src["item_id"]])
+                keep = (u != MISSING) & (it != MISSING)
+                n = len(chunk)
+                cols = {
+                    "user_idx": u,
+                    "item_idx": it,
+                    "answer": answers.encode(chunk[src["answer"]]) if src["answer"] else np.full(n, MISSING),
+                    "correct": _to_int(chunk[src["correct"]], np.int64) if src["correct"] else np.full(n, MISSING),
+                    "timestamp": _to_int(chunk[src["timestamp"]], np.int64) if src["timestamp"] else np.full(n, MISSING),
+                }
+                for c, v in cols.items():
+                    v[keep].astype(COLUMNS[c]).tofile(files[c])
+                total += int(keep.sum())
+                dropped += n - int(keep.sum())
+                log(f"[store] {path}: {total} rows ... ({total / (time.perf_counter() - t0):,.0f} rows/s)")
+    finally:
+        for f in files.values():
+            f.close()
+    if len(answers.values) > 127:
+        raise ValueError(f"{len(answers.values)} distinct answers do not fit the int8 answer column")
+
+    raw = {c: np.memmap(p, dtype=COLUMNS[c], mode="r", shape=(total,)) if total else
+           np.zeros(0, COLUMNS[c]) for c, p in spill.items()}
+
+    # users in sorted id order (what sort_values("user_id") gives), then stable by timestamp
+    user_order = sorted(range(len(users.values)), key=users.values.__getitem__)
+    user_rank = np.empty(len(user_order), dtype=np.int32)
+    user_rank[user_order] = np.arange(len(user_order), dtype=np.int32)
+    u_sorted = user_rank[raw["user_idx"]]
+    ts = np.asarray(raw["timestamp"])
+    order = np.lexsort((np.where(ts == MISSING, np.iinfo(np.int64).max, ts), u_sorted))
+    del ts
+    user_offsets = np.zeros(len(user_order) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(u_sorted, minlength=len(user_order)), out=user_offsets[1:])
+    del u_sorted
+    log(f"[store] sorted {total} rows by (user, timestamp)")
+
+    # items renumbered by first appearance in the sorted rows
+    item_sorted = np.asarray(raw["item_idx"])[order]
+    seen, first = np.unique(item_sorted, return_index=True)
+    item_order = seen[np.argsort(first)]
+    item_rank = np.empty(len(items.values), dtype=np.int32)
+    item_rank[item_order] = np.arange(len(item_order), dtype=np.int32)
+    del item_sorted
+
+    remap = {"user_idx": user_rank, "item_idx": item_rank}
+    step = max(1, chunksize)
+    for c, dtype in COLUMNS.items():
+        dst = np.lib.format.open_memmap(os.path.join(out, c + ".npy"), mode="w+", dtype=dtype, shape=(total,))
+        for s in range(0, total, step):
+            v = raw[c][order[s:s + step]]
+            dst[s:s + len(v)] = remap[c][v] if c in remap else v
+        dst.flush()
+        del dst
+    np.save(os.path.join(out, "user_offsets.npy"), user_offsets)
+    del raw
+    for p in spill.values():
+        os.remove(p)
+
+    for name, values in (("users.json", [users.values[k] for k in user_order]),
+                         ("items.json", [items.values[k] for k in item_order]),
+                         ("answers.json", answers.values)):
+        with open(os.path.join(out, name), "w", encoding="utf-8") as f:
+            json.dump(values, f, ensure_ascii=False)
+    meta = {
+        "format": FORMAT, "version": VERSION,
+        "n_rows": total, "n_users": len(user_order), "n_items": len(item_order),
+        "columns": COLUMNS, "missing": MISSING, "sorted_by": ["user_idx", "timestamp"],
+        "dropped_rows": dropped, "sources": [os.path.abspath(p) for p in paths],
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    with open(os.path.join(out, META_NAME), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    log(f"[store] wrote {out} rows={total} users={len(user_order)} items={len(item_order)} "
+        f"dropped={dropped} in {time.perf_counter() - t0:.1f}s")
+    return meta
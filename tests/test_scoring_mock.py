@@ -0,0 +1,171 @@
+"""End-to-end checks of `runner.py score` against the local mock chat-completions server."""
+import json
+import os
+import random
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("openai")
+
+import runner
+from src.scoring import transport
+from src.scoring.mock_server import MockConfig, mock_completion, start_mock_server
+from src.scoring.permute import permutation_table
+from src.scoring.schema import round_seed
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "race_small.jsonl")
+MODEL = "openai:gpt-4o-mini"
+ROUNDS = 3
+NONLETTER_FIRST = 0.3
+SCORE_COLS = ["question_id", "run_id", "correct_letter", "chosen", "p_correct", "p_chosen", "correct",
+              "p_A", "p_B", "p_C", "p_D"]
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    data = tmp_path / "data" / "race" / "processed"
+    data.mkdir(parents=True)
+    shutil.copy(FIXTURE, data / "race_test.jsonl")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("TRANSPORT_BACKOFF_BASE", "0.001")
+    monkeypatch.setenv("BREAKER_THRESHOLD", "1000")
+    for name in ("PERMUTE", "CONF_MODE", "NORM_SCOPE", "TOP_LOGK"):
+        monkeypatch.delenv(name, raising=False)
+    # transports (limiter / breaker state) are shared per host for the whole process
+    monkeypatch.setattr(transport, "_TRANSPORTS", {})
+    return tmp_path
+
+
+@pytest.fixture
+def mock(monkeypatch):
+    servers = []
+
+    def start(**kw):
+        srv = start_mock_server(MockConfig(latency="const:1", nonletter_first=NONLETTER_FIRST, **kw))
+        servers.append(srv)
+        monkeypatch.setenv("OPENAI_BASE_URL", srv.url)
+        transport._TRANSPORTS.clear()
+        return srv
+
+    yield start
+    for srv in servers:
+        srv.shutdown()
+
+
+def run(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["runner.py", *map(str, argv)])
+    runner.main()
+
+
+def score(monkeypatch, out, *extra):
+    run(monkeypatch, "score", "--dataset", "race", "--model", MODEL, "--rounds", ROUNDS, "--out", out, *extra)
+
+
+def scores(out):
+    df = pd.read_csv(os.path.join(out, "scores.csv"))
+    return df.sort_values(["question_id", "run_id"]).reset_index(drop=True)
+
+
+def n_items():
+    with open(FIXTURE, encoding="utf-8") as f:
+        return sum(1 for line in f if line.strip())
+
+
+def test_concurrency_matches_sequential(workdir, mock, monkeypatch):
+    mock()
+    score(monkeypatch, "seq")
+    score(monkeypatch, "conc", "--concurrency", 4)
+    seq, conc = scores("seq"), scores("conc")
+    assert len(seq) == n_items() * ROUNDS
+    pd.testing.assert_frame_equal(seq[SCORE_COLS], conc[SCORE_COLS])
+
+
+def test_resume_replays_dead_letter(workdir, mock, monkeypatch):
+    mock()
+    score(monkeypatch, "ref")
+
+    monkeypatch.setenv("TRANSPORT_MAX_RETRIES", "0")
+    mock(error_rate=0.3, seed=1)
+    score(monkeypatch, "out", "--concurrency", 4)
+    with open("out/dead_letter.jsonl", encoding="utf-8") as f:
+        dead = [json.loads(line) for line in f if line.strip()]
+    assert dead
+    assert len(scores("out")) + len(dead) == n_items() * ROUNDS
+
+    monkeypatch.delenv("TRANSPORT_MAX_RETRIES")
+    mock()
+    score(monkeypatch, "out", "--concurrency", 4, "--resume")
+    with open("out/scores.stream.jsonl", encoding="utf-8") as f:
+        keys = [(r["question_id"], r["run_id"]) for r in map(json.loads, f) if "question_id" in r]
+    assert len(keys) == len(set(keys)) == n_items() * ROUNDS
+    pd.testing.assert_frame_equal(scores("ref")[SCORE_COLS], scores("out")[SCORE_COLS])
+
+
+def test_cache_replay_matches_live(workdir, mock, monkeypatch):
+    srv = mock()
+    score(monkeypatch, "rw", "--cache", "c.sqlite")
+    sent = srv.stats()["requests"]
+    score(monkeypatch, "ro", "--cache", "c.sqlite", "--cache-mode", "ro")
+    assert srv.stats()["requests"] == sent
+    ro = scores("ro")
+    assert ro["cache_hit"].all()
+    pd.testing.assert_frame_equal(scores("rw")[SCORE_COLS], ro[SCORE_COLS])
+
+
+@pytest.mark.parametrize("conf_mode", ["first_letter", "first_raw"])
+@pytest.mark.parametrize("norm_scope", ["letters", "all"])
+def test_rederive_matches_live(workdir, mock, monkeypatch, conf_mode, norm_scope):
+    mock()
+    score(monkeypatch, "base")
+    monkeypatch.setenv("CONF_MODE", conf_mode)
+    monkeypatch.setenv("NORM_SCOPE", norm_scope)
+    score(monkeypatch, "live")
+    run(monkeypatch, "rederive", "--inp", "base", "--out", "re", "--conf-mode", conf_mode, "--norm-scope", norm_scope)
+    pd.testing.assert_frame_equal(scores("live")[SCORE_COLS], scores("re")[SCORE_COLS], rtol=1e-6)
+
+
+def test_ingest_batch_matches_live(workdir, mock, monkeypatch):
+    mock()
+    score(monkeypatch, "live")
+    score(monkeypatch, "batch", "--emit-batch", "requests.jsonl")
+    lines = []
+    with open("requests.jsonl", encoding="utf-8") as f:
+        for line in f:
+            req = json.loads(line)
+            lines.append({"id": f"batch_req_{req['custom_id']}", "custom_id": req["custom_id"], "error": None,
+                          "response": {"status_code": 200, "body": mock_completion(req["body"], NONLETTER_FIRST)}})
+    random.Random(0).shuffle(lines)  # Batch API output order is arbitrary
+    with open("responses.jsonl", "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(rec) + "\n" for rec in lines)
+    run(monkeypatch, "ingest-batch", "responses.jsonl", "--out", "batch")
+    pd.testing.assert_frame_equal(scores("live")[SCORE_COLS], scores("batch")[SCORE_COLS], rtol=1e-6)
+
+
+def _permute_options(options, seed):
+    """The per-call shuffle scoring used before permutation tables (kept as the reference)."""
+    letters = [k for k in ["A", "B", "C", "D"] if k in options]
+    rng = random.Random(seed)
+    perm = letters[:]
+    rng.shuffle(perm)
+    return {letters[i]: perm[i] for i in range(len(letters))}
+
+
+def test_permutation_table_matches_per_round_shuffle():
+    with open(FIXTURE, encoding="utf-8") as f:
+        items = [json.loads(line) for line in f if line.strip()]
+    items += [{"id": f"x{i}", "options": {L: L for L in "ABCD"[:2 + i % 3]}} for i in range(200)]
+    rounds = 5
+    seeds = np.array([[round_seed(ex["id"], r) for r in range(rounds)] for ex in items], dtype=np.int64)
+    o2p = permutation_table([ex["options"] for ex in items], seeds)
+    assert o2p.dtype == np.int8 and o2p.shape == (len(items), rounds, 4)
+    for i, ex in enumerate(items):
+        for r in range(rounds):
+            want = [-1] * 4
+            for k, v in _permute_options(ex["options"], int(seeds[i, r])).items():
+                want["ABCD".index(k)] = "ABCD".index(v)
+            assert o2p[i, r].tolist() == want